@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+# Reproduzierbare Messungen für den Watchdog.
+#
+#   python benchmark.py coldstart [--runs 5] [--exe dist/Watchdog.exe] [--output coldstart.json]
+#   python benchmark.py check [--processes 500 5000 50000] [--programs 10 100 1000] [--output check.json] [--compare baseline.json]
+#   python benchmark.py translate [--calls 200000] [--output translate.json]
+#   python benchmark.py launch [--launches 200] [--target /bin/true] [--output launch.json]
+#   python benchmark.py control [--clients 1 8 32] [--requests 500] [--programs 100] [--output control.json]
+#
+# coldstart: Importzeiten (-X importtime) und Zeit bis zum Ende des ersten Prüfdurchlaufs
+#            (--exit-after-first-cycle, mit und ohne --headless) für den Quellcode und optional für die
+#            per watchdog.spec gebaute PyInstaller-onefile-Exe. Der GUI-Lauf braucht ein Display.
+# check:     Prüfpfad gegen eine synthetische Prozesstabelle (psutil.process_iter/psutil.Process werden
+#            ersetzt): is_process_running mit/ohne Snapshot und ein kompletter watchdog_loop-Durchlauf
+#            (kalt = ohne PID-Pins, warm = mit Pins). Mit --compare werden Regressionen gemeldet.
+# translate: Laden aller Sprachkataloge, Sprachwechsel und translate()-Durchsatz für Texte ohne, mit
+#            positionalen und mit benannten Platzhaltern, jeweils gegen die frühere Variante
+#            (json.load pro Sprachwechsel, str.format bei jedem Aufruf).
+# launch:    Dauer eines Programmstarts bis zur Rückkehr von Popen: früherer Pfad (os.path.exists, dirname,
+#            Popen bei jedem Neustart) gegen start_program() mit vorbereiteter LaunchSpec; unter POSIX zum
+#            Vergleich zusätzlich os.posix_spawn ohne Popen-Objekt.
+# control:   Latenz der Steuer-Schnittstelle (ControlSocket) eines headless gestarteten Watchdogs: je Client eine
+#            Verbindung mit aufeinanderfolgenden status-/list-Anfragen, alle Clients gleichzeitig (Threads).
+import argparse
+import configparser
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WATCHDOG_SCRIPT = os.path.join(SCRIPT_DIR, "watchdog.py")
+DEFAULT_EXE = os.path.join(SCRIPT_DIR, "dist", "Watchdog.exe")
+
+def write_benchmark_ini(directory, program_count=1):
+    # Programme zeigen auf diesen Benchmark-Prozess selbst, damit der erste Durchlauf nichts starten muss.
+    # Name und exe kommen von psutil, weil sie von sys.executable abweichen können (Symlinks, python3 vs. python3.11).
+    # Ohne Journal und Statistik: sonst lädt jeder gemessene Start sqlite3 und legt eine WAL-Datenbank an.
+    import psutil
+    own_process = psutil.Process()
+    ini_path = os.path.join(directory, "watchdog_bench.ini")
+    lines = ["[Settings]", "CheckCycleSec = 60", "StartDelaySec = 15", "Language = en", "ThemePreference = light", "JournalFile =", "StatsDatabase =", ""]
+    for i in range(1, program_count + 1):
+        lines += [f"[Program{i}]", f"Name = bench{i}", f"Path = {own_process.exe()}", f"ProcessName = {own_process.name()}", "Enabled = True", ""]
+    with open(ini_path, 'w', encoding='utf-8') as f: f.write("\n".join(lines))
+    return ini_path
+
+def parse_importtime(stderr_text):
+    # Zeilen der Form "import time:      self [us] |  cumulative | imported package"
+    modules = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "imported package" in line: continue
+        try:
+            _, self_us, cumulative_us, raw_name = line.replace("import time:", "|", 1).split("|")
+            # Verschachtelte Importe sind nach dem Trenner zusätzlich eingerückt
+            modules.append({'module': raw_name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us), 'top_level': not raw_name[1:].startswith(" ")})
+        except ValueError: continue
+    return modules
+
+def time_first_cycle(command, runs):
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        durations.append(time.perf_counter() - started)
+    return {'runs': runs, 'min_s': min(durations), 'median_s': statistics.median(durations), 'max_s': max(durations)}
+
+GUI_MODULES = ('tkinter', 'sv_ttk', '_tkinter')
+
+def measure_importtime(command, top):
+    importtime_run = subprocess.run([sys.executable, "-X", "importtime"] + command, stdin=subprocess.DEVNULL, capture_output=True, text=True, check=False)
+    if importtime_run.returncode != 0: return None
+    modules = parse_importtime(importtime_run.stderr)
+    top_level = [m for m in modules if m['top_level']]
+    return {
+        'total_us': sum(m['cumulative_us'] for m in top_level),
+        'module_count': len(modules),
+        'gui_modules_loaded': sorted({m['module'] for m in modules if m['module'].split('.')[0] in GUI_MODULES}),
+        'slowest': sorted(top_level, key=lambda m: m['cumulative_us'], reverse=True)[:top],
+    }
+
+def bench_coldstart(args):
+    results = {'python': sys.version.split()[0], 'platform': sys.platform}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = write_benchmark_ini(tmp_dir)
+        watchdog_args = ["--headless", "--config", ini_path, "--exit-after-first-cycle"]
+        # GUI-Modus: wie ein Doppelklick auf die Exe, beendet sich nach dem ersten Durchlauf bei laufender mainloop
+        gui_args = ["--config", ini_path, "--exit-after-first-cycle"]
+
+        results['importtime'] = measure_importtime([WATCHDOG_SCRIPT] + watchdog_args, args.top)
+        results['importtime_gui'] = measure_importtime([WATCHDOG_SCRIPT] + gui_args, args.top)
+        results['first_cycle_source'] = time_first_cycle([sys.executable, WATCHDOG_SCRIPT] + watchdog_args, args.runs)
+        if results['importtime_gui']: results['first_cycle_gui_source'] = time_first_cycle([sys.executable, WATCHDOG_SCRIPT] + gui_args, args.runs)
+        else:
+            results['first_cycle_gui_source'] = None
+            print("HINWEIS: GUI-Start fehlgeschlagen (kein Display?), GUI-Messung übersprungen.")
+
+        exe_path = args.exe or DEFAULT_EXE
+        if os.path.exists(exe_path):
+            # -X importtime greift im eingefrorenen Bootloader nicht, hier zählt die Gesamtzeit inkl. onefile-Entpacken
+            results['first_cycle_exe'] = dict(time_first_cycle([exe_path] + watchdog_args, args.runs), exe=exe_path)
+            results['first_cycle_gui_exe'] = dict(time_first_cycle([exe_path] + gui_args, args.runs), exe=exe_path)
+        else:
+            results['first_cycle_exe'] = results['first_cycle_gui_exe'] = None
+            print(f"HINWEIS: '{exe_path}' nicht gefunden, Exe-Messung übersprungen (erst 'pyinstaller watchdog.spec' ausführen).")
+
+    for key, label in (('importtime', 'Headless'), ('importtime_gui', 'GUI')):
+        importtime = results[key]
+        if not importtime: print(f"{label}: keine Importzeiten"); continue
+        print(f"{label}: Importzeit gesamt {importtime['total_us'] / 1000:.1f} ms ({importtime['module_count']} Module), GUI-Module: {importtime['gui_modules_loaded'] or 'keine'}")
+        for module in importtime['slowest']:
+            print(f"  {module['cumulative_us'] / 1000:8.1f} ms  {module['module']}")
+    for key in ('first_cycle_source', 'first_cycle_gui_source', 'first_cycle_exe', 'first_cycle_gui_exe'):
+        if results[key]: print(f"{key}: median {results[key]['median_s'] * 1000:.0f} ms (min {results[key]['min_s'] * 1000:.0f} ms, {results[key]['runs']} Läufe)")
+    return results
+
+class FakeProcessInfo:
+    # Minimaler Ersatz für die von psutil.process_iter(['name', 'exe']) gelieferten Objekte
+    __slots__ = ('pid', 'info')
+    def __init__(self, pid, name, exe): self.pid = pid; self.info = {'name': name, 'exe': exe}
+
+def build_process_table(process_count, program_count, access_denied_ratio, running_ratio, seed):
+    # Die ersten Einträge sind die überwachten Programme (running_ratio davon laufen), der Rest Füllprozesse.
+    # Bei AccessDenied liefert psutil für 'exe' den ad_value None, genau wie hier.
+    rng = random.Random(seed)
+    table = []
+    running_programs = int(program_count * running_ratio)
+    for i in range(process_count):
+        if i < running_programs: name, exe = f"prog{i}.exe", os.path.join("C:\\apps", f"prog{i}", f"prog{i}.exe")
+        else: name, exe = f"svc{i % 997}.exe", os.path.join("C:\\Windows", "System32", f"svc{i}.exe")
+        if rng.random() < access_denied_ratio: exe = None
+        table.append(FakeProcessInfo(1000 + i, name, exe))
+    rng.shuffle(table)
+    return table
+
+def install_fake_psutil(watchdog_module, table):
+    psutil = watchdog_module.psutil
+    create_times = {proc.pid: 1_700_000_000.0 + proc.pid for proc in table}
+
+    class FakeProcess:
+        def __init__(self, pid):
+            if pid not in create_times: raise psutil.NoSuchProcess(pid)
+            self.pid = pid
+        def create_time(self): return create_times[self.pid]
+        def status(self): return psutil.STATUS_RUNNING
+        def oneshot(self): return _NullContext()
+
+    class _NullContext:
+        def __enter__(self): return self
+        def __exit__(self, *exc): return False
+
+    originals = (psutil.process_iter, psutil.Process)
+    psutil.process_iter = lambda attrs=None, ad_value=None: iter(table)
+    psutil.Process = FakeProcess
+    return lambda: (setattr(psutil, 'process_iter', originals[0]), setattr(psutil, 'Process', originals[1]))
+
+def configure_programs(watchdog_module, program_count):
+    watchdog_module.config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'), interpolation=None)
+    watchdog_module.config['Settings'] = {'CheckCycleSec': '60', 'StartDelaySec': '0', 'JournalFile': '', 'StatsDatabase': ''}  # kein Journal, keine Statistik neben watchdog.py
+    for i in range(program_count):
+        watchdog_module.config[f"Program{i + 1}"] = {'Name': f"prog{i}", 'Path': os.path.join("C:\\apps", f"prog{i}", f"prog{i}.exe"), 'ProcessName': f"prog{i}.exe", 'Enabled': 'True'}
+    watchdog_module.program_registry = watchdog_module.ProgramRegistry()
+    watchdog_module.load_settings_and_programs()
+
+def time_call(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter(); function(); durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+def bench_check(args):
+    sys.path.insert(0, SCRIPT_DIR)
+    import watchdog
+    watchdog.start_program = lambda program: None  # nicht laufende Programme: Startversuch ohne echten Prozess
+    results = {'python': sys.version.split()[0], 'platform': sys.platform, 'cases': {}}
+    for process_count in args.processes:
+        for program_count in args.programs:
+            for access_denied_ratio in args.access_denied:
+                case_key = f"{process_count}p_{program_count}prog_{access_denied_ratio:g}ad"
+                table = build_process_table(process_count, program_count, access_denied_ratio, args.running_ratio, args.seed)
+                restore_psutil = install_fake_psutil(watchdog, table)
+                try:
+                    configure_programs(watchdog, program_count)
+                    sample_programs = list(watchdog.program_registry)[:min(program_count, args.scan_samples)]
+                    def _full_scans():
+                        for program in sample_programs: watchdog.is_process_running(program.process_name, program.path)
+                    snapshot = watchdog.build_process_snapshot()
+                    def _snapshot_lookups():
+                        for program in watchdog.program_registry: watchdog.is_process_running(program.process_name, program.path, snapshot)
+                    def _cycle():
+                        watchdog.watchdog_loop(threading.Event(), exit_after_first_cycle=True)
+                    def _cold_cycle():
+                        for program in watchdog.program_registry: watchdog.unpin_process(program)
+                        _cycle()
+                    case = {
+                        'is_process_running_scan_us': time_call(_full_scans, args.repeat) / len(sample_programs) * 1e6,
+                        'build_process_snapshot_ms': time_call(watchdog.build_process_snapshot, args.repeat) * 1e3,
+                        'is_process_running_snapshot_us': time_call(_snapshot_lookups, args.repeat) / program_count * 1e6,
+                        'cycle_cold_ms': time_call(_cold_cycle, args.repeat) * 1e3,
+                    }
+                    _cycle()  # Pins für den warmen Durchlauf herstellen
+                    case['cycle_warm_ms'] = time_call(_cycle, args.repeat) * 1e3
+                finally:
+                    restore_psutil()
+                results['cases'][case_key] = case
+                print(f"{case_key:>24}: Scan {case['is_process_running_scan_us']:9.1f} us/Aufruf | Snapshot {case['build_process_snapshot_ms']:8.2f} ms | "
+                      f"Lookup {case['is_process_running_snapshot_us']:6.2f} us | Zyklus kalt {case['cycle_cold_ms']:8.2f} ms, warm {case['cycle_warm_ms']:8.2f} ms")
+    if args.compare: results['regressions'] = compare_with_baseline(results, args.compare, args.tolerance)
+    return results
+
+def legacy_load_language(watchdog_module, lang_code):
+    # Frühere Variante: die Sprachdatei wird bei jedem Wechsel von der Platte gelesen
+    with open(watchdog_module.get_lang_resource_path(f"{lang_code}.json"), 'r', encoding='utf-8') as f: return json.load(f)
+
+def legacy_translate(catalog, key, *args, **kwargs):
+    translated = catalog.get(key, key)
+    try:
+        if kwargs: return translated.format(**kwargs)
+        elif args: return translated.format(*args)
+        else: return translated
+    except KeyError: return key
+    except Exception: return translated
+
+def bench_translate(args):
+    sys.path.insert(0, SCRIPT_DIR)
+    import watchdog
+    languages = sorted(watchdog.load_translation_catalogs())
+    results = {'python': sys.version.split()[0], 'platform': sys.platform, 'languages': languages, 'cases': {}}
+    results['cases']['load_all_catalogs_ms'] = time_call(watchdog.load_translation_catalogs, args.repeat) * 1e3
+    results['cases']['switch_language_us'] = time_call(lambda: [watchdog.load_language(code, is_initial_load=True) for code in languages], args.repeat) / len(languages) * 1e6
+    results['cases']['legacy_switch_language_us'] = time_call(lambda: [legacy_load_language(watchdog, code) for code in languages], args.repeat) / len(languages) * 1e6
+    watchdog.load_language('de', is_initial_load=True); legacy_catalog = legacy_load_language(watchdog, 'de')
+    calls = {
+        'plain': (("Settings",), {}),
+        'positional': (("Status.ProgramListLoadedCount", 42), {}),
+        'named': (("Status.WatchdogCrashLooping",), {'name': "Program1", 'count': 3, 'delay': 8}),
+    }
+    for case_name, (call_args, call_kwargs) in calls.items():
+        def _translate():
+            for _ in range(args.calls): watchdog.translate(*call_args, **call_kwargs)
+        def _legacy_translate():
+            for _ in range(args.calls): legacy_translate(legacy_catalog, *call_args, **call_kwargs)
+        assert watchdog.translate(*call_args, **call_kwargs) == legacy_translate(legacy_catalog, *call_args, **call_kwargs)
+        results['cases'][f'translate_{case_name}_ns'] = time_call(_translate, args.repeat) / args.calls * 1e9
+        results['cases'][f'legacy_translate_{case_name}_ns'] = time_call(_legacy_translate, args.repeat) / args.calls * 1e9
+    cases = results['cases']
+    print(f"Kataloge ({', '.join(languages)}) laden: {cases['load_all_catalogs_ms']:.2f} ms")
+    print(f"Sprachwechsel: {cases['switch_language_us']:9.2f} us (vorher {cases['legacy_switch_language_us']:9.2f} us)")
+    for case_name in calls:
+        print(f"translate {case_name:>10}: {cases[f'translate_{case_name}_ns']:7.1f} ns/Aufruf (vorher {cases[f'legacy_translate_{case_name}_ns']:7.1f} ns)")
+    return results
+
+def legacy_start_program(program_path):
+    # Frühere Variante von start_program(): Prüfung und Argumente bei jedem Neustart
+    if not os.path.exists(program_path): return None
+    return subprocess.Popen([program_path], cwd=os.path.dirname(program_path), creationflags=0)
+
+def time_launches(launch, launches):
+    # Misst nur den Start; die Kindprozesse werden danach eingesammelt, damit keine Zombies die Messung verzerren
+    durations = []; children = []
+    for _ in range(launches):
+        started = time.perf_counter(); children.append(launch()); durations.append(time.perf_counter() - started)
+    for child in children:
+        if isinstance(child, int): os.waitpid(child, 0)
+        elif child is not None: child.wait()
+    durations.sort()
+    return {'median_us': statistics.median(durations) * 1e6, 'p90_us': durations[int(len(durations) * 0.9)] * 1e6, 'min_us': durations[0] * 1e6}
+
+def bench_launch(args):
+    sys.path.insert(0, SCRIPT_DIR)
+    import watchdog
+    target = args.target or shutil.which('true') or sys.executable
+    program = watchdog.ProgramRecord("Program1", "bench", target, os.path.basename(target), True)
+    if program.launch.error: print(f"FEHLER: '{target}' ist nicht startbar: {program.launch.error}"); sys.exit(2)
+    results = {'python': sys.version.split()[0], 'platform': sys.platform, 'target': target, 'cases': {}}
+    cases = {'legacy_start_program': lambda: legacy_start_program(target), 'start_program': lambda: watchdog.start_program(program)}
+    if hasattr(os, 'posix_spawn'): cases['posix_spawn'] = lambda: os.posix_spawn(target, [target], os.environ)
+    for _ in range(args.repeat):  # abwechselnd messen, damit Cache- und Systemlast-Effekte beide Varianten gleich treffen
+        for case_name, launch in cases.items():
+            sample = time_launches(launch, args.launches)
+            best = results['cases'].get(case_name)
+            if best is None or sample['median_us'] < best['median_us']: results['cases'][case_name] = sample
+    for case_name, case in results['cases'].items():
+        print(f"{case_name:>22}: Median {case['median_us']:8.1f} us | p90 {case['p90_us']:8.1f} us | min {case['min_us']:8.1f} us")
+    return results
+
+def wait_for_control_socket(watchdog_module, address, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None: return False
+        try: watchdog_module.control_request(address, 'list', timeout=1.0); return True
+        except OSError: time.sleep(0.05)
+    return False
+
+def run_control_clients(watchdog_module, address, clients, requests, method, params):
+    # Jeder Client misst seine Anfragen einzeln; gestartet wird über eine Barriere, damit alle gleichzeitig anfragen
+    latencies = []; errors = []; barrier = threading.Barrier(clients + 1)
+    def _client():
+        client = watchdog_module.ControlClient(address); own_latencies = []
+        barrier.wait()
+        for _ in range(requests):
+            started = time.perf_counter(); response = client.call(method, params); own_latencies.append(time.perf_counter() - started)
+            if 'error' in response: errors.append(response['error'])
+        client.close(); latencies.extend(own_latencies)
+    threads = [threading.Thread(target=_client) for _ in range(clients)]
+    for thread in threads: thread.start()
+    barrier.wait(); started = time.perf_counter()
+    for thread in threads: thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {'clients': clients, 'requests': len(latencies), 'errors': len(errors), 'throughput_per_s': len(latencies) / elapsed,
+            'median_us': statistics.median(latencies) * 1e6, 'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6, 'max_us': latencies[-1] * 1e6}
+
+def bench_control(args):
+    sys.path.insert(0, SCRIPT_DIR)
+    import watchdog
+    results = {'python': sys.version.split()[0], 'platform': sys.platform, 'programs': args.programs, 'cases': {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = write_benchmark_ini(tmp_dir, args.programs)
+        address = watchdog.resolve_control_address(f"watchdog_bench_{os.getpid()}" if sys.platform == "win32" else "watchdog_bench.sock", ini_path)
+        config = configparser.ConfigParser(interpolation=None); config.read(ini_path, encoding='utf-8')
+        config.set('Settings', 'ControlSocket', address)
+        with open(ini_path, 'w', encoding='utf-8') as f: config.write(f)
+        process = subprocess.Popen([sys.executable, WATCHDOG_SCRIPT, "--headless", "--config", ini_path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_control_socket(watchdog, address, process, 30): print(f"FEHLER: Steuer-Schnittstelle '{address}' nicht erreichbar."); sys.exit(2)
+            for method, params in (('status', {'section': 'Program1'}), ('list', {})):
+                for clients in args.clients:
+                    run_control_clients(watchdog, address, clients, min(args.requests, 50), method, params)  # Aufwärmen
+                    case = results['cases'][f"{method}_{clients}"] = run_control_clients(watchdog, address, clients, args.requests, method, params)
+                    print(f"{method:>6} {clients:3d} Clients: Median {case['median_us']:8.1f} us | p99 {case['p99_us']:8.1f} us | max {case['max_us']:8.1f} us | {case['throughput_per_s']:8.0f} Anfragen/s"
+                          + (f" | {case['errors']} Fehler" if case['errors'] else ""))
+        finally:
+            process.terminate()
+            try: process.wait(timeout=10)
+            except subprocess.TimeoutExpired: process.kill()
+    return results
+
+def compare_with_baseline(results, baseline_path, tolerance):
+    # Meldet alle Messwerte, die um mehr als den Faktor tolerance langsamer sind als in der Baseline
+    with open(baseline_path, encoding='utf-8') as f: baseline = json.load(f)
+    regressions = []
+    for case_key, case in results['cases'].items():
+        for metric, value in case.items():
+            baseline_value = baseline.get('cases', {}).get(case_key, {}).get(metric)
+            if baseline_value and value > baseline_value * tolerance:
+                regressions.append({'case': case_key, 'metric': metric, 'baseline': baseline_value, 'current': value})
+                print(f"REGRESSION {case_key} {metric}: {baseline_value:.2f} -> {value:.2f} (x{value / baseline_value:.2f})")
+    if not regressions: print(f"Keine Regressionen gegenüber '{baseline_path}' (Toleranz x{tolerance}).")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für watchdog.py")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    coldstart_parser = subparsers.add_parser('coldstart', help="Importzeit und Zeit bis zum ersten Prüfdurchlauf")
+    coldstart_parser.add_argument('--runs', type=int, default=5)
+    coldstart_parser.add_argument('--top', type=int, default=15, help="Anzahl der langsamsten Importe in der Ausgabe")
+    coldstart_parser.add_argument('--exe', help=f"Pfad zur gebauten Exe (Standard: {DEFAULT_EXE})")
+    coldstart_parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    check_parser = subparsers.add_parser('check', help="Prüfpfad gegen eine synthetische Prozesstabelle")
+    check_parser.add_argument('--processes', type=int, nargs='+', default=[500, 5000, 50000])
+    check_parser.add_argument('--programs', type=int, nargs='+', default=[10, 100, 1000])
+    check_parser.add_argument('--access-denied', type=float, nargs='+', default=[0.0, 0.3], help="Anteil der Prozesse ohne lesbaren exe-Pfad")
+    check_parser.add_argument('--running-ratio', type=float, default=0.9, help="Anteil der überwachten Programme, die laufen")
+    check_parser.add_argument('--scan-samples', type=int, default=20, help="Anzahl is_process_running-Aufrufe ohne Snapshot pro Messung")
+    check_parser.add_argument('--repeat', type=int, default=3)
+    check_parser.add_argument('--seed', type=int, default=1)
+    check_parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    check_parser.add_argument('--compare', help="Baseline-JSON eines früheren Laufs für den Regressionsvergleich")
+    check_parser.add_argument('--tolerance', type=float, default=1.25, help="Erlaubter Faktor gegenüber der Baseline")
+    translate_parser = subparsers.add_parser('translate', help="Sprachkataloge und translate()-Durchsatz")
+    translate_parser.add_argument('--calls', type=int, default=200000, help="translate()-Aufrufe pro Messung")
+    translate_parser.add_argument('--repeat', type=int, default=5)
+    translate_parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    launch_parser = subparsers.add_parser('launch', help="Startlatenz: früherer Startpfad gegen LaunchSpec")
+    launch_parser.add_argument('--launches', type=int, default=200, help="Starts pro Messung")
+    launch_parser.add_argument('--repeat', type=int, default=3, help="Messungen pro Variante (bester Median zählt)")
+    launch_parser.add_argument('--target', help="Zu startendes Programm (Standard: true aus PATH)")
+    launch_parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    control_parser = subparsers.add_parser('control', help="Latenz der Steuer-Schnittstelle bei gleichzeitigen Clients")
+    control_parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32])
+    control_parser.add_argument('--requests', type=int, default=500, help="Anfragen pro Client und Messung")
+    control_parser.add_argument('--programs', type=int, default=100, help="Überwachte Einträge (alle laufend, list liefert alle)")
+    control_parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    results = {'coldstart': bench_coldstart, 'check': bench_check, 'translate': bench_translate, 'launch': bench_launch, 'control': bench_control}[args.command](args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2)
+        print(f"Ergebnisse gespeichert: {args.output}")
+    if results.get('regressions'): sys.exit(1)
+
+if __name__ == "__main__":
+    main()
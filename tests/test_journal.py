@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# query_journal() über rotierte Dateien: Binärsuche nach since, Abbruch bei until, limit behält die neuesten Treffer.
+import pytest
+
+import watchdog
+
+RECORD_COUNT = 500
+FIRST_TS = 1_000_000.0
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(watchdog, 'journal_file', str(tmp_path / 'journal.jsonl'))
+    monkeypatch.setattr(watchdog, 'journal_max_bytes', 20000)
+    monkeypatch.setattr(watchdog, 'journal_backups', 5)
+    monkeypatch.setattr(watchdog, 'JOURNAL_SEEK_MIN_BYTES', 256)  # damit die Binärsuche auch in kleinen Dateien greift
+    records = [(FIRST_TS + i * 1.5, f"Program{i % 3 + 1}", f"prog{i % 3 + 1}", 'started', 1000 + i, None, None) for i in range(RECORD_COUNT)]
+    for offset in range(0, RECORD_COUNT, 50): watchdog._write_journal_batch(records[offset:offset + 50])
+    return records
+
+def expected(records, section=None, since=None, until=None):
+    return [ts for ts, record_section, *_ in records
+            if (section is None or record_section == section) and (since is None or ts >= since) and (until is None or ts <= until)]
+
+def rotation_boundary():
+    # Zeitstempel des ersten Eintrags der aktuellen (neuesten) Datei
+    return watchdog._journal_record_time(open(watchdog.journal_file, 'rb').readline())
+
+def test_journal_is_rotated(journal):
+    assert len(watchdog.journal_files()) >= 3
+
+def test_query_without_filter_returns_everything_oldest_first(journal):
+    assert [record['ts'] for record in watchdog.query_journal()] == expected(journal)
+
+def test_query_since_until_across_rotation_boundary(journal):
+    boundary = rotation_boundary()
+    since, until = boundary - 40.2, boundary + 40.2
+    result = watchdog.query_journal('Program2', since, until)
+    assert [record['ts'] for record in result] == expected(journal, 'Program2', since, until)
+    assert result and all(record['section'] == 'Program2' for record in result)
+    assert result[0]['ts'] < boundary < result[-1]['ts']
+
+def test_query_limit_keeps_newest_matches(journal):
+    boundary = rotation_boundary()
+    result = watchdog.query_journal(None, boundary - 100, boundary + 10, limit=7)
+    assert [record['ts'] for record in result] == expected(journal, None, boundary - 100, boundary + 10)[-7:]
+
+def test_query_bounds_are_inclusive(journal):
+    ts = journal[123][0]
+    assert [record['ts'] for record in watchdog.query_journal(None, ts, ts)] == [ts]
+
+def test_query_outside_of_journal_is_empty(journal):
+    assert watchdog.query_journal(None, None, FIRST_TS - 1) == []
+    assert watchdog.query_journal(None, journal[-1][0] + 1) == []
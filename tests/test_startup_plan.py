@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# plan_startup_waves(): Startwellen nach DependsOn, Zyklen als stark zusammenhängende Komponenten.
+import watchdog
+
+def program(number, depends_on=(), enabled=True):
+    return watchdog.ProgramRecord(f"Program{number}", f"prog{number}", f"/opt/prog{number}", f"prog{number}", enabled, depends_on=depends_on)
+
+def test_waves_follow_dependencies():
+    waves, cycles, dependencies = watchdog.plan_startup_waves([program(1), program(2, ['Program1']), program(3, ['program1', 'Program2']), program(4)])
+    assert waves == [['Program1', 'Program4'], ['Program2'], ['Program3']]
+    assert cycles == []
+    assert dependencies['Program3'] == ['Program1', 'Program2']
+
+def test_unknown_disabled_and_self_dependencies_are_ignored():
+    waves, cycles, dependencies = watchdog.plan_startup_waves([program(1, ['Program1', 'Program9', 'Program2']), program(2, enabled=False)])
+    assert waves == [['Program1']] and cycles == [] and dependencies == {'Program1': []}
+
+def test_dependent_of_a_cycle_still_waits_for_it():
+    # 1 <-> 2 ist ein Zyklus; 3 hängt nur von 1 ab und gehört nicht dazu
+    waves, cycles, dependencies = watchdog.plan_startup_waves([program(1, ['Program2']), program(2, ['Program1']), program(3, ['Program1'])])
+    assert cycles == ['Program1', 'Program2']
+    assert dependencies == {'Program1': [], 'Program2': [], 'Program3': ['Program1']}
+    assert waves == [['Program1', 'Program2'], ['Program3']]
+
+def test_cycle_keeps_dependencies_outside_of_it():
+    # 2 -> 3 -> 4 -> 2 ist ein Zyklus, 2 hängt zusätzlich von 1 ab, 5 von 4
+    programs = [program(1), program(2, ['Program3', 'Program1']), program(3, ['Program4']), program(4, ['Program2']), program(5, ['Program4'])]
+    waves, cycles, dependencies = watchdog.plan_startup_waves(programs)
+    assert cycles == ['Program2', 'Program3', 'Program4']
+    assert dependencies == {'Program1': [], 'Program2': ['Program1'], 'Program3': [], 'Program4': [], 'Program5': ['Program4']}
+    assert waves == [['Program1', 'Program3', 'Program4'], ['Program2', 'Program5']]
+
+def test_long_chain_does_not_recurse():
+    # ein Zyklus über 5001 Programme
+    programs = [program(1, ['Program5001'])] + [program(i, [f"Program{i - 1}"]) for i in range(2, 5002)]
+    waves, cycles, dependencies = watchdog.plan_startup_waves(programs)
+    assert len(cycles) == 5001 and waves == [[p.section for p in programs]]
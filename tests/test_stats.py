@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Stunden- und Tagesbuckets der Verfügbarkeitsstatistik in Ortszeit (Europe/Berlin, inkl. Sommerzeitwechsel am 29.03.2026).
+# Der StatsWriter ist ein einziger Thread mit einer Verbindung, daher teilen sich alle Tests eine Datenbank
+# und verwenden jeweils eigene Sektionen.
+import os
+import sqlite3
+import time
+
+import pytest
+
+import watchdog
+
+pytestmark = pytest.mark.skipif(not hasattr(time, 'tzset'), reason="benötigt time.tzset() (POSIX)")
+
+@pytest.fixture(scope='module', autouse=True)
+def stats_database(tmp_path_factory):
+    previous = (os.environ.get('TZ'), watchdog.stats_database, watchdog.stats_retention_days)
+    os.environ['TZ'] = 'Europe/Berlin'; time.tzset()
+    watchdog.stats_database = str(tmp_path_factory.mktemp('stats') / 'stats.sqlite3')
+    watchdog.stats_retention_days = 100000  # feste Testdaten nicht wegräumen
+    yield watchdog.stats_database
+    watchdog.flush_stats()
+    if previous[0] is None: os.environ.pop('TZ', None)
+    else: os.environ['TZ'] = previous[0]
+    time.tzset()
+    watchdog.stats_database, watchdog.stats_retention_days = previous[1:]
+
+def local(*fields):
+    return time.mktime(fields + (0,) * (6 - len(fields)) + (0, 0, -1))
+
+def feed(*items):
+    for item in items: watchdog._put_stats_item(item)
+    assert watchdog.flush_stats()
+
+def rollups(section, period):
+    with sqlite3.connect(watchdog.stats_database) as connection:
+        return dict(connection.execute("SELECT bucket, up_seconds FROM rollups WHERE section = ? AND period = ? ORDER BY bucket", (section, period)))
+
+def test_day_start_is_local_midnight_across_dst():
+    assert watchdog._stats_day_start(local(2026, 3, 29, 15)) == local(2026, 3, 29)
+    assert local(2026, 3, 30) - local(2026, 3, 29) == 23 * 3600
+    assert watchdog._stats_day_start(local(2026, 3, 30, 0, 30)) == local(2026, 3, 30)
+
+def test_hour_rollup_crossing_midnight():
+    started, stopped = local(2026, 3, 10, 23, 30), local(2026, 3, 11, 0, 45)
+    feed((started, 'Midnight', 'up'), (stopped, 'Midnight', 'unmonitored'))
+    assert rollups('Midnight', 'hour') == {int(local(2026, 3, 10, 23)): 1800.0, int(local(2026, 3, 11, 0)): 2700.0}
+    assert rollups('Midnight', 'day') == {int(local(2026, 3, 10)): 1800.0, int(local(2026, 3, 11)): 2700.0}
+    totals = watchdog.query_program_stats(local(2026, 3, 10, 23, 5), local(2026, 3, 11, 0, 10))['Midnight']
+    assert totals['up_seconds'] == totals['observed_seconds'] == 4500.0
+    assert totals['uptime_percent'] == 100.0 and totals['mtbf_sec'] is None
+
+def test_thirty_day_query_mixes_day_and_hour_buckets():
+    # läuft vom 15.03. bis 14.04. durch (über den Sommerzeitwechsel), am 01.04. ein Ausfall von 10 Minuten
+    started, stopped = local(2026, 3, 15, 12), local(2026, 4, 14, 12)
+    failed_at, restarted_at = local(2026, 4, 1, 8), local(2026, 4, 1, 8, 10)
+    feed((started, 'Month', 'up'), (failed_at, 'Month', 'failure'), (restarted_at, 'Month', 'restart'), (stopped, 'Month', 'unmonitored'))
+    # Auflösung volle Stunden: 20.03. 06:00 bis 10.04. 19:00, davon ganze Tage 21.03. bis 10.04. aus dem Tages-Rollup
+    since, until = local(2026, 3, 20, 6, 30), local(2026, 4, 10, 18, 20)
+    totals = watchdog.query_program_stats(since, until)['Month']
+    observed = local(2026, 4, 10, 19) - local(2026, 3, 20, 6)
+    assert totals['observed_seconds'] == pytest.approx(observed)
+    assert totals['up_seconds'] == pytest.approx(observed - 600)
+    assert (totals['failures'], totals['restarts']) == (1, 1)
+    assert totals['mtbf_sec'] == pytest.approx(observed - 600)
+    # Zeitraum größer als die Daten: genau die überwachte Zeit
+    totals = watchdog.query_program_stats(local(2026, 3, 1), local(2026, 4, 30))['Month']
+    assert totals['observed_seconds'] == pytest.approx(stopped - started)
+    assert totals['up_seconds'] == pytest.approx(stopped - started - 600)
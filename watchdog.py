@@ -5,18 +5,30 @@ import time
 import psutil
 import subprocess
 import sys
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import tkinter.font as tkFont
+import argparse
+import signal
 import threading
+import queue
+import heapq
+import itertools
 import json
-try:
-    import winreg
-    CAN_CHECK_REGISTRY = True
-except ImportError:
-    CAN_CHECK_REGISTRY = False
-    print("WARNUNG: Modul 'winreg' nicht gefunden. System-Theme-Erkennung nicht verfügbar.")
-import sv_ttk
+import bisect
+import collections
+import io
+import string
+
+# GUI-Module werden erst durch import_gui_modules() geladen, im --headless Modus nie.
+# filedialog und winreg werden erst beim ersten Gebrauch importiert (nicht für das erste Fenster nötig).
+tk = ttk = messagebox = tkFont = sv_ttk = None
+asyncio = None  # erst bei der ersten Lebendigkeitsprüfung (Probe*) oder mit ControlSocket geladen
+CAN_CHECK_REGISTRY = sys.platform == "win32"
+
+def import_gui_modules():
+    global tk, ttk, messagebox, tkFont, sv_ttk
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    import tkinter.font as tkFont
+    import sv_ttk
 
 # --- Konstanten und globale Variablen ---
 try:
@@ -33,23 +45,67 @@ except Exception as e:
 
 DEFAULT_CHECK_CYCLE_SEC = 60
 DEFAULT_START_DELAY_SEC = 15
+DEFAULT_RESTART_BACKOFF_SEC = 5
+DEFAULT_RESTART_BACKOFF_MULTIPLIER = 2.0
+DEFAULT_RESTART_BACKOFF_MAX_SEC = 300
+DEFAULT_RESTART_STABLE_SEC = 60
+DEFAULT_CRASH_LOOP_THRESHOLD = 3
+DEFAULT_PROBE_TIMEOUT_SEC = 5
+DEFAULT_PROBE_FAILURE_THRESHOLD = 2
+DEFAULT_PROBE_HEARTBEAT_MAX_AGE_SEC = 60
+DEFAULT_CPU_SAMPLES = 3
+TERMINATE_TIMEOUT_SEC = 5
 DEBUG_MODE = False
+HEADLESS_MODE = False
+log_stream = None  # Ziel für Konsolen-Logs (None = stdout), im Headless-Modus ggf. eine Logdatei
 SHORT_ADLIB_INTERVAL_SEC = 1.0
+CONFIG_POLL_INTERVAL_SEC = 2.0  # Prüfintervall für Änderungen an der INI, wenn inotify nicht verfügbar ist
+CONFIG_WRITE_DEBOUNCE_SEC = 0.5  # Änderungen innerhalb dieses Zeitfensters werden zu einem Schreibvorgang zusammengefasst
+UI_REFRESH_INTERVAL_MS = 100  # Takt, mit dem der GUI-Thread Meldungen des Watchdog-Threads übernimmt (10 Hz)
+PROGRAM_LIST_COLUMNS = ("nr", "name", "path", "enabled"); PROGRAM_LIST_TITLES = ("Nr.", "Name", "Path", "Activated")
+PROGRAM_LIST_DEFAULT_ROWS = 10; PROGRAM_LIST_FALLBACK_ROW_HEIGHT = 20; PROGRAM_LIST_WHEEL_ROWS = 3
 BASE_FONT_SIZE = 10
 
 # Globale Variablen
 config = configparser.ConfigParser(inline_comment_prefixes=('#',';'), interpolation=None)
-program_list = []
+# program_registry (ProgramRegistry) wird im Abschnitt "Programmverzeichnis" angelegt
 check_cycle_sec = DEFAULT_CHECK_CYCLE_SEC
 start_delay_sec = DEFAULT_START_DELAY_SEC
 program_count = 0
 is_running = False
 watchdog_thread = None
 stop_event = None
+child_processes = {}  # Sektion -> Popen der vom Watchdog selbst gestarteten Prozesse
+watchdog_events = queue.Queue()  # Ereignisse an die Watchdog-Schleife (z. B. Prozessende eines Kindprozesses)
+config_write_pending = None  # neuester, noch nicht geschriebener INI-Inhalt (von save_config_to_file serialisiert)
+config_write_lock = threading.Lock()  # schützt config_write_pending
+config_file_lock = threading.Lock()  # serialisiert die eigentlichen Schreibvorgänge (Writer-Thread und flush_config_writes)
+config_write_requested = threading.Event()
+config_writer_thread = None
+config_watcher_thread = None
+config_reload_requested_at = None  # GUI-Modus: Erkennungszeitpunkt einer INI-Änderung, übernommen von _drain_ui_updates
+ui_status_slot = None  # (laufende Nummer, translation_key, args, kwargs) der neuesten Statusmeldung aus einem Hintergrund-Thread
+ui_status_sequence = itertools.count(1)
+ui_last_drawn_status = 0  # laufende Nummer der zuletzt gezeichneten Slot-Meldung
+ui_dirty_rows = set()  # Sektionen, deren Treeview-Zeile neu gezeichnet werden muss
+restart_backoff_sec = DEFAULT_RESTART_BACKOFF_SEC  # Wartezeit vor dem ersten Neustart nach einem Absturz kurz nach dem Start
+restart_backoff_multiplier = DEFAULT_RESTART_BACKOFF_MULTIPLIER  # Faktor je weiterem Fehlstart
+restart_backoff_max_sec = DEFAULT_RESTART_BACKOFF_MAX_SEC  # Obergrenze der Wartezeit
+restart_stable_sec = DEFAULT_RESTART_STABLE_SEC  # Laufzeit, ab der ein Start als erfolgreich gilt (setzt den Backoff zurück)
+crash_loop_threshold = DEFAULT_CRASH_LOOP_THRESHOLD  # Fehlstarts in Folge, ab denen ein Eintrag als Crash-Loop markiert wird
+probe_failure_threshold = DEFAULT_PROBE_FAILURE_THRESHOLD  # fehlgeschlagene Probes in Folge bis zum Neustart
+async_loop = None  # asyncio-Eventloop im Thread "AsyncLoop" (Probes und Steuer-Schnittstelle)
+async_loop_lock = threading.Lock()
+crash_looping_sections = set()  # Sektionen, die aktuell als Crash-Loop markiert sind (Treeview)
+metrics_file = ''  # [Settings] MetricsFile: Prometheus-Textdatei (leer = aus)
+metrics_port = 0  # [Settings] MetricsPort: HTTP-Port auf 127.0.0.1 für /metrics (0 = aus)
 
 # i18n Variablen
 current_language = "de"
-translations = {}
+translations = {}  # kompilierter Katalog der aktiven Sprache: Schlüssel -> (Text, %-Vorlage, Art, Platzhalter-Signatur)
+translation_misses = {}  # Schlüssel ohne Übersetzung in der aktiven Sprache -> kompilierter Schlüssel (None = nicht formatierbar)
+translation_catalogs = {}  # Sprachcode -> kompilierter Katalog; alle lang/*.json werden einmal geladen
+TRANSLATION_REFERENCE_LANGUAGE = "en"  # gegen diesen Katalog werden die Platzhalter der anderen Sprachen geprüft
 supported_languages = {"Deutsch": "de", "English": "en", "Česky": "cz", "Français": "fr", "Italiano": "it", "Español": "es", "Magyar": "hu"}
 language_var = None
 
@@ -57,18 +113,26 @@ language_var = None
 theme_preference_var = None
 current_theme_setting = "system"
 
-# Watchdog State Machine Variablen
-watchdog_state = 0; last_check_completion_time = 0.0; last_program_start_time = 0.0; current_program_index = 0
-
 # GUI Elemente Handles
 root = None; check_cycle_var_sec = None; start_delay_var_sec = None; btnSaveConfig = None
 tree_programs = None; inpProgPathAdd = None; inpProgNameAdd = None; chkEnabledVar = None; chkEnabledAdd = None
 btnAddProg = None; btnRemoveProg = None; btnEditProg = None; btnBrowseAdd = None
-btnStartWatchdog = None; btnStopWatchdog = None; btnExitApp = None
+btnStartWatchdog = None; btnStopWatchdog = None; btnExitApp = None; btnHistory = None; btnStatistics = None
 status_bar_text = None; style = None; help_font = None
 lblCheckCycle = None; lblStartDelay = None; lblLanguage = None; lblPathAdd = None; lblNameAdd = None; lblTheme = None
 settings_frame = None; programs_frame = None; add_frame = None; theme_frame = None
 r_system = None; r_light = None; r_dark = None; language_combo = None
+program_search_var = None; program_search_entry = None; lblSearch = None; program_scrollbar = None
+
+# Virtualisierte Programmliste (siehe _sync_program_rows)
+program_rows = {}  # Sektion -> (Werte, Tags) aller Programme, unabhängig davon, ob sie gerade sichtbar sind
+program_row_order = []  # Sektionen in INI-Reihenfolge
+program_search_index = []  # sortierte (Schlüssel, Sektion)-Paare aus Name, Pfad und Dateiname für die Präfixsuche
+program_view_sections = []  # gefilterte und sortierte Sektionen, die die Liste aktuell darstellt
+program_view_offset = 0; program_view_capacity = PROGRAM_LIST_DEFAULT_ROWS
+program_view_slots = {}  # Slot-iid -> (Sektion, Werte, Tags), die der Slot gerade anzeigt
+program_view_sort = None  # (Spalte, absteigend) oder None für die INI-Reihenfolge
+selected_program_section = None
 
 # --- Hilfsfunktionen ---
 
@@ -87,33 +151,57 @@ def get_icon_resource_path(relative_filename):
     base_path = get_base_path()
     return os.path.join(base_path, "icon", relative_filename)
 
+def write_log_line(line):
+    try: print(line, file=log_stream or sys.stdout, flush=True)
+    except Exception: pass
+
 def debug_log(message):
     if DEBUG_MODE:
         console_log_message = f"DEBUG ({time.strftime('%H:%M:%S')}): {message}"
-        print(console_log_message)
+        write_log_line(console_log_message)
 
 def update_status_message(translation_key, *args, **kwargs):
-    message_to_display = translate(translation_key, *args, **kwargs)
-    
+    # Aus dem GUI-Thread wird sofort gezeichnet. Andere Threads legen nur die neueste Meldung in ui_status_slot ab
+    # (eine Tupel-Zuweisung, kein Lock, kein translate()); _drain_ui_updates() zeichnet sie mit höchstens 10 Hz.
+    global ui_status_slot, ui_last_drawn_status
+    if HEADLESS_MODE:
+        write_log_line(f"STATUS ({time.strftime('%Y-%m-%d %H:%M:%S')}): {translate(translation_key, *args, **kwargs)}")
+        return
     if DEBUG_MODE:
-        print(f"STATUS_UI ({time.strftime('%H:%M:%S')}): {message_to_display}")
+        print(f"STATUS_UI ({time.strftime('%H:%M:%S')}): {translate(translation_key, *args, **kwargs)}")
 
-    def _update_status_safe_ui(msg_to_set):
-        try:
-            if root and root.winfo_exists() and status_bar_text:
-                status_bar_text.set(msg_to_set[:120])
-        except tk.TclError:
-            pass
-        except Exception as e_update_ui:
-            print(f"STATUS_UPDATE_ERROR: {e_update_ui}")
-
-    if root and status_bar_text:
-        current_thread = threading.current_thread()
-        main_thread = threading.main_thread()
-        if current_thread == main_thread:
-            _update_status_safe_ui(message_to_display)
-        else:
-            root.after(0, _update_status_safe_ui, message_to_display)
+    if threading.current_thread() is threading.main_thread() and root and status_bar_text:
+        slot = ui_status_slot
+        if slot is not None: ui_last_drawn_status = slot[0]  # ältere Meldungen aus dem Slot sind damit überholt
+        _set_status_bar_text(translate(translation_key, *args, **kwargs))
+    else:
+        ui_status_slot = (next(ui_status_sequence), translation_key, args, kwargs)
+
+def _set_status_bar_text(message):
+    try:
+        if root and root.winfo_exists() and status_bar_text:
+            status_bar_text.set(message[:120])
+    except tk.TclError:
+        pass
+    except Exception as e_update_ui:
+        print(f"STATUS_UPDATE_ERROR: {e_update_ui}")
+
+def _drain_ui_updates():
+    # Läuft im GUI-Thread alle UI_REFRESH_INTERVAL_MS: höchstens eine Statusmeldung und die seither geänderten
+    # Treeview-Zeilen, egal wie viele Aktualisierungen der Watchdog-Thread in der Zwischenzeit gemeldet hat.
+    global ui_last_drawn_status
+    try:
+        slot = ui_status_slot
+        if slot is not None and slot[0] != ui_last_drawn_status:
+            ui_last_drawn_status = slot[0]
+            _set_status_bar_text(translate(slot[1], *slot[2], **slot[3]))
+        while ui_dirty_rows: _refresh_program_row(ui_dirty_rows.pop())
+        if config_reload_requested_at is not None: _apply_requested_config_reload()
+        while not config_tasks.empty(): _complete_config_task(*config_tasks.get_nowait())
+    except Exception as e: debug_log(f"Fehler in _drain_ui_updates: {e}")
+    try:
+        if root and root.winfo_exists(): root.after(UI_REFRESH_INTERVAL_MS, _drain_ui_updates)
+    except tk.TclError: pass
 
 def apply_custom_font_sizes(base_size):
     global style
@@ -179,54 +267,97 @@ def apply_custom_font_sizes(base_size):
         traceback.print_exc()
 
 # --- Internationalization (i18n) ---
+def _compile_translation(text):
+    # Text einmalig zerlegen. Einfache Platzhalter ({}, {0}, {name} ohne Formatangabe) werden in eine %-Vorlage
+    # übersetzt, die beim Formatieren nicht erneut geparst werden muss; alles andere bleibt bei str.format.
+    try: parsed = list(string.Formatter().parse(text))
+    except ValueError: return None
+    named, positional_count, next_auto_index, percent_parts, simple = set(), 0, 0, [], True
+    for literal, field, format_spec, conversion in parsed:
+        percent_parts.append(literal.replace('%', '%%'))
+        if field is None: continue
+        if format_spec or conversion: simple = False
+        base_field = field.split('.', 1)[0].split('[', 1)[0]
+        if base_field == '' or base_field.isdigit():
+            index = int(base_field) if base_field else next_auto_index
+            if index != next_auto_index or base_field != field: simple = False
+            next_auto_index = index + 1; positional_count = max(positional_count, index + 1)
+            percent_parts.append('%s')
+        else:
+            if base_field != field: simple = False
+            named.add(base_field); percent_parts.append(f'%({field})s')
+    signature = (frozenset(named), positional_count)
+    if not named and not positional_count: mode = 'plain'
+    elif not simple or (named and positional_count): mode = 'format'
+    else: mode = 'named' if named else 'positional'
+    return (text, ''.join(percent_parts) if mode in ('named', 'positional') else None, mode, signature)
+
+def _read_translation_catalog(lang_code):
+    lang_file = get_lang_resource_path(f"{lang_code}.json")
+    with open(lang_file, 'r', encoding='utf-8') as f: raw_catalog = json.load(f)
+    catalog = {}
+    for key, text in raw_catalog.items():
+        compiled = _compile_translation(text) if isinstance(text, str) else None
+        if compiled is None: debug_log(f"WARNUNG: Ungültiger Übersetzungstext für '{key}' in '{lang_file}' wird ignoriert."); continue
+        catalog[key] = compiled
+    return catalog
+
+def _validate_translation_catalog(lang_code, catalog, reference_catalog):
+    # Abweichende Platzhalter würden erst beim Formatieren auffallen; stattdessen gilt für diese Schlüssel der Referenztext
+    for key, compiled in catalog.items():
+        reference = reference_catalog.get(key)
+        if reference is not None and compiled[3] != reference[3]:
+            debug_log(f"WARNUNG: Platzhalter von '{key}' in '{lang_code}.json' passen nicht zu '{TRANSLATION_REFERENCE_LANGUAGE}.json'. Verwende den Referenztext.")
+            catalog[key] = reference
+
+def load_translation_catalogs():
+    # Alle Sprachdateien einmal einlesen, kompilieren und prüfen; ein späterer Sprachwechsel liest nichts mehr von der Platte
+    global translation_catalogs
+    started = time.perf_counter(); catalogs = {}
+    try: lang_files = sorted(name for name in os.listdir(get_lang_resource_path("")) if name.endswith(".json"))
+    except OSError as e: debug_log(f"WARNUNG: Sprachverzeichnis nicht lesbar: {e}"); lang_files = []
+    for lang_file in lang_files:
+        lang_code = lang_file[:-len(".json")]
+        try: catalogs[lang_code] = _read_translation_catalog(lang_code)
+        except json.JSONDecodeError as e_json: debug_log(f"FEHLER: Sprachdatei '{lang_file}' ist fehlerhaft (JSONDecodeError): {e_json}")
+        except Exception as e: debug_log(f"FEHLER beim Laden/Verarbeiten der Sprachdatei '{lang_file}': {e}")
+    reference_catalog = catalogs.get(TRANSLATION_REFERENCE_LANGUAGE, {})
+    for lang_code, catalog in catalogs.items():
+        if lang_code != TRANSLATION_REFERENCE_LANGUAGE: _validate_translation_catalog(lang_code, catalog, reference_catalog)
+    translation_catalogs = catalogs
+    debug_log(f"{len(catalogs)} Sprachkataloge in {(time.perf_counter() - started) * 1000:.1f} ms geladen: {', '.join(catalogs)}")
+    return catalogs
+
 def load_language(lang_code='de', is_initial_load=False):
     global translations, current_language
     original_requested_lang = lang_code
     fallback_order = [lang_code, 'en', 'de']
     seen = set()
     unique_fallback_order = [x for x in fallback_order if not (x in seen or seen.add(x))]
+    if not translation_catalogs: load_translation_catalogs()
+    translation_misses.clear()
 
     loaded_successfully = False
     loaded_lang_code = None
 
     for code_to_try in unique_fallback_order:
-        lang_file = get_lang_resource_path(f"{code_to_try}.json")
-        debug_log(f"Versuche Sprachdatei zu laden: '{lang_file}' (für ursprünglich angefordertes '{original_requested_lang}')")
-
-        if not os.path.exists(lang_file):
-            debug_log(f"WARNUNG: Sprachdatei '{lang_file}' existiert nicht.")
+        catalog = translation_catalogs.get(code_to_try)
+        if catalog is None:
+            debug_log(f"WARNUNG: Kein Sprachkatalog für '{code_to_try}' vorhanden (für ursprünglich angefordertes '{original_requested_lang}').")
             continue
-        try:
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                translations = json.load(f)
-            current_language = code_to_try
-            loaded_lang_code = code_to_try
-            debug_log(f"Sprachdatei '{lang_file}' erfolgreich geladen und als '{current_language}' gesetzt.")
-            loaded_successfully = True
-            break
-        except json.JSONDecodeError as e_json:
-            debug_log(f"FEHLER: Sprachdatei '{lang_file}' ist fehlerhaft (JSONDecodeError): {e_json}")
-        except Exception as e:
-            debug_log(f"FEHLER beim Laden/Verarbeiten der Sprachdatei '{lang_file}': {e}")
+        translations = catalog
+        current_language = code_to_try
+        loaded_lang_code = code_to_try
+        debug_log(f"Sprachkatalog '{code_to_try}' aktiviert.")
+        loaded_successfully = True
+        break
 
     if not loaded_successfully:
-        debug_log(f"WARNUNG: Keine Sprachdatei konnte für '{original_requested_lang}' oder definierte Fallbacks geladen werden. Setze auf 'de' (hartkodiert) und versuche, 'de.json' zu laden.")
+        debug_log(f"WARNUNG: Kein Sprachkatalog für '{original_requested_lang}' oder definierte Fallbacks vorhanden. Setze auf 'de', Übersetzungen bleiben leer.")
         translations = {}
         current_language = 'de'
         loaded_lang_code = 'de'
 
-        de_lang_file = resource_path("de.json")
-        if os.path.exists(de_lang_file):
-            try:
-                with open(de_lang_file, 'r', encoding='utf-8') as f_de:
-                    translations = json.load(f_de)
-                debug_log("Fallback auf hartkodiertes 'de.json' erfolgreich geladen.")
-            except Exception as e_de_final:
-                debug_log(f"FEHLER: Konnte selbst das hartkodierte 'de.json' nicht laden: {e_de_final}")
-                translations = {}
-        else:
-            debug_log("WARNUNG: Hartkodierte Fallback-Sprachdatei 'de.json' existiert nicht. Übersetzungen bleiben leer.")
-
     if not is_initial_load:
         if loaded_successfully and loaded_lang_code != original_requested_lang:
             if root and root.winfo_exists():
@@ -245,25 +376,34 @@ def load_language(lang_code='de', is_initial_load=False):
     return loaded_successfully
 
 def translate(key, *args, **kwargs):
-    translated = translations.get(key, key)
+    # Heißer Pfad: ein Dict-Zugriff; Texte mit einfachen Platzhaltern werden über die vorkompilierte %-Vorlage formatiert
+    compiled = translations.get(key)
+    if compiled is None:
+        try: compiled = translation_misses[key]
+        except KeyError: compiled = translation_misses[key] = _compile_translation(key)
+        if compiled is None: return key
+    if not args and not kwargs: return compiled[0]
+    text, percent_template, mode, signature = compiled
     try:
-        if kwargs:
-            return translated.format(**kwargs)
-        elif args:
-            return translated.format(*args)
-        else:
-            return translated
+        if mode == 'named' and not args: return percent_template % kwargs
+        if mode == 'positional' and not kwargs and len(args) >= signature[1]: return percent_template % args[:signature[1]]
+        return text.format(*args, **kwargs)
     except KeyError: 
         debug_log(f"FEHLER Formatieren (KeyError) Text '{key}'. Platzhalter passen nicht oder Schlüssel falsch.")
         return key 
     except Exception as e: 
-        debug_log(f"FEHLER Formatieren Text '{key}': {e} - Übersetzter Text war: '{translated}'")
-        return translated
+        debug_log(f"FEHLER Formatieren Text '{key}': {e} - Übersetzter Text war: '{text}'")
+        return text
 
 # --- Windows Dark Mode Erkennung ---
 def check_windows_dark_mode():
     if not CAN_CHECK_REGISTRY:
-        print("INFO: check_windows_dark_mode: Registry-Check nicht möglich (Modul 'winreg' nicht importiert). System-Theme wird als 'light' interpretiert.")
+        print("INFO: check_windows_dark_mode: Registry-Check nicht möglich (kein Windows). System-Theme wird als 'light' interpretiert.")
+        return False
+    try:
+        import winreg
+    except ImportError:
+        print("WARNUNG: Modul 'winreg' nicht gefunden. System-Theme-Erkennung nicht verfügbar, System-Theme wird als 'light' interpretiert.")
         return False
     try:
         key_path = r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
@@ -289,41 +429,215 @@ def _fixed_map(option):
     except Exception as e: debug_log(f"Fehler in _fixed_map '{option}': {e}"); return []
 
 # --- Speichert Config ---
-def save_config_to_file():
-    global config; debug_log(f"Schreibe INI: {CONFIG_FILE}")
+# save_config_to_file() serialisiert config sofort (konsistenter Stand), geschrieben wird im Hintergrund-Thread
+# "ConfigWriter": mehrere Änderungen kurz hintereinander ergeben einen Schreibvorgang. Geschrieben wird in eine
+# temporäre Datei, die nach fsync per os.replace die INI ersetzt - ein Abbruch hinterlässt nie eine halbe Datei.
+def write_file_atomically(path, content, newline=None, fsync=True):
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline=newline) as f:
+        f.write(content)
+        if fsync: f.flush(); os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def rotate_file(path, backups):
+    # path -> path.1 -> ... -> path.<backups>; die älteste Datei fällt weg (backups = 0: path wird gelöscht)
+    if backups <= 0: os.remove(path); return
+    for index in range(backups - 1, 0, -1):
+        if os.path.exists(f"{path}.{index}"): os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+    os.replace(path, f"{path}.1")
+
+def save_config_to_file(wait=False):
+    # wait=True schreibt sofort und synchron (z. B. beim Anlegen der Standard-INI), sonst gepuffert im Hintergrund.
+    global config, config_write_pending, config_writer_thread; debug_log(f"Schreibe INI: {CONFIG_FILE}")
     try:
         if config.has_section('Settings'):
             if config.has_option('Settings', 'checkcycle'): config.remove_option('Settings', 'checkcycle')
             if config.has_option('Settings', 'startdelay'): config.remove_option('Settings', 'startdelay')
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as configfile: config.write(configfile)
-        debug_log("...INI schreiben erfolgreich."); return True
-    except Exception as e: debug_log(f"FEHLER Schreiben INI: {e}"); messagebox.showerror(translate("Error"), translate("Error writing config file:\n{}").format(e), parent=root); return False
+        buffer = io.StringIO(); config.write(buffer)
+    except Exception as e:
+        _report_config_write_error(e); return False
+    with config_write_lock: config_write_pending = buffer.getvalue()
+    if wait: return flush_config_writes()
+    if config_writer_thread is None:
+        config_writer_thread = threading.Thread(target=_config_writer, name="ConfigWriter", daemon=True); config_writer_thread.start()
+    config_write_requested.set()
+    return True
+
+def _config_writer():
+    while True:
+        config_write_requested.wait()
+        while True:  # Entprellen: erst schreiben, wenn CONFIG_WRITE_DEBOUNCE_SEC lang keine neue Änderung kam
+            config_write_requested.clear()
+            if not config_write_requested.wait(CONFIG_WRITE_DEBOUNCE_SEC): break
+        flush_config_writes()
+
+def flush_config_writes():
+    # Schreibt einen ausstehenden INI-Inhalt sofort (aus jedem Thread aufrufbar). Rückgabe False bei Schreibfehler.
+    global config_write_pending
+    with config_file_lock:
+        with config_write_lock: content = config_write_pending; config_write_pending = None
+        if content is None: return True
+        try: write_file_atomically(CONFIG_FILE, content)
+        except Exception as e: _report_config_write_error(e); return False
+    debug_log("...INI schreiben erfolgreich."); return True
+
+def _report_config_write_error(error):
+    debug_log(f"FEHLER Schreiben INI: {error}")
+    if not root: write_log_line(f"FEHLER ({time.strftime('%H:%M:%S')}): Schreiben von '{CONFIG_FILE}' fehlgeschlagen: {error}"); return
+    def _show_error(): messagebox.showerror(translate("Error"), translate("Error writing config file:\n{}").format(error), parent=root)
+    if threading.current_thread() is threading.main_thread(): _show_error(); return
+    try: root.after(0, _show_error)
+    except (RuntimeError, tk.TclError) as e_after: debug_log(f"Fehlermeldung nicht planbar: {e_after}")
 
 def create_default_ini():
     global config, current_language, current_theme_setting; debug_log("Erstelle Standard-INI Konfig...")
     config = configparser.ConfigParser(inline_comment_prefixes=('#',';'), interpolation=None)
     config.add_section('Settings'); config['Settings']['CheckCycleSec'] = str(DEFAULT_CHECK_CYCLE_SEC); config['Settings']['StartDelaySec'] = str(DEFAULT_START_DELAY_SEC); config['Settings']['Language'] = current_language; config['Settings']['ThemePreference'] = current_theme_setting
     debug_log(f"... Defaults: Cycle={DEFAULT_CHECK_CYCLE_SEC}s, Delay={DEFAULT_START_DELAY_SEC}s, Lang={current_language}, Theme={current_theme_setting}")
-    saved = save_config_to_file();
+    saved = save_config_to_file(wait=True);
     if not saved: debug_log("!!! FEHLER Erstellen Default-INI!")
     return saved
 
+# --- Programmverzeichnis ---
+# Ein ProgramRegistry wird bei jedem Laden neu aufgebaut und als Ganzes veröffentlicht; die Watchdog-Schleife
+# erkennt ein neues Verzeichnis an der Identität. Die ProgramRecord-Einträge (kompakt dank __slots__) bleiben über
+# ein Neuladen erhalten, solange sich ihre Sektion nicht ändert - samt gepinnter PID.
+class ProgramRecord:
+    __slots__ = ('section', 'name', 'path', 'process_name', 'enabled', 'check_cycle_sec', 'start_delay_sec', 'depends_on',
+                 'probes', 'probe_timeout_sec', 'limits', 'pid', 'create_time', 'launch')
+
+    def __init__(self, section, name, path, process_name, enabled, check_cycle_sec=None, start_delay_sec=None, depends_on=(),
+                 probes=(), probe_timeout_sec=DEFAULT_PROBE_TIMEOUT_SEC, limits=None, pid=None, create_time=None, launch=None):
+        self.section = section; self.name = name; self.path = path; self.process_name = process_name; self.enabled = enabled
+        self.check_cycle_sec = check_cycle_sec; self.start_delay_sec = start_delay_sec  # None = globaler Wert aus [Settings]
+        self.depends_on = tuple(depends_on); self.probes = tuple(probes); self.probe_timeout_sec = probe_timeout_sec; self.limits = limits
+        self.pid = pid; self.create_time = create_time
+        self.launch = launch if launch is not None else LaunchSpec(path)  # vorbereiteter Start, siehe start_program()
+
+class ProgramRegistry:
+    # Indizes nach Sektion, normalisiertem Pfad und Prozessname (klein); neue Sektionsnamen in O(1) ohne Obergrenze.
+    __slots__ = ('_records', '_by_section', '_by_path', '_by_process_name', '_next_section_number')
+
+    def __init__(self, records=(), section_names=()):
+        self._records = tuple(records)
+        self._by_section = {record.section: record for record in self._records}
+        self._by_path = {}; self._by_process_name = {}
+        for record in self._records:
+            self._by_path.setdefault(normalize_process_path(record.path), []).append(record)
+            self._by_process_name.setdefault(record.process_name.lower(), []).append(record)
+        # section_names: alle ProgramN-Sektionen der INI, auch unvollständige, damit deren Namen nicht doppelt vergeben werden
+        section_numbers = [int(section[7:]) for section in section_names if section[7:].isdigit()]
+        self._next_section_number = max(section_numbers, default=0) + 1
+
+    def __iter__(self): return iter(self._records)
+    def __len__(self): return len(self._records)
+    def get(self, section): return self._by_section.get(section)
+    def find_by_path(self, path): return tuple(self._by_path.get(normalize_process_path(path), ()))
+    def find_by_process_name(self, process_name): return tuple(self._by_process_name.get(process_name.lower(), ()))
+
+    def allocate_section(self):
+        section = f"Program{self._next_section_number}"
+        self._next_section_number += 1
+        return section
+
+program_registry = ProgramRegistry()
+
+# --- Hot Reload der INI ---
+# Der Thread "ConfigWatcher" bemerkt Änderungen an watchdog.ini (Linux: inotify auf das Verzeichnis, damit auch
+# per Umbenennen ersetzte Dateien erkannt werden; sonst mtime/Größe alle CONFIG_POLL_INTERVAL_SEC).
+# Headless wird direkt im Watcher-Thread neu geladen, mit GUI im Tk-Thread über _drain_ui_updates.
+# Die laufende Watchdog-Schleife übernimmt das neue program_registry, ohne angehalten zu werden.
+def _config_file_signature():
+    try: stat_result = os.stat(CONFIG_FILE); return (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError: return None
+
+def _watch_config_polling(on_change):
+    last_signature = _config_file_signature()
+    while True:
+        time.sleep(CONFIG_POLL_INTERVAL_SEC)
+        signature = _config_file_signature()
+        if signature != last_signature: last_signature = signature; on_change(time.monotonic())
+
+def _watch_config_inotify(on_change):
+    import ctypes, ctypes.util, select, struct
+    IN_CLOSE_WRITE = 0x08; IN_MOVED_TO = 0x80
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if inotify_fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1")
+    if libc.inotify_add_watch(inotify_fd, os.fsencode(os.path.dirname(CONFIG_FILE) or '.'), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        error_number = ctypes.get_errno(); os.close(inotify_fd); raise OSError(error_number, "inotify_add_watch")
+    config_name = os.fsencode(os.path.basename(CONFIG_FILE))
+    debug_log(f"Hot Reload: inotify überwacht '{CONFIG_FILE}'.")
+    while True:
+        select.select([inotify_fd], [], [])
+        try: data = os.read(inotify_fd, 65536)
+        except BlockingIOError: continue
+        offset = 0; config_changed = False
+        while offset + 16 <= len(data):
+            _, _, _, name_length = struct.unpack_from('iIII', data, offset)
+            if data[offset + 16:offset + 16 + name_length].rstrip(b'\0') == config_name: config_changed = True
+            offset += 16 + name_length
+        if config_changed: on_change(time.monotonic())
+
+def start_config_watcher():
+    global config_watcher_thread
+    if config_watcher_thread is not None: return
+    def _on_config_change(detected_at):
+        global config_reload_requested_at
+        if HEADLESS_MODE: run_config_task(lambda: reload_config_from_disk(detected_at))
+        elif config_reload_requested_at is None: config_reload_requested_at = detected_at
+    def _watch():
+        if sys.platform.startswith('linux'):
+            try: _watch_config_inotify(_on_config_change); return
+            except Exception as e: debug_log(f"Hot Reload: inotify nicht nutzbar ({e}), verwende Polling.")
+        _watch_config_polling(_on_config_change)
+    config_watcher_thread = threading.Thread(target=_watch, name="ConfigWatcher", daemon=True)
+    config_watcher_thread.start()
+
+def _apply_requested_config_reload():
+    global config_reload_requested_at
+    detected_at = config_reload_requested_at; config_reload_requested_at = None
+    reload_config_from_disk(detected_at)
+
+def reload_config_from_disk(detected_at, restart_control_server=True):
+    # Liest die INI neu und übernimmt nur Sektionen, deren Inhalt sich gegenüber dem geladenen Stand geändert hat.
+    # Rückgabe: Liste der geänderten Sektionen (None, wenn nichts übernommen wurde).
+    # restart_control_server=False: Aufruf über die Steuer-Schnittstelle, die den Socket erst nach ihrer Antwort tauscht.
+    global config
+    if config_write_pending is not None: debug_log("Hot Reload übersprungen: eigene INI-Änderung wird gerade geschrieben."); return
+    parse_started = time.perf_counter()
+    new_config = configparser.ConfigParser(inline_comment_prefixes=('#',';'), interpolation=None)
+    try: new_config.read(CONFIG_FILE, encoding='utf-8')
+    except configparser.Error as e: write_log_line(f"FEHLER ({time.strftime('%H:%M:%S')}): Hot Reload von '{CONFIG_FILE}' fehlgeschlagen: {e}"); return
+    parse_ms = (time.perf_counter() - parse_started) * 1000
+    old_sections = {section: dict(config.items(section, raw=True)) for section in config.sections()}
+    new_sections = {section: dict(new_config.items(section, raw=True)) for section in new_config.sections()}
+    changed_sections = [section for section in set(old_sections) | set(new_sections) if old_sections.get(section) != new_sections.get(section)]
+    if not changed_sections: debug_log(f"Hot Reload: '{CONFIG_FILE}' ohne inhaltliche Änderung ({parse_ms:.1f} ms)."); return
+    if not new_config.has_section('Settings'): new_config.add_section('Settings')
+    config = new_config
+    load_settings_and_programs(changed_sections=changed_sections)
+    if is_running:
+        start_metrics_server(metrics_port)
+        if restart_control_server: start_control_server(control_socket)
+    write_log_line(f"INFO ({time.strftime('%H:%M:%S')}): Konfiguration neu geladen: {len(changed_sections)} geänderte Sektion(en) ({', '.join(sorted(changed_sections))}), "
+                   f"Parsen {parse_ms:.1f} ms, Latenz {(time.monotonic() - detected_at) * 1000:.0f} ms.")
+    return changed_sections
+
 # --- Lädt Settings und Programme ---
-def load_settings_and_programs():
-    global config, program_list, check_cycle_sec, start_delay_sec, program_count
+def load_settings_and_programs(changed_sections=None):
+    # changed_sections: Sektionen, die sich seit dem letzten Laden geändert haben (z. B. nach Hinzufügen/Bearbeiten).
+    # Alle anderen, bereits geladenen Programme werden unverändert übernommen, statt ihre Sektion erneut zu lesen.
+    # None = alle Sektionen neu lesen. Der Treeview wird in jedem Fall nur um die Unterschiede aktualisiert.
+    global config, program_registry, check_cycle_sec, start_delay_sec, program_count
     global current_language, current_theme_setting
     global check_cycle_var_sec, start_delay_var_sec, tree_programs, language_var, theme_preference_var
 
     debug_log(f"Lade Einstellungen und Programmliste (Sprache: {current_language}, Theme-Präf.: {current_theme_setting}).")
-    program_list = []
+    previous_registry = program_registry
+    loaded_records = []  # wird erst am Ende als program_registry veröffentlicht (die Watchdog-Schleife sieht nie ein halbes Verzeichnis)
     program_count = 0
-
-    if tree_programs:
-        try:
-            for item in tree_programs.get_children():
-                tree_programs.delete(item)
-        except Exception as e:
-            debug_log(f"Fehler beim Leeren des Treeview: {e}")
+    tree_rows = []  # (iid, values, tags) in Anzeigereihenfolge für _sync_program_rows
     
     try:
         check_cycle_sec = config.getint('Settings', 'CheckCycleSec', fallback=DEFAULT_CHECK_CYCLE_SEC)
@@ -341,6 +655,11 @@ def load_settings_and_programs():
         check_cycle_sec = DEFAULT_CHECK_CYCLE_SEC
         start_delay_sec = DEFAULT_START_DELAY_SEC
         debug_log(f"GUI-Settings übernommen: Prüfzyklus={check_cycle_sec}s, Startverzögerung={start_delay_sec}s")
+    load_restart_policy_settings()
+    load_metrics_settings()
+    load_journal_settings()
+    load_stats_settings()
+    load_control_settings()
     if check_cycle_var_sec: check_cycle_var_sec.set(str(check_cycle_sec))
     if start_delay_var_sec: start_delay_var_sec.set(str(start_delay_sec))
     
@@ -361,8 +680,16 @@ def load_settings_and_programs():
     except ValueError:
         debug_log("WARNUNG: Konnte Programm-Sektionen nicht numerisch sortieren.")
 
+
     for section_name in prog_sections:
         try:
+            previous_program = previous_registry.get(section_name)
+            if previous_program is not None and changed_sections is not None and section_name not in changed_sections:
+                loaded_records.append(previous_program); program_count += 1
+                if tree_programs:
+                    translated_enabled_string, row_tags = _program_row_state(section_name, previous_program.enabled)
+                    tree_rows.append((section_name, (program_count, previous_program.name, previous_program.path, translated_enabled_string), row_tags))
+                continue
             name = config.get(section_name, 'Name', fallback='').strip()
             path = config.get(section_name, 'Path', fallback='').strip()
             # ProcessName fehlt bei älteren Configs (vor der Trennung Anzeigename/Prozessname) -> aus Path ableiten
@@ -370,33 +697,50 @@ def load_settings_and_programs():
             if not process_name and path:
                 process_name = os.path.basename(path)
             enabled = config.getboolean(section_name, 'Enabled', fallback=False)
+            # Optionale Überschreibungen der globalen Werte aus [Settings]; None = globaler Wert gilt
+            prog_check_cycle_sec = _read_program_override(section_name, 'CheckCycleSec', 1)
+            prog_start_delay_sec = _read_program_override(section_name, 'StartDelaySec', 0)
+            # DependsOn: kommagetrennte Sektionsnamen, die laufen müssen, bevor dieses Programm gestartet wird
+            depends_on = [d.strip() for d in config.get(section_name, 'DependsOn', fallback='').split(',') if d.strip()]
+            probes = _read_program_probes(section_name)
+            probe_timeout_sec = _read_program_override(section_name, 'ProbeTimeoutSec', 1) or DEFAULT_PROBE_TIMEOUT_SEC
+            limits = _read_program_limits(section_name)
 
             if name and path:
-                program_list.append({'name': name, 'path': path, 'process_name': process_name, 'enabled': enabled, 'section': section_name})
+                # Gepinnte Prozess-Identitäten (PID/create_time) überleben ein Neuladen, solange der Pfad gleich bleibt
+                pinned_pid = pinned_create_time = None
+                if previous_program is not None and previous_program.path == path: pinned_pid = previous_program.pid; pinned_create_time = previous_program.create_time
+                record = ProgramRecord(section_name, name, path, process_name, enabled, prog_check_cycle_sec, prog_start_delay_sec, depends_on, probes, probe_timeout_sec, limits, pinned_pid, pinned_create_time,
+                                       LaunchSpec(path, capture=_read_program_capture(section_name)))
+                if record.launch.error: debug_log(f"WARNUNG: '{name}' kann so nicht gestartet werden ({path}: {record.launch.error}).")
+                loaded_records.append(record)
                 program_count += 1
                 
                 if tree_programs:
-                    enabled_key_string = str(enabled) 
-                    translated_enabled_string = translate(enabled_key_string) 
+                    translated_enabled_string, row_tags = _program_row_state(section_name, enabled)
                     
                     values = (program_count, name, path, translated_enabled_string)
                     
-                    tree_programs.insert("", tk.END, iid=section_name, values=values, tags=('disabled_row',) if not enabled else ())
+                    tree_rows.append((section_name, values, row_tags))
             else:
                 debug_log(f"WARNUNG: Ungültiger oder unvollständiger Eintrag in Sektion {section_name} übersprungen (Name oder Pfad fehlt).")
         except Exception as e:
             debug_log(f"FEHLER beim Lesen der Sektion {section_name}: {e}")
     
     if tree_programs:
+        try: _sync_program_rows(tree_rows)
+        except Exception as e: debug_log(f"Fehler beim Aktualisieren des Treeview: {e}")
         try:
             current_theme_for_disabled_row = sv_ttk.get_theme() if 'sv_ttk' in sys.modules else "light"
             disabled_fg_color = "gray"
             if current_theme_for_disabled_row == "dark":
                 disabled_fg_color = "#A0A0A0"
             tree_programs.tag_configure('disabled_row', foreground=disabled_fg_color)
+            tree_programs.tag_configure('crash_loop_row', foreground="#E05050")
         except Exception as e:
             debug_log(f"Fehler bei der Konfiguration des Treeview-Tags 'disabled_row': {e}")
             
+    program_registry = ProgramRegistry(loaded_records, prog_sections)
     update_status_message("Status.ProgramListLoadedCount", program_count)
     debug_log(f"Programmliste Ladevorgang abgeschlossen. {program_count} Programme gefunden und geladen.")
     
@@ -405,6 +749,209 @@ def load_settings_and_programs():
         
     return True
 
+# --- Virtualisierte Programmliste ---
+# Der Treeview enthält nur so viele feste Zeilen ("slot0", "slot1", ...) wie sichtbar sind; deren Werte werden beim
+# Scrollen, Suchen und Sortieren ersetzt. Damit bleibt die Liste auch bei zehntausenden Programmen flüssig.
+def _sync_program_rows(rows):
+    # rows: (Sektion, Werte, Tags) aller Programme in INI-Reihenfolge; baut den Präfix-Index für die Suche neu auf
+    global program_rows, program_row_order, program_search_index, selected_program_section
+    program_rows = {section: (tuple(values), tuple(tags)) for section, values, tags in rows}
+    program_row_order = [section for section, values, tags in rows]
+    search_index = []
+    for section, values, tags in rows:
+        name, path = str(values[1]).lower(), str(values[2]).lower()
+        for key in {name, path, os.path.basename(path)}: search_index.append((key, section))
+    search_index.sort(); program_search_index = search_index
+    if selected_program_section not in program_rows: selected_program_section = None
+    _update_program_view()
+
+def _search_program_sections(query):
+    # Alle Sektionen, deren Name, Pfad oder Dateiname mit query beginnt (Binärsuche im sortierten Index)
+    query = query.lower(); matches = set()
+    for key, section in itertools.islice(program_search_index, bisect.bisect_left(program_search_index, (query,)), None):
+        if not key.startswith(query): break
+        matches.add(section)
+    return matches
+
+def _program_sort_key(column):
+    if column == "nr": return lambda section: int(program_rows[section][0][0])
+    column_index = PROGRAM_LIST_COLUMNS.index(column)
+    return lambda section: str(program_rows[section][0][column_index]).lower()
+
+def _update_program_view():
+    # Filter und Sortierung auf die Python-Liste anwenden, danach nur die sichtbaren Zeilen zeichnen
+    global program_view_sections
+    query = program_search_var.get().strip() if program_search_var else ''
+    sections = program_row_order
+    if query:
+        matches = _search_program_sections(query)
+        sections = [section for section in sections if section in matches]
+    if program_view_sort: sections = sorted(sections, key=_program_sort_key(program_view_sort[0]), reverse=program_view_sort[1])
+    program_view_sections = sections
+    _render_program_view()
+
+def _render_program_view():
+    global program_view_offset
+    if not tree_programs: return
+    total = len(program_view_sections)
+    program_view_offset = max(0, min(program_view_offset, total - program_view_capacity))
+    visible = program_view_sections[program_view_offset:program_view_offset + program_view_capacity]
+    slot_iids = list(tree_programs.get_children())
+    while len(slot_iids) < len(visible):
+        slot_iid = f"slot{len(slot_iids)}"; tree_programs.insert("", tk.END, iid=slot_iid); slot_iids.append(slot_iid)
+    if len(slot_iids) > len(visible):
+        for slot_iid in slot_iids[len(visible):]: program_view_slots.pop(slot_iid, None)
+        tree_programs.delete(*slot_iids[len(visible):]); slot_iids = slot_iids[:len(visible)]
+    selected_slot = None
+    for slot_iid, section in zip(slot_iids, visible):
+        values, tags = program_rows[section]
+        if program_view_slots.get(slot_iid) != (section, values, tags):
+            tree_programs.item(slot_iid, values=values, tags=tags); program_view_slots[slot_iid] = (section, values, tags)
+        if section == selected_program_section: selected_slot = slot_iid
+    current_selection = tree_programs.selection()
+    if selected_slot and current_selection != (selected_slot,): tree_programs.selection_set(selected_slot)
+    elif not selected_slot and current_selection: tree_programs.selection_remove(*current_selection)
+    if program_scrollbar:
+        if total: program_scrollbar.set(program_view_offset / total, (program_view_offset + len(visible)) / total)
+        else: program_scrollbar.set(0, 1)
+
+def _section_for_slot(slot_iid):
+    slot = program_view_slots.get(slot_iid)
+    return slot[0] if slot else None
+
+def _on_program_list_resize(event=None):
+    # Anzahl der Slots an die tatsächliche Höhe des Treeview anpassen
+    global program_view_capacity
+    try:
+        children = tree_programs.get_children()
+        bbox = tree_programs.bbox(children[0]) if children else ''
+        if bbox: heading_height, row_height = bbox[1], bbox[3]
+        else:
+            row_height = int(style.lookup("Treeview", "rowheight") or PROGRAM_LIST_FALLBACK_ROW_HEIGHT) if style else PROGRAM_LIST_FALLBACK_ROW_HEIGHT
+            heading_height = row_height
+        capacity = max(1, (tree_programs.winfo_height() - heading_height) // max(1, row_height))
+    except (tk.TclError, ValueError): return
+    if capacity != program_view_capacity:
+        program_view_capacity = capacity; _render_program_view()
+
+def _on_program_scrollbar(*args):
+    global program_view_offset
+    if not args: return
+    if args[0] == 'moveto': program_view_offset = int(round(float(args[1]) * len(program_view_sections)))
+    elif args[0] == 'scroll': program_view_offset += int(args[1]) * (program_view_capacity if args[2] == 'pages' else 1)
+    _render_program_view()
+
+def _on_program_mousewheel(event):
+    global program_view_offset
+    if getattr(event, 'num', None) == 4: step = -PROGRAM_LIST_WHEEL_ROWS
+    elif getattr(event, 'num', None) == 5: step = PROGRAM_LIST_WHEEL_ROWS
+    else: step = -PROGRAM_LIST_WHEEL_ROWS if event.delta > 0 else PROGRAM_LIST_WHEEL_ROWS
+    program_view_offset += step; _render_program_view()
+    return "break"
+
+def _on_program_list_key(event):
+    # Pfeiltasten, Bild auf/ab, Pos1 und Ende bewegen die Auswahl über die gesamte virtuelle Liste
+    global selected_program_section, program_view_offset
+    if not program_view_sections: return "break"
+    total = len(program_view_sections)
+    steps = {'Up': -1, 'Down': 1, 'Prior': -program_view_capacity, 'Next': program_view_capacity, 'Home': -total, 'End': total}
+    if event.keysym not in steps: return None
+    try: index = program_view_sections.index(selected_program_section)
+    except ValueError: index = program_view_offset - 1 if steps[event.keysym] > 0 else program_view_offset + program_view_capacity
+    index = max(0, min(total - 1, index + steps[event.keysym]))
+    selected_program_section = program_view_sections[index]
+    if index < program_view_offset: program_view_offset = index
+    elif index >= program_view_offset + program_view_capacity: program_view_offset = index - program_view_capacity + 1
+    _render_program_view(); _update_action_buttons_state()
+    return "break"
+
+def on_program_search_changed(*args):
+    global program_view_offset
+    program_view_offset = 0; _update_program_view()
+
+def on_program_heading_click(column):
+    # Aufsteigend -> absteigend -> INI-Reihenfolge; nur die Python-Liste wird sortiert, nicht die Treeview-Zeilen
+    global program_view_sort, program_view_offset
+    if program_view_sort and program_view_sort[0] == column: program_view_sort = None if program_view_sort[1] else (column, True)
+    else: program_view_sort = (column, False)
+    program_view_offset = 0
+    _update_program_headings(); _update_program_view()
+
+def _update_program_headings():
+    if not tree_programs: return
+    for column, title in zip(PROGRAM_LIST_COLUMNS, PROGRAM_LIST_TITLES):
+        arrow = ""
+        if program_view_sort and program_view_sort[0] == column: arrow = " ▼" if program_view_sort[1] else " ▲"
+        tree_programs.heading(column, text=translate(title) + arrow, command=lambda c=column: on_program_heading_click(c))
+
+def load_restart_policy_settings():
+    # Backoff-Regel für Neustarts aus [Settings]; ungültige Werte fallen auf die Standardwerte zurück
+    global restart_backoff_sec, restart_backoff_multiplier, restart_backoff_max_sec, restart_stable_sec, crash_loop_threshold, probe_failure_threshold
+    try:
+        restart_backoff_sec = max(0, config.getint('Settings', 'RestartBackoffSec', fallback=DEFAULT_RESTART_BACKOFF_SEC))
+        restart_backoff_multiplier = max(1.0, config.getfloat('Settings', 'RestartBackoffMultiplier', fallback=DEFAULT_RESTART_BACKOFF_MULTIPLIER))
+        restart_backoff_max_sec = max(restart_backoff_sec, config.getint('Settings', 'RestartBackoffMaxSec', fallback=DEFAULT_RESTART_BACKOFF_MAX_SEC))
+        restart_stable_sec = max(1, config.getint('Settings', 'RestartStableSec', fallback=DEFAULT_RESTART_STABLE_SEC))
+        crash_loop_threshold = max(1, config.getint('Settings', 'CrashLoopThreshold', fallback=DEFAULT_CRASH_LOOP_THRESHOLD))
+        probe_failure_threshold = max(1, config.getint('Settings', 'ProbeFailureThreshold', fallback=DEFAULT_PROBE_FAILURE_THRESHOLD))
+    except ValueError as e:
+        debug_log(f"WARNUNG: Ungültige Backoff-Einstellung in [Settings]: {e}. Verwende Standardwerte.")
+        restart_backoff_sec = DEFAULT_RESTART_BACKOFF_SEC; restart_backoff_multiplier = DEFAULT_RESTART_BACKOFF_MULTIPLIER
+        restart_backoff_max_sec = DEFAULT_RESTART_BACKOFF_MAX_SEC; restart_stable_sec = DEFAULT_RESTART_STABLE_SEC; crash_loop_threshold = DEFAULT_CRASH_LOOP_THRESHOLD
+        probe_failure_threshold = DEFAULT_PROBE_FAILURE_THRESHOLD
+
+def _read_program_probes(section_name):
+    # Optionale Lebendigkeitsprüfungen eines Programms; alle konfigurierten Probes müssen bestehen
+    probes = []
+    tcp_port = _read_program_override(section_name, 'ProbeTcpPort', 1)
+    if tcp_port: probes.append(('tcp', tcp_port))
+    http_url = config.get(section_name, 'ProbeHttpUrl', fallback='').strip()
+    if http_url: probes.append(('http', http_url, _read_program_override(section_name, 'ProbeHttpStatus', 100) or 200))
+    heartbeat_file = config.get(section_name, 'ProbeHeartbeatFile', fallback='').strip()
+    if heartbeat_file: probes.append(('heartbeat', heartbeat_file, _read_program_override(section_name, 'ProbeHeartbeatMaxAgeSec', 1) or DEFAULT_PROBE_HEARTBEAT_MAX_AGE_SEC))
+    return probes
+
+def _read_program_limits(section_name):
+    # Ressourcen-Grenzwerte eines Programms (None = keine); MaxHandles gilt unter Windows, MaxFDs auf POSIX-Systemen
+    limits = {'max_rss_mb': _read_program_override(section_name, 'MaxRSSMB', 1), 'max_cpu_percent': _read_program_override(section_name, 'MaxCPUPercent', 1),
+              'max_handles': _read_program_override(section_name, 'MaxHandles', 1), 'max_fds': _read_program_override(section_name, 'MaxFDs', 1)}
+    if not any(limits.values()): return None
+    limits['cpu_samples'] = _read_program_override(section_name, 'CPUSamples', 1) or DEFAULT_CPU_SAMPLES
+    return limits
+
+def _program_row_state(section, enabled):
+    # Text der Spalte "Aktiviert" und Tags einer Treeview-Zeile
+    if section in crash_looping_sections: return translate("Crash loop"), ('crash_loop_row',)
+    return translate(str(enabled)), ('disabled_row',) if not enabled else ()
+
+def set_program_crash_looping(section, crash_looping):
+    # Aus dem Watchdog-Thread aufrufbar; die Treeview-Zeile zeichnet _drain_ui_updates() im GUI-Thread neu
+    if crash_looping: crash_looping_sections.add(section)
+    else: crash_looping_sections.discard(section)
+    if not HEADLESS_MODE: ui_dirty_rows.add(section)
+
+def _refresh_program_row(section):
+    try:
+        if not tree_programs or section not in program_rows: return
+        program = program_registry.get(section)
+        enabled = program.enabled if program is not None else True
+        enabled_text, row_tags = _program_row_state(section, enabled)
+        values = list(program_rows[section][0])
+        if len(values) >= 4: values[3] = enabled_text
+        program_rows[section] = (tuple(values), row_tags)
+        _render_program_view()
+    except tk.TclError: pass
+
+def _read_program_override(section_name, option, minimum):
+    raw_value = config.get(section_name, option, fallback='').strip()
+    if not raw_value: return None
+    try: value = int(raw_value)
+    except ValueError: debug_log(f"WARNUNG: Ungültiger Wert {option}='{raw_value}' in {section_name}, globaler Wert wird verwendet."); return None
+    if value < minimum:
+        debug_log(f"{option} in {section_name} war < {minimum}, wurde auf {minimum} korrigiert.")
+        value = minimum
+    return value
+
 # --- Speichert Settings ---
 def save_settings_from_gui():
     global check_cycle_sec, start_delay_sec, config, current_language, current_theme_setting
@@ -430,106 +977,1365 @@ def save_settings_from_gui():
 def _update_action_buttons_state():
     if not root or not root.winfo_exists() or not tree_programs or not btnRemoveProg or not btnEditProg: return
     try:
-        selected_items = tree_programs.selection()
-        state = tk.NORMAL if len(selected_items) == 1 else tk.DISABLED
+        state = tk.NORMAL if selected_program_section in program_rows else tk.DISABLED
         if btnRemoveProg: btnRemoveProg.config(state=state)
         if btnEditProg: btnEditProg.config(state=state)
     except tk.TclError: pass
     except Exception as e: debug_log(f"Fehler in _update_action_buttons_state: {e}")
 
 # --- Prozess-Management ---
-def is_process_running(process_name, process_path=None):
+def normalize_process_path(path):
+    return os.path.normcase(os.path.normpath(path)) if path else None
+
+def build_process_snapshot():
+    # Einmaliger Durchlauf der Prozesstabelle pro Prüfzyklus.
+    # Ergebnis: {prozessname_klein: {normalisierter exe-Pfad: pid}}; der Schlüssel None bedeutet,
+    # dass für mindestens einen Prozess dieses Namens der Pfad nicht ermittelbar war (AccessDenied).
+    snapshot = {}
+    try:
+        for proc in psutil.process_iter(['name', 'exe']):
+            try:
+                proc_name = proc.info.get('name')
+                if not proc_name: continue
+                snapshot.setdefault(proc_name.lower(), {}).setdefault(normalize_process_path(proc.info.get('exe')), proc.pid)
+            except (psutil.AccessDenied, psutil.NoSuchProcess): pass
+    except Exception as e: debug_log(f"FEHLER psutil (Snapshot): {e}")
+    return snapshot
+
+def find_process_pid(process_name, process_path=None, snapshot=None):
     # Wenn process_path bekannt ist, wird zusätzlich zum Prozessnamen der volle Pfad verglichen.
     # Das unterscheidet zwei Einträge mit identischer .exe an unterschiedlichen Speicherorten.
     # Ist der Pfad eines laufenden Prozesses nicht ermittelbar (z. B. AccessDenied), wird
     # auf den reinen Namensvergleich zurückgefallen, damit die Überwachung nicht komplett ausfällt.
+    # Mit snapshot (aus build_process_snapshot) wird nur im Index nachgeschlagen, ohne erneuten Scan.
     try:
-        target_path = os.path.normcase(os.path.normpath(process_path)) if process_path else None
-        for proc in psutil.process_iter(['name', 'exe']):
+        if snapshot is None: snapshot = build_process_snapshot()
+        known_paths = snapshot.get(process_name.lower())
+        if not known_paths: return None
+        target_path = normalize_process_path(process_path)
+        if target_path in known_paths: return known_paths[target_path]
+        if not target_path: return next(iter(known_paths.values()))
+        if None in known_paths: return known_paths[None]  # Pfad nicht ermittelbar -> Namens-Fallback
+        return None
+    except Exception as e: debug_log(f"FEHLER Prozessprüfung: {e}"); return None
+
+def is_process_running(process_name, process_path=None, snapshot=None):
+    return find_process_pid(process_name, process_path, snapshot) is not None
+
+def pin_process(program, pid):
+    # Merkt sich PID und create_time im ProgramRecord, damit spätere Prüfungen ohne Scan auskommen.
+    try:
+        program.create_time = psutil.Process(pid).create_time(); program.pid = pid
+        debug_log(f"Watchdog: '{program.name}' an PID {pid} gepinnt.")
+    except (psutil.NoSuchProcess, psutil.AccessDenied): unpin_process(program)
+    except Exception as e: debug_log(f"FEHLER beim Pinnen von PID {pid}: {e}"); unpin_process(program)
+
+def unpin_process(program):
+    program.pid = None; program.create_time = None
+
+def is_pinned_process_alive(program):
+    # Eine direkte Abfrage der gepinnten PID. create_time schützt vor wiederverwendeten PIDs,
+    # der Zombie-Check vor beendeten, aber noch nicht abgeholten Kindprozessen.
+    pid = program.pid
+    if not pid: return False
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            if proc.create_time() == program.create_time and proc.status() != psutil.STATUS_ZOMBIE: return True
+    except (psutil.NoSuchProcess, psutil.AccessDenied): pass
+    except Exception as e: debug_log(f"FEHLER Prüfung gepinnter PID {pid}: {e}")
+    debug_log(f"Watchdog: Gepinnte PID {pid} von '{program.name}' beendet oder wiederverwendet -> voller Scan.")
+    unpin_process(program)
+    return False
+
+LAUNCH_CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if IS_BUNDLED and sys.platform == "win32" else 0
+
+class LaunchSpec:
+    # Start eines Programms, beim Laden der INI einmal vorbereitet und geprüft: ein Neustart ist danach nur noch Popen
+    # mit fertigen Argumenten, ohne stat/dirname. Unter Linux startet Popen ohne preexec_fn per vfork (Python >= 3.10),
+    # kopiert also nicht den Adressraum des Watchdogs; close_fds bleibt an, damit Kinder keine Sockets/Dateien erben.
+    __slots__ = ('argv', 'cwd', 'env', 'creationflags', 'capture', 'error')
+
+    def __init__(self, path, env=None, capture=None):
+        self.argv = (path,); self.cwd = os.path.dirname(path) or None
+        self.env = env  # None = Umgebung des Watchdogs
+        self.capture = capture  # (Logdatei, max. Bytes, alte Dateien) aus LogFile oder None, siehe attach_output_capture()
+        self.creationflags = LAUNCH_CREATION_FLAGS; self.error = None
+        self.validate()
+
+    def validate(self):
+        path = self.argv[0]
+        if not os.path.isfile(path): self.error = "Pfad nicht existent"
+        elif sys.platform != "win32" and not os.access(path, os.X_OK): self.error = "nicht ausführbar"
+        else: self.error = None
+        return self.error is None
+
+def start_program(program):
+    # Gibt das Popen-Objekt des gestarteten Prozesses zurück (None bei Fehler). Ein beim Laden ungültiger Pfad wird
+    # erneut geprüft (z. B. Laufwerk später verbunden); gültige Specs gehen ohne weiteren Dateisystemzugriff an Popen.
+    spec = program.launch
+    if spec.error is not None and not spec.validate(): debug_log(f"FEHLER: {program.path}: {spec.error}"); return None
+    output = subprocess.PIPE if spec.capture else None
+    output_pipe = None
+    if spec.capture and sys.platform == "win32":
+        ensure_async_loop(); output_pipe, output = create_output_pipe()  # überlappende Pipe für den Proactor des AsyncLoop
+    try: process = subprocess.Popen(spec.argv, cwd=spec.cwd, env=spec.env, creationflags=spec.creationflags, stdout=output, stderr=subprocess.STDOUT if output else None)
+    except Exception as e:
+        spec.error = str(e); debug_log(f"FEHLER Starten von {program.path}: {e}")
+        if output_pipe is not None: output_pipe.close()
+        return None
+    finally:
+        if output_pipe is not None: os.close(output)  # schreibende Seite gehört jetzt dem Kind
+    if spec.capture:
+        attach_output_capture(program.section, process.stdout if output_pipe is None else output_pipe, spec.capture); process.stdout = None  # gehört jetzt dem OutputReader bzw. AsyncLoop
+    debug_log(f"... Startbefehl '{program.name}' OK (PID {process.pid})."); return process
+
+def track_child_process(program, process):
+    # Behält das Popen-Handle und meldet dessen Ende per Warte-Thread sofort an die Watchdog-Schleife,
+    # statt erst beim nächsten Prüfzyklus darauf zu stoßen.
+    section = program.section
+    child_processes[section] = process
+    def _wait_for_exit():
+        try: returncode = process.wait()
+        except Exception as e: debug_log(f"FEHLER beim Warten auf PID {process.pid}: {e}"); returncode = None
+        watchdog_events.put(('exit', section, process.pid, returncode))
+    threading.Thread(target=_wait_for_exit, name=f"ExitWaiter-{section}", daemon=True).start()
+
+def wake_watchdog_loop():
+    watchdog_events.put(('wake',))
+
+def _handle_child_exit(section, pid, returncode):
+    # Liefert True, wenn das Ende zum aktuell verfolgten Kindprozess der Sektion gehört.
+    child = child_processes.get(section)
+    if child is None or child.pid != pid: return False
+    del child_processes[section]
+    debug_log(f"Watchdog: Kindprozess von {section} (PID {pid}) beendet, Exitcode {returncode}.")
+    program = program_registry.get(section)
+    if program is not None and program.pid == pid: unpin_process(program)
+    return True
+
+def _dependency_cycles(dependencies):
+    # Stark zusammenhängende Komponenten (Tarjan, iterativ) mit mehr als einer Sektion: Sektion -> Komponenten-Nr.
+    index_of = {}; low_link = {}; stack = []; on_stack = set(); component_of = {}; counter = itertools.count()
+    for root_section in dependencies:
+        if root_section in index_of: continue
+        work = [(root_section, iter(dependencies[root_section]))]
+        index_of[root_section] = low_link[root_section] = next(counter); stack.append(root_section); on_stack.add(root_section)
+        while work:
+            section, remaining = work[-1]
+            dependency = next(remaining, None)
+            if dependency is not None:
+                if dependency not in index_of:
+                    index_of[dependency] = low_link[dependency] = next(counter); stack.append(dependency); on_stack.add(dependency)
+                    work.append((dependency, iter(dependencies[dependency])))
+                elif dependency in on_stack: low_link[section] = min(low_link[section], index_of[dependency])
+                continue
+            work.pop()
+            if work: low_link[work[-1][0]] = min(low_link[work[-1][0]], low_link[section])
+            if low_link[section] != index_of[section]: continue
+            members = []
+            while True:
+                member = stack.pop(); on_stack.discard(member); members.append(member)
+                if member == section: break
+            if len(members) > 1:
+                for member in members: component_of[member] = index_of[section]
+    return component_of
+
+def plan_startup_waves(programs):
+    # Topologische Sortierung (Kahn) der aktivierten Programme nach DependsOn.
+    # Rückgabe: (Wellen als Listen von Sektionen, Sektionen in Abhängigkeitszyklen, wirksame Abhängigkeiten).
+    # Abhängigkeiten auf unbekannte oder deaktivierte Sektionen werden ignoriert. In einem Zyklus (stark
+    # zusammenhängende Komponente) entfallen nur die Kanten innerhalb des Zyklus: dessen Mitglieder werden trotzdem
+    # überwacht, Programme, die von einem Zyklusmitglied abhängen, warten weiterhin auf dieses.
+    sections_by_lower = {p.section.lower(): p.section for p in programs if p.enabled}
+    dependencies = {}
+    for program in programs:
+        if not program.enabled: continue
+        resolved = []
+        for dependency in program.depends_on or ():
+            dependency_section = sections_by_lower.get(dependency.lower())
+            if dependency_section is None: debug_log(f"WARNUNG: {program.section}: DependsOn '{dependency}' unbekannt oder deaktiviert, wird ignoriert."); continue
+            if dependency_section != program.section and dependency_section not in resolved: resolved.append(dependency_section)
+        dependencies[program.section] = resolved
+    component_of = _dependency_cycles(dependencies)
+    cycle_sections = [section for section in dependencies if section in component_of]
+    for section in cycle_sections:
+        dependencies[section] = [d for d in dependencies[section] if component_of.get(d) != component_of[section]]
+    dependents = {section: [] for section in dependencies}
+    open_count = {}
+    for section, section_dependencies in dependencies.items():
+        open_count[section] = len(section_dependencies)
+        for dependency in section_dependencies: dependents[dependency].append(section)
+    waves = []
+    current_wave = [section for section in dependencies if open_count[section] == 0]
+    while current_wave:
+        waves.append(current_wave)
+        next_wave = []
+        for section in current_wave:
+            for dependent in dependents[section]:
+                open_count[dependent] -= 1
+                if open_count[dependent] == 0: next_wave.append(dependent)
+        current_wave = next_wave
+    return waves, cycle_sections, dependencies
+
+# --- Metriken (Prometheus-Textformat) ---
+# Zähler und Histogramme werden aus der Watchdog-Schleife fortgeschrieben (pro Wert ein Dict-Zugriff und ein bisect).
+# Ausgabe optional als Datei (MetricsFile, atomar per os.replace, z. B. für den node_exporter-Textfile-Collector)
+# und/oder per HTTP auf 127.0.0.1:MetricsPort. Programmbezogene Werte tragen die Labels section und name.
+METRICS_BUCKETS_SEC = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRICS_WRITE_INTERVAL_SEC = 5.0
+METRICS_DEFINITIONS = {
+    'watchdog_cycle_duration_seconds': ('histogram', "Duration of one check pass over all entries that were due."),
+    'watchdog_check_duration_seconds': ('histogram', "Latency of the liveness check of one program."),
+    'watchdog_process_scan_duration_seconds': ('histogram', "Duration of a full process table scan."),
+    'watchdog_restarts_total': ('counter', "Starts of a monitored program that was found not running."),
+    'watchdog_failed_starts_total': ('counter', "Start attempts that failed."),
+    'watchdog_start_delay_seconds_total': ('counter', "Time spent in start delays after starting a program."),
+    'watchdog_probe_failures_total': ('counter', "Failed liveness probes (TCP, HTTP, heartbeat file)."),
+    'watchdog_resource_restarts_total': ('counter', "Restarts because a resource limit (RSS, CPU, handles/FDs) was exceeded."),
+}
+metrics_lock = threading.Lock()
+metrics_counters = {}  # (metrik, sektion, name) -> Wert
+metrics_histograms = {}  # (metrik, sektion, name) -> [Zähler je Bucket inkl. +Inf..., Summe, Anzahl]
+metrics_server = None
+metrics_last_write = 0.0
+
+def load_metrics_settings():
+    global metrics_file, metrics_port
+    metrics_file = config.get('Settings', 'MetricsFile', fallback='').strip()
+    if metrics_file and not os.path.isabs(metrics_file): metrics_file = os.path.join(os.path.dirname(CONFIG_FILE), metrics_file)
+    try: metrics_port = max(0, config.getint('Settings', 'MetricsPort', fallback=0))
+    except ValueError: debug_log("WARNUNG: Ungültiger Wert für MetricsPort, Metrik-HTTP-Endpunkt bleibt aus."); metrics_port = 0
+
+def _metric_key(name, program):
+    return (name, program.section, program.name) if program else (name, None, None)
+
+def increment_metric(name, program=None, amount=1):
+    key = _metric_key(name, program)
+    with metrics_lock: metrics_counters[key] = metrics_counters.get(key, 0) + amount
+
+def observe_metric(name, value, program=None):
+    key = _metric_key(name, program)
+    with metrics_lock:
+        histogram = metrics_histograms.get(key)
+        if histogram is None: histogram = metrics_histograms[key] = [0] * (len(METRICS_BUCKETS_SEC) + 3)
+        histogram[bisect.bisect_left(METRICS_BUCKETS_SEC, value)] += 1
+        histogram[-2] += value; histogram[-1] += 1
+
+def _metric_labels(section, name, extra=None):
+    labels = []
+    if section is not None:
+        for label, value in (('section', section), ('name', name)):
+            labels.append(label + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"')
+    if extra: labels.append(extra)
+    return '{' + ','.join(labels) + '}' if labels else ''
+
+def render_metrics():
+    with metrics_lock:
+        counters = dict(metrics_counters); histograms = {key: list(values) for key, values in metrics_histograms.items()}
+    lines = []
+    for metric, (metric_type, help_text) in METRICS_DEFINITIONS.items():
+        lines.append(f"# HELP {metric} {help_text}"); lines.append(f"# TYPE {metric} {metric_type}")
+        if metric_type == 'counter':
+            for (name, section, program_name), value in counters.items():
+                if name == metric: lines.append(f"{metric}{_metric_labels(section, program_name)} {value:g}")
+            continue
+        for (name, section, program_name), values in histograms.items():
+            if name != metric: continue
+            cumulative = 0
+            for bound, bucket_count in zip(METRICS_BUCKETS_SEC + ('+Inf',), values):
+                cumulative += bucket_count
+                bucket_label = 'le="' + str(bound) + '"'
+                lines.append(f"{metric}_bucket{_metric_labels(section, program_name, bucket_label)} {cumulative}")
+            lines.append(f"{metric}_sum{_metric_labels(section, program_name)} {values[-2]:.6f}")
+            lines.append(f"{metric}_count{_metric_labels(section, program_name)} {values[-1]}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics_file(force=False):
+    # Schreibt höchstens alle METRICS_WRITE_INTERVAL_SEC; Leser sehen dank os.replace nie eine halbe Datei.
+    global metrics_last_write
+    if not metrics_file: return
+    now = time.monotonic()
+    if not force and now - metrics_last_write < METRICS_WRITE_INTERVAL_SEC: return
+    metrics_last_write = now
+    try: write_file_atomically(metrics_file, render_metrics(), newline='\n', fsync=False)
+    except OSError as e: debug_log(f"FEHLER beim Schreiben der Metrikdatei '{metrics_file}': {e}")
+
+def start_metrics_server(port):
+    # HTTP-Endpunkt nur auf 127.0.0.1; http.server wird erst hier importiert (kein Einfluss auf die Startzeit ohne MetricsPort).
+    global metrics_server
+    if metrics_server is not None:
+        if metrics_server.server_address[1] == port: return
+        metrics_server.shutdown(); metrics_server.server_close(); metrics_server = None
+    if not port: return
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'): self.send_error(404); return
+            body = render_metrics().encode('utf-8')
+            self.send_response(200); self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'); self.send_header('Content-Length', str(len(body))); self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, format, *args): debug_log(f"Metrik-HTTP: {format % args}")
+
+    try: metrics_server = ThreadingHTTPServer(('127.0.0.1', port), MetricsRequestHandler)
+    except OSError as e: write_log_line(f"FEHLER ({time.strftime('%H:%M:%S')}): Metrik-Endpunkt auf Port {port} nicht möglich: {e}"); return
+    metrics_server.daemon_threads = True
+    threading.Thread(target=metrics_server.serve_forever, name="MetricsServer", daemon=True).start()
+    debug_log(f"Metrik-Endpunkt: http://127.0.0.1:{port}/metrics")
+
+# --- Ereignisjournal ---
+# Neustarts, Fehlstarts, Prozessenden und Übergänge (Startverzögerung, Backoff, Crash-Loop) landen als JSON-Zeilen
+# (ts, section, name, event, pid, exit_code, detail) in JournalFile. record_program_event() legt nur ein Tupel in
+# journal_queue; geschrieben wird gesammelt im Thread "JournalWriter", die Watchdog-Schleife wartet nie auf die Platte.
+# Ab JournalMaxSizeMB wird rotiert (journal.jsonl -> .1 -> .2 ...). Die Einträge sind zeitlich geordnet, daher
+# springt query_journal() per Binärsuche über Byte-Offsets zum Anfang des Zeitraums und liest nur ab dort zeilenweise.
+DEFAULT_JOURNAL_FILE = 'watchdog_journal.jsonl'
+DEFAULT_JOURNAL_MAX_SIZE_MB = 5
+DEFAULT_JOURNAL_BACKUPS = 3
+JOURNAL_FLUSH_INTERVAL_SEC = 1.0  # so lange sammelt der Writer Einträge, bevor er schreibt
+JOURNAL_BATCH_SIZE = 500  # spätestens ab so vielen Einträgen wird sofort geschrieben
+JOURNAL_SEEK_MIN_BYTES = 4096  # darunter liest query_journal() linear statt weiter zu halbieren
+journal_file = ''  # [Settings] JournalFile (leer = aus)
+journal_max_bytes = DEFAULT_JOURNAL_MAX_SIZE_MB * 1024 * 1024
+journal_backups = DEFAULT_JOURNAL_BACKUPS
+journal_queue = queue.Queue()
+journal_file_lock = threading.Lock()  # serialisiert Schreiben/Rotieren und Lesen
+journal_writer_thread = None
+
+def load_journal_settings():
+    # Fehlt JournalFile, wird neben watchdog.ini protokolliert; ein leerer Wert schaltet das Journal ab
+    global journal_file, journal_max_bytes, journal_backups
+    journal_file = config.get('Settings', 'JournalFile', fallback=DEFAULT_JOURNAL_FILE).strip()
+    if journal_file and not os.path.isabs(journal_file): journal_file = os.path.join(os.path.dirname(CONFIG_FILE), journal_file)
+    try:
+        journal_max_bytes = int(max(0.1, config.getfloat('Settings', 'JournalMaxSizeMB', fallback=DEFAULT_JOURNAL_MAX_SIZE_MB)) * 1024 * 1024)
+        journal_backups = max(0, config.getint('Settings', 'JournalBackups', fallback=DEFAULT_JOURNAL_BACKUPS))
+    except ValueError as e:
+        debug_log(f"WARNUNG: Ungültige Journal-Einstellung in [Settings]: {e}. Verwende Standardwerte.")
+        journal_max_bytes = DEFAULT_JOURNAL_MAX_SIZE_MB * 1024 * 1024; journal_backups = DEFAULT_JOURNAL_BACKUPS
+
+def record_program_event(event, program, pid=None, exit_code=None, detail=None):
+    # Aus der Watchdog-Schleife aufrufbar: nur ein Queue-put, Serialisierung und Schreiben macht der JournalWriter
+    global journal_writer_thread
+    ts = time.time()
+    if stats_database and event in STATS_EVENT_KINDS:
+        stats_reported_states[program.section] = 'up' if event == 'started' else 'down'
+        _put_stats_item((ts, program.section, STATS_EVENT_KINDS[event]))
+    if not journal_file: return
+    journal_queue.put((ts, program.section, program.name, event, pid, exit_code, detail))
+    if journal_writer_thread is None:
+        journal_writer_thread = threading.Thread(target=_journal_writer, name="JournalWriter", daemon=True); journal_writer_thread.start()
+
+def _journal_writer():
+    while True:
+        batch = [journal_queue.get()]
+        deadline = time.monotonic() + JOURNAL_FLUSH_INTERVAL_SEC
+        while len(batch) < JOURNAL_BATCH_SIZE and not isinstance(batch[-1], threading.Event):
+            try: batch.append(journal_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty: break
+        flush_requests = [entry for entry in batch if isinstance(entry, threading.Event)]
+        _write_journal_batch([entry for entry in batch if not isinstance(entry, threading.Event)])
+        for flush_request in flush_requests: flush_request.set()
+
+def _write_journal_batch(records):
+    if not records or not journal_file: return
+    lines = "".join(json.dumps({'ts': round(ts, 3), 'section': section, 'name': name, 'event': event, 'pid': pid, 'exit_code': exit_code, 'detail': detail},
+                               ensure_ascii=False, separators=(',', ':')) + "\n" for ts, section, name, event, pid, exit_code, detail in records).encode('utf-8')
+    with journal_file_lock:
+        try:
+            try: current_size = os.path.getsize(journal_file)
+            except OSError: current_size = 0
+            if current_size and current_size + len(lines) > journal_max_bytes: _rotate_journal()
+            with open(journal_file, 'ab') as f: f.write(lines)
+        except OSError as e: debug_log(f"FEHLER beim Schreiben des Journals '{journal_file}': {e} ({len(records)} Einträge verworfen)")
+
+def _rotate_journal():
+    # journal_file_lock muss gehalten werden
+    rotate_file(journal_file, journal_backups)
+    debug_log(f"Journal rotiert: {journal_file}")
+
+def flush_journal(timeout=2.0):
+    # Wartet, bis alle bisher gemeldeten Einträge geschrieben sind (z. B. vor dem Beenden; der Writer ist ein Daemon)
+    if journal_writer_thread is None or not journal_writer_thread.is_alive(): return True
+    flush_request = threading.Event(); journal_queue.put(flush_request)
+    return flush_request.wait(timeout)
+
+def _journal_record_time(line):
+    try: return json.loads(line)['ts']
+    except (ValueError, KeyError, TypeError): return None
+
+def _seek_journal_time(f, file_size, since):
+    # Binärsuche nach der ersten Zeile mit ts >= since; danach steht f auf einem Zeilenanfang davor
+    low, high = 0, file_size
+    while high - low > JOURNAL_SEEK_MIN_BYTES:
+        middle = (low + high) // 2
+        f.seek(middle); f.readline()
+        record_time = _journal_record_time(f.readline())
+        if record_time is None or record_time >= since: high = middle
+        else: low = middle
+    f.seek(low)
+    if low: f.readline()
+
+def journal_files():
+    # Älteste zuerst: journal.jsonl.N ... journal.jsonl.1, journal.jsonl
+    if not journal_file: return []
+    candidates = [f"{journal_file}.{index}" for index in range(journal_backups, 0, -1)] + [journal_file]
+    return [path for path in candidates if os.path.exists(path)]
+
+def query_journal(section=None, since=None, until=None, limit=None):
+    # Einträge eines Programms (oder aller) im Zeitraum [since, until] als Dicts, älteste zuerst.
+    # Es wird zeilenweise gelesen; mit limit werden nur die neuesten limit Treffer behalten.
+    matches = collections.deque(maxlen=limit) if limit else []
+    flush_journal()
+    with journal_file_lock:
+        for path in journal_files():
             try:
-                if proc.info['name'].lower() != process_name.lower(): continue
-                if not target_path: return True
-                proc_exe = proc.info.get('exe')
-                if not proc_exe: return True  # Pfad nicht ermittelbar -> Namens-Fallback
-                if os.path.normcase(os.path.normpath(proc_exe)) == target_path: return True
-            except (psutil.AccessDenied, psutil.NoSuchProcess): pass
-        return False
-    except Exception as e: debug_log(f"FEHLER psutil: {e}"); return False
+                with open(path, 'rb') as f:
+                    file_size = os.fstat(f.fileno()).st_size
+                    if since is not None: _seek_journal_time(f, file_size, since)
+                    for line in f:
+                        try: record = json.loads(line)
+                        except ValueError: continue
+                        record_time = record.get('ts', 0)
+                        if since is not None and record_time < since: continue
+                        if until is not None and record_time > until: return list(matches)
+                        if section is None or record.get('section') == section: matches.append(record)
+            except OSError as e: debug_log(f"FEHLER beim Lesen des Journals '{path}': {e}")
+    return list(matches)
+
+# --- Verfügbarkeitsstatistik (SQLite) ---
+# Für Monatsberichte: Laufzeit, Ausfälle und Starts je Programm in StatsDatabase. Die Watchdog-Schleife meldet nur
+# Zustandswechsel (läuft / läuft nicht / nicht überwacht) per Queue; der Thread "StatsWriter" verteilt die Zeit
+# zwischen zwei Wechseln auf Stunden- und Tagesbuckets (Ortszeit) und schreibt alle STATS_FLUSH_INTERVAL_SEC in einer
+# Transaktion. query_program_stats() liest ganze Tage aus dem Tages-Rollup und nur die Ränder stundenweise - die
+# Auswertung über ein Jahr bleibt damit ein paar hundert Zeilen.
+DEFAULT_STATS_DATABASE = 'watchdog_stats.sqlite3'
+DEFAULT_STATS_RETENTION_DAYS = 400  # so lange bleiben Rohereignisse und Stunden-Rollups; Tages-Rollups bleiben immer
+STATS_FLUSH_INTERVAL_SEC = 10.0
+STATS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS events (ts REAL NOT NULL, section TEXT NOT NULL, event TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS events_section_ts ON events (section, ts)",
+    "CREATE TABLE IF NOT EXISTS rollups (period TEXT NOT NULL, section TEXT NOT NULL, bucket INTEGER NOT NULL, up_seconds REAL NOT NULL DEFAULT 0, "
+    "observed_seconds REAL NOT NULL DEFAULT 0, failures INTEGER NOT NULL DEFAULT 0, restarts INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (period, section, bucket))",
+    "CREATE INDEX IF NOT EXISTS rollups_period_bucket ON rollups (period, bucket)",
+)
+STATS_EVENT_KINDS = {'started': 'restart', 'exited': 'failure', 'start_failed': 'down'}  # Journal-Ereignis -> Statistik
+stats_database = ''  # [Settings] StatsDatabase (leer = aus)
+stats_retention_days = DEFAULT_STATS_RETENTION_DAYS
+stats_queue = queue.Queue()
+stats_writer_thread = None
+stats_reported_states = {}  # Sektion -> zuletzt gemeldeter Zustand (nur Watchdog-Thread; vermeidet doppelte Meldungen)
+sqlite3 = None  # erst mit aktivierter Statistik geladen
+
+def load_stats_settings():
+    global stats_database, stats_retention_days
+    stats_database = config.get('Settings', 'StatsDatabase', fallback=DEFAULT_STATS_DATABASE).strip()
+    if stats_database and not os.path.isabs(stats_database): stats_database = os.path.join(os.path.dirname(CONFIG_FILE), stats_database)
+    try: stats_retention_days = max(1, config.getint('Settings', 'StatsRetentionDays', fallback=DEFAULT_STATS_RETENTION_DAYS))
+    except ValueError: debug_log("WARNUNG: Ungültiger Wert für StatsRetentionDays, verwende Standardwert."); stats_retention_days = DEFAULT_STATS_RETENTION_DAYS
+
+def record_program_availability(section, state, ts=None):
+    # state: 'up', 'down' oder None (nicht überwacht); gleiche Zustände hintereinander werden nicht erneut gemeldet
+    if not stats_database or stats_reported_states.get(section) == state: return
+    if state is None: stats_reported_states.pop(section, None)
+    else: stats_reported_states[section] = state
+    _put_stats_item((ts or time.time(), section, state or 'unmonitored'))
+
+def _put_stats_item(item):
+    global stats_writer_thread
+    stats_queue.put(item)
+    if stats_writer_thread is None:
+        stats_writer_thread = threading.Thread(target=_stats_writer, name="StatsWriter", daemon=True); stats_writer_thread.start()
+
+def stop_program_availability():
+    # Watchdog gestoppt: offene Zeiträume abschließen, danach gilt nichts mehr als überwacht
+    if not stats_database or stats_writer_thread is None: return
+    stats_reported_states.clear(); _put_stats_item((time.time(), None, 'stop'))
+
+def flush_stats(timeout=2.0):
+    if stats_writer_thread is None or not stats_writer_thread.is_alive(): return True
+    flush_request = threading.Event(); stats_queue.put(flush_request)
+    return flush_request.wait(timeout)
+
+def _stats_hour_start(ts):
+    # Beginn der Ortszeit-Stunde (auch bei Zeitzonen mit halben Stunden Versatz)
+    return int(ts - (ts + time.localtime(ts).tm_gmtoff) % 3600)
+
+def _stats_day_start(ts):
+    local = time.localtime(ts)
+    return int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1)))
+
+def _open_stats_database():
+    global sqlite3
+    if sqlite3 is None: import sqlite3
+    connection = sqlite3.connect(stats_database, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL"); connection.execute("PRAGMA synchronous=NORMAL")
+    for statement in STATS_SCHEMA: connection.execute(statement)
+    connection.commit()
+    return connection
+
+def _stats_writer():
+    states = {}  # Sektion -> (Zustand, seit)
+    pending_events = []
+    pending_rollups = {}  # (period, section, bucket) -> [up_seconds, observed_seconds, failures, restarts]
+    day_starts = {}  # Stundenbeginn -> Tagesbeginn (mktime ist vergleichsweise teuer)
+    connection = None; next_flush = time.monotonic() + STATS_FLUSH_INTERVAL_SEC; last_prune = 0.0
+
+    def add(section, ts, up_seconds=0.0, observed_seconds=0.0, failures=0, restarts=0):
+        hour_start = _stats_hour_start(ts)
+        day_start = day_starts.get(hour_start)
+        if day_start is None: day_start = day_starts[hour_start] = _stats_day_start(hour_start)
+        for key in (('hour', section, hour_start), ('day', section, day_start)):
+            totals = pending_rollups.get(key)
+            if totals is None: totals = pending_rollups[key] = [0.0, 0.0, 0, 0]
+            totals[0] += up_seconds; totals[1] += observed_seconds; totals[2] += failures; totals[3] += restarts
+
+    def accrue(section, state, start, end):
+        # Zeitraum [start, end) stundenweise auf die Buckets verteilen
+        while start < end:
+            slice_end = min(end, _stats_hour_start(start) + 3600)
+            add(section, start, slice_end - start if state == 'up' else 0.0, slice_end - start)
+            start = slice_end
+
+    def transition(section, state, ts):
+        previous = states.get(section)
+        if previous is not None:
+            if previous[0] == state: return
+            accrue(section, previous[0], previous[1], ts)
+        if state is None: states.pop(section, None)
+        else: states[section] = (state, ts)
+
+    def flush(now):
+        nonlocal connection, last_prune
+        for section, (state, since) in list(states.items()):
+            accrue(section, state, since, now); states[section] = (state, now)
+        if not pending_events and not pending_rollups: return
+        try:
+            if connection is None: connection = _open_stats_database()
+            with connection:
+                connection.executemany("INSERT INTO events (ts, section, event) VALUES (?, ?, ?)", pending_events)
+                connection.executemany(
+                    "INSERT INTO rollups (period, section, bucket, up_seconds, observed_seconds, failures, restarts) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (period, section, bucket) DO UPDATE SET up_seconds = up_seconds + excluded.up_seconds, "
+                    "observed_seconds = observed_seconds + excluded.observed_seconds, failures = failures + excluded.failures, restarts = restarts + excluded.restarts",
+                    [(period, section, bucket, *totals) for (period, section, bucket), totals in pending_rollups.items()])
+                if now - last_prune > 86400:
+                    cutoff = now - stats_retention_days * 86400
+                    connection.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+                    connection.execute("DELETE FROM rollups WHERE period = 'hour' AND bucket < ?", (cutoff,))
+                    last_prune = now
+        except Exception as e:
+            debug_log(f"FEHLER beim Schreiben der Statistik '{stats_database}': {e} (wird beim nächsten Mal erneut versucht)")
+            if len(pending_events) > 100000: pending_events.clear()  # Platte dauerhaft nicht beschreibbar: Rohereignisse opfern
+            return
+        pending_events.clear(); pending_rollups.clear()
+        if len(day_starts) > 1000: day_starts.clear()
 
-def start_program(program_path):
-    if not os.path.exists(program_path): debug_log(f"FEHLER: Pfad nicht existent: {program_path}"); return False
-    try: program_dir = os.path.dirname(program_path); creationflags = subprocess.CREATE_NO_WINDOW if IS_BUNDLED and sys.platform == "win32" else 0; subprocess.Popen([program_path], cwd=program_dir, creationflags=creationflags); debug_log(f"... Startbefehl '{os.path.basename(program_path)}' OK."); return True
-    except Exception as e: debug_log(f"FEHLER Starten von {program_path}: {e}"); return False
+    while True:
+        try: item = stats_queue.get(timeout=max(0.01, next_flush - time.monotonic()))
+        except queue.Empty: item = None
+        if isinstance(item, threading.Event): flush(time.time()); item.set(); continue
+        if item is not None:
+            ts, section, kind = item
+            if kind == 'stop':
+                for open_section in list(states): transition(open_section, None, ts)
+                continue
+            pending_events.append((ts, section, kind))
+            if kind == 'restart': add(section, ts, restarts=1); transition(section, 'up', ts)
+            elif kind == 'failure': add(section, ts, failures=1); transition(section, 'down', ts)
+            else: transition(section, None if kind == 'unmonitored' else kind, ts)
+        if time.monotonic() >= next_flush:
+            flush(time.time()); next_flush = time.monotonic() + STATS_FLUSH_INTERVAL_SEC
+
+def query_program_stats(since, until=None):
+    # Summen je Sektion im Zeitraum (Auflösung: volle Stunden). Rückgabe: Sektion -> Dict mit up_seconds,
+    # observed_seconds, failures, restarts, uptime_percent und mtbf_sec (None ohne Ausfall).
+    if not stats_database or not os.path.exists(stats_database): return {}
+    flush_stats()
+    until = until if until is not None else time.time()
+    first_hour, end_hour = _stats_hour_start(since), _stats_hour_start(until) + 3600
+    first_full_day = _stats_day_start(first_hour)
+    if first_full_day < first_hour: first_full_day = _stats_day_start(first_full_day + 86400 + 7200)  # nächster Tagesbeginn (Sommerzeit-sicher)
+    end_full_day = _stats_day_start(end_hour)
+    if first_full_day < end_full_day:
+        ranges = [('day', first_full_day, end_full_day), ('hour', first_hour, first_full_day), ('hour', end_full_day, end_hour)]
+    else: ranges = [('hour', first_hour, end_hour)]
+    results = {}
+    connection = _open_stats_database()
+    try:
+        for period, bucket_from, bucket_to in ranges:
+            if bucket_from >= bucket_to: continue
+            rows = connection.execute("SELECT section, SUM(up_seconds), SUM(observed_seconds), SUM(failures), SUM(restarts) FROM rollups "
+                                      "WHERE period = ? AND bucket >= ? AND bucket < ? GROUP BY section", (period, bucket_from, bucket_to))
+            for section, up_seconds, observed_seconds, failures, restarts in rows:
+                totals = results.setdefault(section, {'up_seconds': 0.0, 'observed_seconds': 0.0, 'failures': 0, 'restarts': 0})
+                totals['up_seconds'] += up_seconds; totals['observed_seconds'] += observed_seconds; totals['failures'] += failures; totals['restarts'] += restarts
+    finally: connection.close()
+    for totals in results.values():
+        totals['uptime_percent'] = 100.0 * totals['up_seconds'] / totals['observed_seconds'] if totals['observed_seconds'] else None
+        totals['mtbf_sec'] = totals['up_seconds'] / totals['failures'] if totals['failures'] else None
+    return results
+
+# --- Lebendigkeitsprüfungen (asyncio) ---
+# Ein laufender, aber hängender Prozess besteht is_process_running. Probes (TCP-Connect, HTTP-GET, Heartbeat-Datei)
+# laufen deshalb nebenläufig auf einer eigenen asyncio-Eventloop im Thread "AsyncLoop": 200 Probes dauern damit
+# etwa ein Timeout, nicht 200. Jedes Ergebnis geht als ('probe', sektion, pid, fehler) an watchdog_events.
+async def _probe_tcp(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.close()
+    return None
+
+async def _probe_http(url, expected_status):
+    from urllib.parse import urlsplit
+    parts = urlsplit(url)
+    use_tls = parts.scheme == 'https'
+    reader, writer = await asyncio.open_connection(parts.hostname or '127.0.0.1', parts.port or (443 if use_tls else 80), ssl=True if use_tls else None)
+    try:
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: Watchdog\r\nConnection: close\r\n\r\n".encode('ascii', 'ignore'))
+        await writer.drain()
+        status_line = await reader.readline()
+    finally: writer.close()
+    fields = status_line.decode('latin-1').split()
+    status = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else None
+    return None if status == expected_status else f"HTTP {status if status is not None else '?'} != {expected_status}"
+
+async def _probe_heartbeat(path, max_age_sec):
+    # stat im Thread-Pool: eine hängende Netzfreigabe blockiert sonst den AsyncLoop samt aller Proben und der Steuer-Schnittstelle
+    try: age_sec = time.time() - (await asyncio.get_running_loop().run_in_executor(None, os.stat, path)).st_mtime
+    except OSError as e: return f"{os.path.basename(path)}: {e.strerror}"
+    return None if age_sec <= max_age_sec else f"{os.path.basename(path)} {age_sec:.0f}s > {max_age_sec}s"
+
+async def _run_single_probe(probe, timeout_sec):
+    try:
+        if probe[0] == 'tcp': return await asyncio.wait_for(_probe_tcp(probe[1]), timeout_sec)
+        if probe[0] == 'http': return await asyncio.wait_for(_probe_http(probe[1], probe[2]), timeout_sec)
+        return await asyncio.wait_for(_probe_heartbeat(probe[1], probe[2]), timeout_sec)
+    except asyncio.TimeoutError: return f"{probe[0]}: Timeout {timeout_sec}s"
+    except OSError as e: return f"{probe[0]}: {e.strerror or e}"
+    except Exception as e: return f"{probe[0]}: {type(e).__name__}: {e}"
+
+async def _run_program_probes(section, pid, probes, timeout_sec):
+    failures = [failure for failure in await asyncio.gather(*(_run_single_probe(probe, timeout_sec) for probe in probes)) if failure]
+    watchdog_events.put(('probe', section, pid, "; ".join(failures) if failures else None))
+
+def ensure_async_loop():
+    # Eine gemeinsame Eventloop für Probes und Steuer-Schnittstelle, gestartet beim ersten Bedarf
+    global asyncio, async_loop
+    with async_loop_lock:
+        if async_loop is None:
+            import asyncio
+            async_loop = asyncio.ProactorEventLoop() if sys.platform == "win32" else asyncio.new_event_loop()  # Proactor: Named Pipes
+            threading.Thread(target=async_loop.run_forever, name="AsyncLoop", daemon=True).start()
+            debug_log("asyncio-Eventloop gestartet.")
+    return async_loop
+
+def submit_probes(probe_batch):
+    # probe_batch: Liste (sektion, pid, probes, timeout_sec); kehrt sofort zurück
+    loop = ensure_async_loop()
+    for section, pid, probes, timeout_sec in probe_batch:
+        asyncio.run_coroutine_threadsafe(_run_program_probes(section, pid, probes, timeout_sec), loop)
+
+def sample_process_resources(proc, limits):
+    # Ein gebündelter Lesevorgang pro Prozess (oneshot); gelesen wird nur, wofür ein Grenzwert gesetzt ist.
+    # cpu_percent() bezieht sich auf den vorigen Aufruf am selben Process-Objekt, also auf den letzten Prüfzyklus.
+    sample = {}
+    with proc.oneshot():
+        if limits['max_rss_mb']: sample['rss_mb'] = proc.memory_info().rss / (1024 * 1024)
+        if limits['max_cpu_percent']: sample['cpu_percent'] = proc.cpu_percent()
+        if limits['max_handles'] and hasattr(proc, 'num_handles'): sample['handles'] = proc.num_handles()
+        if limits['max_fds'] and hasattr(proc, 'num_fds'): sample['fds'] = proc.num_fds()
+    return sample
+
+def terminate_program_process(section, pid, create_time):
+    # Beendet einen hängenden Prozess (terminate, nach TERMINATE_TIMEOUT_SEC kill) in einem eigenen Thread
+    # und meldet danach ('terminated', sektion, pid), damit die Schleife den Eintrag sofort neu prüft.
+    def _terminate():
+        try:
+            proc = psutil.Process(pid)
+            if create_time is None or proc.create_time() == create_time:
+                proc.terminate()
+                try: proc.wait(TERMINATE_TIMEOUT_SEC)
+                except psutil.TimeoutExpired: debug_log(f"PID {pid} reagiert nicht auf terminate -> kill."); proc.kill(); proc.wait(TERMINATE_TIMEOUT_SEC)
+        except psutil.NoSuchProcess: pass
+        except Exception as e: debug_log(f"FEHLER beim Beenden von PID {pid}: {e}")
+        watchdog_events.put(('terminated', section, pid))
+    threading.Thread(target=_terminate, name=f"Terminate-{section}", daemon=True).start()
+
+# --- Ausgabe der Kindprozesse ---
+# Mit LogFile landen stdout und stderr eines Programms (zusammengeführt in einer Pipe, Reihenfolge bleibt erhalten) in
+# einer rotierenden Logdatei statt in der Konsole des Watchdogs. Unter POSIX liest ein einziger Thread "OutputReader"
+# alle Pipes per selectors (nicht blockierend, höchstens OUTPUT_READ_CHUNK je Pipe und Runde) - ein gesprächiges
+# Programm blockiert damit nie an einer vollen Pipe, und 200 Programme brauchen keine 200 Threads. Neue Pipes kommen
+# über output_pending und ein Byte auf der Weck-Pipe in den Selector. Windows kann Pipes nicht per select() abfragen:
+# dort entsteht die Pipe überlappend (wie bei asyncio.windows_utils.Popen) und der Proactor des AsyncLoop liest alle
+# Pipes per connect_read_pipe, ebenfalls ohne Thread je Programm.
+DEFAULT_LOG_MAX_SIZE_MB = 5
+DEFAULT_LOG_BACKUPS = 2
+OUTPUT_READ_CHUNK = 65536
+output_logs = {}  # Pfad -> RotatingOutputLog (ein Objekt je Datei, auch über Neustarts des Programms hinweg)
+output_logs_lock = threading.Lock()
+output_pending = queue.Queue()  # (Pipe, RotatingOutputLog) für den Selector im OutputReader
+output_wakeup = None  # (Lese-, Schreib-fd) der Weck-Pipe
+output_reader_thread = None
+selectors = None  # erst mit dem ersten LogFile geladen
+
+class RotatingOutputLog:
+    # Wird nur von einem Thread beschrieben (POSIX: OutputReader, Windows: AsyncLoop)
+    __slots__ = ('path', 'max_bytes', 'backups', 'file', 'size')
+
+    def __init__(self, path, max_bytes, backups):
+        self.path = path; self.max_bytes = max_bytes; self.backups = backups
+        self.file = None; self.size = 0
+
+    def write(self, data):
+        try:
+            if self.file is None: self.file = open(self.path, 'ab'); self.size = os.fstat(self.file.fileno()).st_size
+            if self.size and self.size + len(data) > self.max_bytes:
+                self.file.close(); self.file = None
+                rotate_file(self.path, self.backups)
+                self.file = open(self.path, 'ab'); self.size = 0
+            self.file.write(data); self.size += len(data)
+        except OSError as e:
+            debug_log(f"FEHLER beim Schreiben der Programmausgabe '{self.path}': {e} ({len(data)} Bytes verworfen)")
+            if self.file is not None:
+                try: self.file.close()
+                except OSError: pass
+                self.file = None
+
+    def flush(self):
+        try:
+            if self.file is not None: self.file.flush()
+        except OSError as e: debug_log(f"FEHLER beim Schreiben der Programmausgabe '{self.path}': {e}")
+
+class OutputPipeProtocol:
+    # Windows: asyncio-Protokoll für connect_read_pipe (per Duck Typing, asyncio wird erst bei Bedarf geladen)
+    __slots__ = ('log',)
+    def __init__(self, log): self.log = log
+    def connection_made(self, transport): pass
+    def data_received(self, data): self.log.write(data); self.log.flush()
+    def eof_received(self): return False  # Transport schließt die Pipe: Programm beendet (samt aller Kinder, die sie geerbt haben)
+    def connection_lost(self, exc):
+        if exc is not None: debug_log(f"Programmausgabe für '{self.log.path}' nicht lesbar: {exc}")
+
+def _read_program_capture(section_name):
+    # (Pfad, max. Bytes, Anzahl alter Dateien) oder None = Ausgabe wie bisher an die Konsole des Watchdogs
+    log_file = config.get(section_name, 'LogFile', fallback='').strip()
+    if not log_file: return None
+    if not os.path.isabs(log_file): log_file = os.path.join(os.path.dirname(CONFIG_FILE), log_file)
+    max_size_mb = DEFAULT_LOG_MAX_SIZE_MB
+    try: max_size_mb = max(0.1, config.getfloat(section_name, 'LogMaxSizeMB', fallback=DEFAULT_LOG_MAX_SIZE_MB))
+    except ValueError: debug_log(f"WARNUNG: Ungültiger Wert für LogMaxSizeMB in [{section_name}], verwende {DEFAULT_LOG_MAX_SIZE_MB}.")
+    backups = _read_program_override(section_name, 'LogBackups', 0)
+    return (log_file, int(max_size_mb * 1024 * 1024), DEFAULT_LOG_BACKUPS if backups is None else backups)
+
+def _output_log_for(capture):
+    path, max_bytes, backups = capture
+    with output_logs_lock:
+        log = output_logs.get(path)
+        if log is None: log = output_logs[path] = RotatingOutputLog(path, max_bytes, backups)
+        else: log.max_bytes = max_bytes; log.backups = backups  # ggf. per Hot Reload geändert
+    return log
+
+def attach_output_capture(section, pipe, capture):
+    # Übernimmt die stdout-Pipe eines gerade gestarteten Programms; kehrt sofort zurück
+    global output_wakeup, output_reader_thread, selectors
+    log = _output_log_for(capture)
+    if sys.platform == "win32":
+        asyncio.run_coroutine_threadsafe(_connect_output_pipe(pipe, log), ensure_async_loop())
+        return
+    with output_logs_lock:
+        if output_reader_thread is None:
+            import selectors
+            output_wakeup = os.pipe(); os.set_blocking(output_wakeup[0], False); os.set_blocking(output_wakeup[1], False)
+            output_reader_thread = threading.Thread(target=_output_reader, name="OutputReader", daemon=True); output_reader_thread.start()
+    output_pending.put((pipe, log))
+    try: os.write(output_wakeup[1], b'\0')
+    except BlockingIOError: pass  # Weck-Pipe voll: der Reader ist ohnehin schon geweckt
+
+def create_output_pipe():
+    # Windows: (lesende Seite als PipeHandle, schreibende Seite als fd für Popen). Nur die lesende Seite ist überlappend,
+    # das Kind bekommt einen gewöhnlichen Handle, den es wie eine Konsole oder Datei beschreiben kann.
+    import msvcrt
+    from asyncio import windows_utils
+    read_handle, write_handle = windows_utils.pipe(overlapped=(True, False))
+    return windows_utils.PipeHandle(read_handle), msvcrt.open_osfhandle(write_handle, 0)
+
+async def _connect_output_pipe(pipe, log):
+    try: await asyncio.get_running_loop().connect_read_pipe(lambda: OutputPipeProtocol(log), pipe)
+    except OSError as e: debug_log(f"Programmausgabe für '{log.path}' nicht lesbar: {e}"); pipe.close()
+
+def _output_reader():
+    selector = selectors.DefaultSelector()
+    selector.register(output_wakeup[0], selectors.EVENT_READ, None)
+    while True:
+        touched_logs = set()
+        for key, events in selector.select():
+            if key.data is None:
+                try: os.read(output_wakeup[0], 4096)
+                except BlockingIOError: pass
+                while True:
+                    try: pipe, log = output_pending.get_nowait()
+                    except queue.Empty: break
+                    os.set_blocking(pipe.fileno(), False)
+                    selector.register(pipe.fileno(), selectors.EVENT_READ, (pipe, log))
+                continue
+            pipe, log = key.data
+            try: data = os.read(key.fd, OUTPUT_READ_CHUNK)
+            except BlockingIOError: continue
+            except OSError as e: debug_log(f"Programmausgabe für '{log.path}' nicht lesbar: {e}"); data = b''
+            if data: log.write(data); touched_logs.add(log); continue
+            selector.unregister(key.fd); pipe.close()  # EOF: Programm beendet (samt aller Kinder, die die Pipe geerbt haben)
+        for log in touched_logs: log.flush()
+
+# --- Steuer-Schnittstelle (JSON-RPC) ---
+# Mit ControlSocket nimmt der Watchdog lokale Befehle als JSON-RPC 2.0 entgegen, eine Anfrage bzw. Antwort je Zeile
+# (POSIX: Unix-Socket mit Rechten 0600, Windows: Named Pipe). Der Server läuft auf der asyncio-Eventloop im Thread
+# "AsyncLoop". list/status lesen nur program_registry und program_states, den Zustand, den die Watchdog-Schleife bei
+# jedem Übergang fortschreibt - kein Zugriff auf watchdog.ini, keine Prozess-Scans. start/stop/restart gehen als
+# ('control', ...) an watchdog_events; enable/disable/reload ändern config dort, wo config sonst geändert wird
+# (mit GUI im Tk-Thread über _drain_ui_updates, headless unter config_task_lock).
+CONTROL_METHODS = ('list', 'status', 'start', 'stop', 'restart', 'enable', 'disable', 'reload')
+CONTROL_PIPE_PREFIX = '\\\\.\\pipe\\'
+CONTROL_TIMEOUT_SEC = 10.0  # Client: Wartezeit auf Verbindung und Antwort
+control_socket = ''  # [Settings] ControlSocket: Pfad des Unix-Sockets bzw. Name der Named Pipe (leer = aus)
+control_server = None
+control_server_address = ''
+program_states = {}  # Sektion -> (Zustand, seit wann als time.time()), von der Watchdog-Schleife geschrieben
+held_sections = set()  # per "stop" angehaltene Sektionen: werden nicht neu gestartet, bis "start" oder "restart" kommt
+config_tasks = queue.Queue()  # GUI-Modus: (Funktion, Future) für _drain_ui_updates
+config_task_lock = threading.Lock()  # headless: serialisiert Änderungen an config aus Steuer-Schnittstelle und Hot Reload
+
+class ControlError(Exception):
+    def __init__(self, code, message): super().__init__(message); self.code = code
+
+def resolve_control_address(value, config_path):
+    # POSIX: Pfad (relativ zur INI), Windows: Pipe-Name mit oder ohne \\.\pipe\ davor
+    value = value.strip()
+    if not value: return ''
+    if sys.platform == "win32": return value if value.lower().startswith(CONTROL_PIPE_PREFIX) else CONTROL_PIPE_PREFIX + value
+    return value if os.path.isabs(value) else os.path.join(os.path.dirname(config_path), value)
+
+def load_control_settings():
+    global control_socket
+    control_socket = resolve_control_address(config.get('Settings', 'ControlSocket', fallback=''), CONFIG_FILE)
+
+def set_program_state(section, state):
+    # Aus der Watchdog-Schleife: ein Dict-Zugriff, geschrieben wird nur bei einem Wechsel (since bleibt sonst stehen)
+    current = program_states.get(section)
+    if current is None or current[0] != state: program_states[section] = (state, time.time())
+
+def run_config_task(task):
+    # Führt task() im Besitzer-Thread von config aus; liefert ein concurrent.futures.Future
+    import concurrent.futures
+    future = concurrent.futures.Future()
+    if HEADLESS_MODE or root is None:
+        with config_task_lock: _complete_config_task(task, future)
+    else: config_tasks.put((task, future))
+    return future
+
+def _complete_config_task(task, future):
+    if not future.set_running_or_notify_cancel(): return
+    try: future.set_result(task())
+    except Exception as e: future.set_exception(e)
+
+def _set_program_enabled(section, enabled):
+    if not config.has_section(section): raise ControlError(-32602, f"Unknown program: {section}")
+    config.set(section, 'Enabled', str(enabled))
+    if not save_config_to_file(): raise ControlError(-32000, f"Could not write {CONFIG_FILE}")
+    load_settings_and_programs(changed_sections=(section,))
+    program = program_registry.get(section)
+    if program is None: raise ControlError(-32602, f"Program is incomplete after reload (Name/Path missing): {section}")
+    return _program_status(program)
+
+def _program_status(program, full=True):
+    state, since = program_states.get(program.section, ('disabled' if not program.enabled else 'unknown', None))
+    status = {'section': program.section, 'name': program.name, 'enabled': program.enabled, 'state': state, 'pid': program.pid}
+    if full:
+        status.update(path=program.path, since=since, held=program.section in held_sections, crash_loop=program.section in crash_looping_sections,
+                      check_cycle_sec=program.check_cycle_sec if program.check_cycle_sec is not None else check_cycle_sec)
+    return status
+
+def _control_program(params):
+    # Programm per "section" (z. B. Program3) oder per "name"; eine unbekannte Sektion wird auch als Name versucht
+    section = params.get('section'); name = params.get('name') or section
+    program = program_registry.get(section) if section else None
+    if program is None and name: program = next((p for p in program_registry if p.name == name), None)
+    if program is None: raise ControlError(-32602, f"Unknown program: {section or name}")
+    return program
+
+async def _control_list(params):
+    return {'watchdog_running': is_running, 'programs': [_program_status(program, full=False) for program in program_registry]}
+
+async def _control_status(params):
+    if params.get('section') or params.get('name'): return _program_status(_control_program(params))
+    return {'watchdog_running': is_running, 'programs': [_program_status(program) for program in program_registry]}
+
+async def _control_process(method, params):
+    # start/stop/restart: die Watchdog-Schleife führt sie aus; die Antwort bestätigt nur die Übergabe
+    program = _control_program(params)
+    if not is_running: raise ControlError(-32000, "Watchdog is not running")
+    if method != 'stop' and not program.enabled: raise ControlError(-32000, f"Program is disabled: {program.section}")
+    if method == 'stop': held_sections.add(program.section)
+    else: held_sections.discard(program.section)
+    watchdog_events.put(('control', method, program.section))
+    return {'section': program.section, 'accepted': method}
+
+async def _await_config_task(task):
+    # Headless wartet run_config_task() auf config_task_lock, daher nicht in der Eventloop selbst aufrufen
+    future = await asyncio.get_running_loop().run_in_executor(None, run_config_task, task)
+    return await asyncio.wrap_future(future)
+
+async def _control_set_enabled(enabled, params):
+    program = _control_program(params)
+    return await _await_config_task(lambda: _set_program_enabled(program.section, enabled))
+
+async def _control_reload(params):
+    changed_sections = await _await_config_task(lambda: reload_config_from_disk(time.monotonic(), restart_control_server=False))
+    return {'changed_sections': sorted(changed_sections or ())}
+
+CONTROL_HANDLERS = {
+    'list': _control_list, 'status': _control_status,
+    'start': lambda params: _control_process('start', params), 'stop': lambda params: _control_process('stop', params),
+    'restart': lambda params: _control_process('restart', params),
+    'enable': lambda params: _control_set_enabled(True, params), 'disable': lambda params: _control_set_enabled(False, params),
+    'reload': _control_reload,
+}
+
+async def _dispatch_control_request(line):
+    request_id = None
+    try:
+        try: request = json.loads(line)
+        except ValueError: raise ControlError(-32700, "Parse error")
+        if not isinstance(request, dict): raise ControlError(-32600, "Invalid Request")
+        request_id = request.get('id')
+        params = request.get('params') or {}
+        if not isinstance(request.get('method'), str) or not isinstance(params, dict): raise ControlError(-32600, "Invalid Request")
+        handler = CONTROL_HANDLERS.get(request['method'])
+        if handler is None: raise ControlError(-32601, f"Method not found: {request['method']}")
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': await handler(params)}
+    except ControlError as e: return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': str(e)}}
+    except Exception as e:
+        debug_log(f"Steuer-Schnittstelle: Fehler bei Anfrage {line[:200]!r}: {e}")
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32000, 'message': f"{type(e).__name__}: {e}"}}
+
+async def _handle_control_client(reader, writer):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line: break
+            if not line.strip(): continue
+            response = await _dispatch_control_request(line)
+            writer.write(json.dumps(response, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n")
+            await writer.drain()
+            # Per 'reload' geänderter ControlSocket: erst jetzt ersetzen, damit der Aufrufer seine Antwort noch erhält.
+            # start_control_server wartet selbst auf den AsyncLoop, läuft also im Thread-Pool.
+            if is_running and control_socket != control_server_address:
+                await asyncio.get_running_loop().run_in_executor(None, start_control_server, control_socket)
+    except (ConnectionError, ValueError) as e: debug_log(f"Steuer-Schnittstelle: Verbindung abgebrochen: {e}")
+    finally: writer.close()
+
+async def _open_control_pipe(address):
+    # Named Pipes bietet asyncio nur über ProactorEventLoop.start_serving_pipe an (nicht dokumentiert, seit Python 3.5
+    # unverändert). Fehlt es, bleibt die Steuer-Schnittstelle mit klarer Meldung aus, statt später zu scheitern.
+    # Die Pipe erhält die Standard-Sicherheit von CreateNamedPipe: Schreiben (= Befehle senden) dürfen nur SYSTEM,
+    # Administratoren und der Benutzer des Watchdogs; die erste Instanz wird exklusiv angelegt, eine fremde Pipe
+    # gleichen Namens lässt den Start also scheitern.
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, getattr(asyncio, 'ProactorEventLoop', ())) or not hasattr(loop, 'start_serving_pipe'):
+        raise OSError(f"Named Pipes brauchen asyncio.ProactorEventLoop.start_serving_pipe (Eventloop: {type(loop).__name__}, Python {sys.version.split()[0]})")
+    def _protocol_factory():
+        return asyncio.StreamReaderProtocol(asyncio.StreamReader(), _handle_control_client)
+    return (await loop.start_serving_pipe(_protocol_factory, address))[0]
+
+async def _open_control_server(address):
+    if sys.platform == "win32": return await _open_control_pipe(address)
+    if os.path.exists(address):
+        # Übrig gebliebene Socket-Datei eines beendeten Watchdogs entfernen, einen laufenden aber nicht verdrängen
+        try: _, probe_writer = await asyncio.open_unix_connection(address)
+        except OSError: os.remove(address)
+        else: probe_writer.close(); raise OSError(f"{address} wird bereits von einem anderen Watchdog verwendet")
+    # Unter einem temporären Namen binden, auf 0600 setzen und erst dann umbenennen: unter dem endgültigen Namen gibt es
+    # nie einen Socket mit weiteren Rechten, ohne die prozessweite umask anderer Threads zu verändern. Der temporäre
+    # Socket nimmt vor listen() (in start_unix_server) keine Verbindungen an.
+    import socket
+    temp_address = os.path.join(os.path.dirname(address), f".{os.path.basename(address)}.{os.getpid()}")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try: os.remove(temp_address)
+        except FileNotFoundError: pass
+        sock.bind(temp_address); os.chmod(temp_address, 0o600); os.rename(temp_address, address)
+    except OSError:
+        sock.close()
+        try: os.remove(temp_address)
+        except OSError: pass
+        raise
+    return await asyncio.start_unix_server(_handle_control_client, sock=sock)
+
+def start_control_server(address):
+    global control_server, control_server_address
+    if address == control_server_address: return
+    stop_control_server()
+    if not address: return
+    loop = ensure_async_loop()
+    try: control_server = asyncio.run_coroutine_threadsafe(_open_control_server(address), loop).result(timeout=CONTROL_TIMEOUT_SEC)
+    except Exception as e: write_log_line(f"FEHLER ({time.strftime('%H:%M:%S')}): Steuer-Schnittstelle '{address}' nicht möglich: {e}"); return
+    control_server_address = address
+    debug_log(f"Steuer-Schnittstelle: {address}")
+
+def stop_control_server():
+    global control_server, control_server_address
+    if control_server is None: return
+    async_loop.call_soon_threadsafe(control_server.close)
+    if sys.platform != "win32":
+        try: os.remove(control_server_address)
+        except OSError: pass
+    control_server = None; control_server_address = ''
+
+def control_request(address, method, params=None, timeout=CONTROL_TIMEOUT_SEC):
+    # Client für --control (und benchmark.py): eine Anfrage über eine eigene Verbindung, Rückgabe der JSON-RPC-Antwort
+    return ControlClient(address, timeout).call(method, params, close=True)
+
+class ControlClient:
+    # Blockierender Client mit einer Verbindung für mehrere Anfragen nacheinander
+    def __init__(self, address, timeout=CONTROL_TIMEOUT_SEC):
+        # Gelesen wird gepuffert (readline() auf dem ungepufferten Strom liest sonst Byte für Byte)
+        self.request_ids = itertools.count(1)
+        if sys.platform == "win32":
+            pipe = open(address, 'r+b', buffering=0)
+            self.send = pipe.write; self.reader = io.BufferedReader(pipe); self.handles = (self.reader,)
+        else:
+            import socket
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM); connection.settimeout(timeout)
+            try: connection.connect(address)
+            except OSError: connection.close(); raise
+            self.send = connection.sendall; self.reader = connection.makefile('rb'); self.handles = (self.reader, connection)
+
+    def call(self, method, params=None, close=False):
+        try:
+            self.send(json.dumps({'jsonrpc': '2.0', 'id': next(self.request_ids), 'method': method, 'params': params or {}}).encode('utf-8') + b"\n")
+            line = self.reader.readline()
+            if not line: raise ConnectionError("Verbindung vom Watchdog geschlossen")
+            return json.loads(line)
+        finally:
+            if close: self.close()
+
+    def close(self):
+        for handle in self.handles: handle.close()
 
 # --- Watchdog Hauptschleife ---
-STATE_WAIT_CHECK = 0; STATE_CHECKING = 1; STATE_WAIT_DELAY = 2
-def watchdog_loop(stop_event_thread):
-    global watchdog_state, last_check_completion_time, last_program_start_time, current_program_index
+# Jeder Eintrag hat einen eigenen Fälligkeitszeitpunkt in einem Heap. Prüfung und Startverzögerung
+# eines Programms laufen dadurch unabhängig von allen anderen Einträgen (Planungskosten O(log n)).
+TASK_CHECK = 0; TASK_DELAY_END = 1
+def watchdog_loop(stop_event_thread, exit_after_first_cycle=False):
     local_check_cycle_sec = float(check_cycle_sec); local_start_delay_sec = float(start_delay_sec)
-    current_program_list_for_cycle = program_list[:]
-    if not current_program_list_for_cycle: debug_log("Watchdog-Thread: Keine Programme."); root.after(0, update_watchdog_buttons_on_stop); return
+    if not program_registry:
+        debug_log("Watchdog-Thread: Keine Programme.")
+        if root: root.after(0, update_watchdog_buttons_on_stop)
+        return
     debug_log(f"Watchdog-Thread gestartet. Zyklus: {local_check_cycle_sec:.1f}s, Delay: {local_start_delay_sec:.1f}s")
-    watchdog_state = STATE_CHECKING; current_program_index = 0; last_check_completion_time = 0.0; last_program_start_time = 0.0
+    schedule_heap = []  # Einträge (fällig_um, token, sektion, aufgabe)
+    schedule_tokens = {}  # Sektion -> token des gültigen Heap-Eintrags; ältere Einträge werden beim Entnehmen verworfen
+    start_times = {}  # Sektion -> Zeitpunkt des letzten Starts (für das Ende der Startverzögerung)
+    effective_dependencies = {}  # Sektion -> Sektionen, die bereit sein müssen (aus plan_startup_waves)
+    ready_sections = set()  # Läuft und ist nicht mehr in der Startverzögerung
+    waiting_dependents = {}  # Sektion -> Sektionen, die auf deren Bereitschaft warten
+    programs_by_section = {}
+    probe_failures = {}  # Sektion -> fehlgeschlagene Probes in Folge
+    probes_in_flight = set()  # Sektionen mit laufender Probe (höchstens eine Runde pro Eintrag gleichzeitig)
+    terminating_sections = set()  # Sektionen, deren hängender Prozess gerade beendet wird
+    resource_processes = {}  # Sektion -> psutil.Process für die Ressourcen-Messung (hält den cpu_percent-Bezugspunkt)
+    cpu_breaches = {}  # Sektion -> Messungen in Folge über MaxCPUPercent
+    restart_history = {}  # Sektion -> {'failures': Fehlstarts in Folge, 'last_start': Zeitpunkt, 'retry_at': frühester Neustart}
+    planned_stops = {}  # Sektion -> PID, die per Steuer-Schnittstelle beendet wird (ihr Ende zählt nicht als Ausfall)
+    known_registry = None
+    token_counter = itertools.count()
+
+    def cycle_of(program): return float(program.check_cycle_sec) if program.check_cycle_sec is not None else local_check_cycle_sec
+    def delay_of(program): return float(program.start_delay_sec) if program.start_delay_sec is not None else local_start_delay_sec
+
+    def schedule(section, due, task=TASK_CHECK):
+        token = next(token_counter); schedule_tokens[section] = token
+        heapq.heappush(schedule_heap, (due, token, section, task))
+
+    def sync_program_registry(now):
+        # Übernimmt ein neu geladenes program_registry, ohne laufende Fristen der bestehenden Einträge zu verlieren
+        nonlocal known_registry, programs_by_section, effective_dependencies, local_check_cycle_sec, local_start_delay_sec
+        known_registry = program_registry
+        local_check_cycle_sec = float(check_cycle_sec); local_start_delay_sec = float(start_delay_sec)  # ggf. per Hot Reload geändert
+        previous_programs = programs_by_section
+        programs_by_section = {p.section: p for p in known_registry}
+        for section in list(schedule_tokens):
+            if section not in programs_by_section:
+                del schedule_tokens[section]; start_times.pop(section, None); ready_sections.discard(section); restart_history.pop(section, None)
+                record_program_availability(section, None); program_states.pop(section, None); held_sections.discard(section); planned_stops.pop(section, None)
+                if section in crash_looping_sections: set_program_crash_looping(section, False)
+        waves, cycle_sections, effective_dependencies = plan_startup_waves(known_registry)
+        if len(waves) > 1: debug_log("Watchdog: Startplan: " + " | ".join(f"Welle {i + 1}: {', '.join(wave)}" for i, wave in enumerate(waves)))
+        if cycle_sections:
+            cycle_names = ", ".join(programs_by_section[section].name for section in cycle_sections)
+            debug_log(f"WARNUNG: Abhängigkeitszyklus zwischen {cycle_names}; DependsOn wird für diese Einträge ignoriert.")
+            update_status_message("Status.DependencyCycle", names=cycle_names)
+        # In Wellenreihenfolge einplanen, damit bei gleicher Fälligkeit Abhängigkeiten zuerst geprüft werden
+        planned_order = [section for wave in waves for section in wave]
+        planned_order += [section for section in programs_by_section if section not in effective_dependencies]
+        for section in planned_order:
+            program = programs_by_section[section]
+            previous = previous_programs.get(section)
+            if section not in schedule_tokens: schedule(section, now)
+            elif previous is not None and ((program.enabled and not previous.enabled) or program.check_cycle_sec != previous.check_cycle_sec): schedule(section, now)
+        debug_log(f"Watchdog: Programmliste übernommen ({len(programs_by_section)} Einträge, {len(schedule_heap)} Heap-Einträge).")
+
+    while True:  # Veraltete Ereignisse aus einem früheren Lauf verwerfen, die erste Prüfung erfasst ohnehin alles
+        try: stale_event = watchdog_events.get_nowait()
+        except queue.Empty: break
+        if stale_event[0] == 'exit': _handle_child_exit(*stale_event[1:])
+
+    def running_pid_of(program):
+        nonlocal batch_snapshot
+        child = child_processes.get(program.section)
+        # Selbst gestartete Kindprozesse melden ihr Ende per Ereignis, hier reicht ein poll() ohne Scan
+        if child is not None and child.poll() is None: return child.pid
+        if is_pinned_process_alive(program): return program.pid
+        if batch_snapshot is None:
+            scan_started = time.perf_counter()
+            batch_snapshot = build_process_snapshot()
+            observe_metric('watchdog_process_scan_duration_seconds', time.perf_counter() - scan_started)
+            debug_log(f"Watchdog: Prozess-Snapshot erstellt ({len(batch_snapshot)} Prozessnamen).")
+        pid = find_process_pid(program.process_name, program.path, batch_snapshot)
+        if pid is not None: pin_process(program, pid)
+        return pid
+
+    def check_running(program):
+        check_started = time.perf_counter()
+        pid = running_pid_of(program)
+        observe_metric('watchdog_check_duration_seconds', time.perf_counter() - check_started, program)
+        return pid
+
+    def end_start_delay(section, now):
+        started_at = start_times.pop(section, None)
+        if started_at is not None: increment_metric('watchdog_start_delay_seconds_total', programs_by_section.get(section), now - started_at)
+        return started_at
+
+    def note_running(section, program, now):
+        # Läuft ein Eintrag länger als restart_stable_sec seit dem letzten Start, gilt er wieder als stabil
+        history = restart_history.get(section)
+        if history is None or now - history['last_start'] < restart_stable_sec: return
+        del restart_history[section]
+        if section in crash_looping_sections:
+            set_program_crash_looping(section, False)
+            update_status_message("Status.WatchdogRunningStable", name=program.name)
+            record_program_event('recovered', program, program.pid)
+            debug_log(f"Watchdog: '{program.name}' läuft wieder stabil, Backoff zurückgesetzt.")
+
+    def restart_retry_at(section, program, now):
+        # Liefert den frühesten erlaubten Neustart (None = sofort). Ein Eintrag, der vor Ablauf von
+        # restart_stable_sec wieder weg ist, zählt als Fehlstart; die Wartezeit wächst dann exponentiell.
+        history = restart_history.get(section)
+        if history is None: return None
+        if 'retry_at' not in history:
+            if now - history['last_start'] >= restart_stable_sec:
+                del restart_history[section]
+                if section in crash_looping_sections: set_program_crash_looping(section, False)
+                return None
+            history['failures'] += 1
+            backoff_sec = min(restart_backoff_max_sec, restart_backoff_sec * restart_backoff_multiplier ** (history['failures'] - 1))
+            history['retry_at'] = history['last_start'] + backoff_sec
+            if history['failures'] >= crash_loop_threshold and section not in crash_looping_sections:
+                set_program_crash_looping(section, True)
+                record_program_event('crash_loop', program, detail=f"{history['failures']}")
+                debug_log(f"Watchdog: '{program.name}' als Crash-Loop markiert ({history['failures']} Fehlstarts in Folge).")
+            retry_in = max(0.0, history['retry_at'] - now)
+            record_program_event('backoff', program, detail=f"{retry_in:.1f}s")
+            if section in crash_looping_sections: update_status_message("Status.WatchdogCrashLooping", name=program.name, count=history['failures'], delay=f"{retry_in:.1f}")
+            else: update_status_message("Status.WatchdogRestartBackoff", name=program.name, delay=f"{retry_in:.1f}")
+            debug_log(f"Watchdog: '{program.name}' Fehlstart {history['failures']}, nächster Start frühestens in {retry_in:.1f}s.")
+        return history['retry_at'] if now < history['retry_at'] else None
+
+    def handle_probe_result(section, pid, failure):
+        probes_in_flight.discard(section)
+        program = programs_by_section.get(section)
+        if program is None or program.pid not in (None, pid) or section in terminating_sections: return  # veraltetes Ergebnis
+        if failure is None: probe_failures.pop(section, None); return
+        failure_count = probe_failures[section] = probe_failures.get(section, 0) + 1
+        increment_metric('watchdog_probe_failures_total', program)
+        update_status_message("Status.WatchdogProbeFailed", name=program.name, reason=failure, count=failure_count, threshold=probe_failure_threshold)
+        debug_log(f"Watchdog: Probe '{program.name}' (PID {pid}) fehlgeschlagen ({failure_count}/{probe_failure_threshold}): {failure}")
+        if failure_count < probe_failure_threshold: return
+        del probe_failures[section]
+        update_status_message("Status.WatchdogProbeRestart", name=program.name)
+        record_program_event('probe_restart', program, pid, detail=failure)
+        recycle_process(section, program, pid)
+
+    def recycle_process(section, program, pid):
+        # Beenden im Hintergrund; handle_terminated() plant danach die Prüfung ein, die über start_program neu startet
+        terminating_sections.add(section); resource_processes.pop(section, None); cpu_breaches.pop(section, None)
+        set_program_state(section, 'terminating')
+        terminate_program_process(section, pid, program.create_time)
+
+    def handle_control(action, section):
+        # start/stop/restart aus der Steuer-Schnittstelle; held_sections hat _control_process() bereits gesetzt
+        nonlocal batch_snapshot
+        program = programs_by_section.get(section)
+        if program is None: return
+        record_program_event('control_' + action, program, program.pid)
+        if action != 'stop':
+            restart_history.pop(section, None)  # ausdrücklicher Start übergeht Backoff und Crash-Loop
+            if section in crash_looping_sections: set_program_crash_looping(section, False)
+        if action != 'start' and section not in terminating_sections:
+            batch_snapshot = None
+            pid = check_running(program)
+            if pid is not None: planned_stops[section] = pid; recycle_process(section, program, pid); return
+        if section not in terminating_sections: schedule(section, time.monotonic())
+
+    def resource_limit_breach(section, program, pid):
+        limits = program.limits
+        proc = resource_processes.get(section)
+        try:
+            if proc is None or proc.pid != pid:
+                proc = resource_processes[section] = psutil.Process(pid); cpu_breaches.pop(section, None)
+            sample = sample_process_resources(proc, limits)
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            resource_processes.pop(section, None); debug_log(f"Watchdog: Ressourcen von '{program.name}' (PID {pid}) nicht lesbar: {e}"); return None
+        if 'rss_mb' in sample and sample['rss_mb'] > limits['max_rss_mb']: return f"RSS {sample['rss_mb']:.0f} MB > {limits['max_rss_mb']} MB"
+        if 'handles' in sample and sample['handles'] > limits['max_handles']: return f"Handles {sample['handles']} > {limits['max_handles']}"
+        if 'fds' in sample and sample['fds'] > limits['max_fds']: return f"FDs {sample['fds']} > {limits['max_fds']}"
+        if 'cpu_percent' in sample:
+            if sample['cpu_percent'] <= limits['max_cpu_percent']: cpu_breaches.pop(section, None); return None
+            breach_count = cpu_breaches[section] = cpu_breaches.get(section, 0) + 1
+            if breach_count >= limits['cpu_samples']: return f"CPU {sample['cpu_percent']:.0f}% > {limits['max_cpu_percent']}% ({breach_count}x)"
+        return None
+
+    def handle_terminated(section, pid):
+        terminating_sections.discard(section)
+        program = programs_by_section.get(section)
+        if program is None: return
+        if program.pid == pid: unpin_process(program)
+        child = child_processes.get(section)
+        if planned_stops.get(section) == pid and (child is None or child.pid != pid):
+            # Nicht selbst gestartet: kein 'exit'-Ereignis folgt, das Ende wird hier protokolliert
+            del planned_stops[section]; record_program_event('stopped', program, pid)
+        ready_sections.discard(section); schedule(section, time.monotonic())
+
+    def mark_ready(section, now):
+        ready_sections.add(section); record_program_availability(section, 'up')
+        for dependent in waiting_dependents.pop(section, ()):
+            if dependent in programs_by_section: schedule(dependent, now)
+
+    batch_snapshot = None
     while not stop_event_thread.is_set():
-        now = time.monotonic(); process_next_state_immediately = False
-        current_list_len = len(current_program_list_for_cycle)
-        if not current_program_list_for_cycle and watchdog_state != STATE_WAIT_CHECK :
-             debug_log("Watchdog: Programmliste leer geworden, gehe zu Warte-Status."); watchdog_state = STATE_WAIT_CHECK; last_check_completion_time = now; process_next_state_immediately = False
-        if watchdog_state == STATE_WAIT_CHECK:
-            if not current_program_list_for_cycle: last_check_completion_time = now
-            elif last_check_completion_time == 0.0: last_check_completion_time = now
-            if (now - last_check_completion_time) >= local_check_cycle_sec:
-                current_program_list_for_cycle = program_list[:]
-                current_list_len = len(current_program_list_for_cycle)
-                if current_list_len > 0:
-                    update_status_message("Status.WatchdogCycleStarts")
-                    debug_log("Watchdog: Zyklus beginnt...");
-                    current_program_index = 0;
-                    watchdog_state = STATE_CHECKING;
-                    process_next_state_immediately = True
-                else:
-                    debug_log("Watchdog: Zyklus, keine Programme. Warte.");
-                last_check_completion_time = now
-        elif watchdog_state == STATE_CHECKING:
-            process_next_state_immediately = True
-            if current_program_index >= current_list_len: debug_log("Watchdog: Zyklus abgeschlossen."); last_check_completion_time = now; watchdog_state = STATE_WAIT_CHECK; process_next_state_immediately = False
+        now = time.monotonic()
+        if program_registry is not known_registry: sync_program_registry(now)
+        batch_snapshot = None  # Prozess-Snapshot für alle gleichzeitig fälligen Einträge, wird nur bei Bedarf gebaut
+        cycle_started = time.perf_counter(); cycle_has_work = bool(schedule_heap) and schedule_heap[0][0] <= now
+        probe_batch = []
+        while schedule_heap and schedule_heap[0][0] <= now and not stop_event_thread.is_set():
+            due, token, section, task = heapq.heappop(schedule_heap)
+            if schedule_tokens.get(section) != token: continue  # überholt (neu geplant oder entfernt)
+            program = programs_by_section[section]
+            if task == TASK_DELAY_END:
+                update_status_message("Status.WatchdogDelayEndedFor {}", program.name)
+                debug_log(f"Watchdog: Startverzögerung '{program.name}' beendet.")
+                started_at = end_start_delay(section, now)
+                record_program_event('delay_ended', program, program.pid)
+                if check_running(program) is not None:
+                    if section not in terminating_sections: set_program_state(section, 'running')
+                    mark_ready(section, now); note_running(section, program, now)
+                    schedule(section, max(now, (started_at or now) + cycle_of(program)))
+                else: schedule(section, now)
+                continue
+            if not program.enabled:
+                ready_sections.discard(section); record_program_availability(section, None); set_program_state(section, 'disabled')
+                schedule(section, now + cycle_of(program)); continue
+            running_pid = check_running(program)
+            if running_pid is not None:
+                if section not in terminating_sections: set_program_state(section, 'running')
+                if section not in ready_sections: mark_ready(section, now)
+                note_running(section, program, now)
+                resource_breach = resource_limit_breach(section, program, running_pid) if program.limits and section not in terminating_sections else None
+                if resource_breach:
+                    update_status_message("Status.WatchdogResourceLimit", name=program.name, reason=resource_breach)
+                    debug_log(f"Watchdog: '{program.name}' (PID {running_pid}) über Grenzwert: {resource_breach}")
+                    increment_metric('watchdog_resource_restarts_total', program)
+                    record_program_event('resource_restart', program, running_pid, detail=resource_breach)
+                    recycle_process(section, program, running_pid)
+                if program.probes and section not in probes_in_flight and section not in terminating_sections:
+                    probes_in_flight.add(section); probe_batch.append((section, running_pid, program.probes, program.probe_timeout_sec))
+                schedule(section, now + cycle_of(program)); continue
+            if section in terminating_sections: schedule(section, now + cycle_of(program)); continue  # Neustart erst nach dem Beenden
+            if section in ready_sections: record_program_event('exited', program)  # nicht selbst gestartet: Ende erst jetzt bemerkt
+            ready_sections.discard(section)
+            if section in held_sections:  # per Steuer-Schnittstelle angehalten: nicht starten, zählt nicht als Ausfallzeit
+                record_program_availability(section, None); set_program_state(section, 'held')
+                schedule(section, now + cycle_of(program)); continue
+            record_program_availability(section, 'down'); set_program_state(section, 'stopped')
+            missing_dependencies = [d for d in effective_dependencies.get(section, ()) if d not in ready_sections]
+            if missing_dependencies:
+                # Erst starten, wenn alle Abhängigkeiten laufen; mark_ready() plant diesen Eintrag dann sofort neu ein
+                for dependency in missing_dependencies: waiting_dependents.setdefault(dependency, set()).add(section)
+                dependency_names = ", ".join(programs_by_section[d].name for d in missing_dependencies)
+                update_status_message("Status.WatchdogWaitingForDependencies", name=program.name, names=dependency_names)
+                set_program_state(section, 'waiting')
+                debug_log(f"Watchdog: '{program.name}' wartet auf {dependency_names}.")
+                schedule(section, now + cycle_of(program)); continue
+            retry_at = restart_retry_at(section, program, now)
+            if retry_at is not None:  # Backoff: andere Einträge werden weiter geprüft
+                set_program_state(section, 'crash_loop' if section in crash_looping_sections else 'backoff')
+                schedule(section, retry_at); continue
+            history = restart_history.setdefault(section, {'failures': 0})
+            history['last_start'] = now; history.pop('retry_at', None)
+            update_status_message("Status.WatchdogProcessStarting", name=program.name)
+            debug_log(f"Watchdog: Prozess '{program.name}' läuft nicht -> Starte...")
+            started_process = start_program(program)
+            if started_process:
+                increment_metric('watchdog_restarts_total', program)
+                record_program_event('started', program, started_process.pid)
+                set_program_state(section, 'starting')
+                pin_process(program, started_process.pid)
+                track_child_process(program, started_process)
+                program_delay_sec = delay_of(program)
+                update_status_message("Status.WatchdogWaitingAfterStart", delay=f"{program_delay_sec:.1f}", name=program.name)
+                debug_log(f"... Warte {program_delay_sec:.1f}s (nur für '{program.name}').")
+                start_times[section] = now
+                schedule(section, now + program_delay_sec, TASK_DELAY_END)
             else:
-                program = current_program_list_for_cycle[current_program_index]
-                if not program['enabled']: current_program_index += 1
-                elif is_process_running(program['process_name'], program['path']): current_program_index += 1
-                else:
-                    update_status_message("Status.WatchdogProcessStarting", name=program['name'])
-                    debug_log(f"Watchdog: Prozess '{program['name']}' läuft nicht -> Starte...")
-                    if start_program(program['path']):
-                        update_status_message("Status.WatchdogWaitingAfterStart", delay=f"{local_start_delay_sec:.1f}", name=program['name'])
-                        debug_log(f"... Warte {local_start_delay_sec:.1f}s.");
-                        last_program_start_time = now;
-                        watchdog_state = STATE_WAIT_DELAY;
-                        process_next_state_immediately = False
-                    else:
-                        debug_log(f"... FEHLER Start '{program['name']}'.");
-                    current_program_index += 1
-                if current_program_index >= current_list_len and watchdog_state == STATE_CHECKING: debug_log("Watchdog: Zyklus beendet (nach Check/Skip)."); last_check_completion_time = now; watchdog_state = STATE_WAIT_CHECK; process_next_state_immediately = False
-        elif watchdog_state == STATE_WAIT_DELAY:
-            process_next_state_immediately = True
-            elapsed_since_start = now - last_program_start_time
-            if elapsed_since_start >= local_start_delay_sec:
-                 program_name_delayed = "?";
-                 if current_program_index < current_list_len: program_name_delayed = current_program_list_for_cycle[current_program_index]['name']
-                 update_status_message("Status.WatchdogDelayEndedFor {}", program_name_delayed)
-                 debug_log(f"Watchdog: Startverzögerung '{program_name_delayed}' beendet.");
-                 current_program_index += 1;
-                 watchdog_state = STATE_CHECKING
-                 if current_program_index >= current_list_len: debug_log("Watchdog: Zyklus beendet (nach letztem Delay)."); last_check_completion_time = now; watchdog_state = STATE_WAIT_CHECK; process_next_state_immediately = False
-            else: process_next_state_immediately = False
-        if not process_next_state_immediately:
-            wait_time = SHORT_ADLIB_INTERVAL_SEC;
-            if watchdog_state == STATE_WAIT_CHECK: time_to_next_check = max(0, local_check_cycle_sec - (now - last_check_completion_time)); wait_time = min(wait_time, time_to_next_check) if last_check_completion_time > 0 else wait_time
-            elif watchdog_state == STATE_WAIT_DELAY: time_to_delay_end = max(0, local_start_delay_sec - (now - last_program_start_time)); wait_time = min(wait_time, time_to_delay_end)
-            wait_time = max(0.1, wait_time); stopped = stop_event_thread.wait(timeout=wait_time)
-            if stopped: break
-        elif stop_event_thread.is_set(): break
+                debug_log(f"... FEHLER Start '{program.name}'.")
+                increment_metric('watchdog_failed_starts_total', program)
+                record_program_event('start_failed', program)
+                set_program_state(section, 'start_failed')
+                schedule(section, now + cycle_of(program))
+        if probe_batch: submit_probes(probe_batch)
+        if cycle_has_work: observe_metric('watchdog_cycle_duration_seconds', time.perf_counter() - cycle_started)
+        write_metrics_file()
+        if exit_after_first_cycle:
+            debug_log("Watchdog: Erster Prüfdurchlauf beendet (--exit-after-first-cycle)."); break
+        wait_time = SHORT_ADLIB_INTERVAL_SEC
+        if schedule_heap: wait_time = min(wait_time, schedule_heap[0][0] - time.monotonic())
+        try: event = watchdog_events.get(timeout=max(0.01, wait_time))
+        except queue.Empty: event = None
+        while event is not None:
+            # Kindprozess beendet -> sofort prüfen, auch wenn die reguläre Prüfung noch nicht fällig ist
+            if event[0] == 'exit':
+                # Per Steuer-Schnittstelle beendet: 'stopped', auch wenn 'terminated' zuerst kam und schon neu gestartet wurde
+                planned_stop = planned_stops.get(event[1]) == event[2]
+                if planned_stop: del planned_stops[event[1]]
+                current_child = _handle_child_exit(*event[1:])
+                if event[1] in programs_by_section and (planned_stop or current_child):
+                    record_program_event('stopped' if planned_stop else 'exited', programs_by_section[event[1]], event[2], event[3])
+                if current_child and event[1] in programs_by_section:
+                    end_start_delay(event[1], time.monotonic()); ready_sections.discard(event[1]); schedule(event[1], time.monotonic())
+            elif event[0] == 'probe': handle_probe_result(*event[1:])
+            elif event[0] == 'terminated': handle_terminated(*event[1:])
+            elif event[0] == 'control': handle_control(*event[1:])
+            try: event = watchdog_events.get_nowait()
+            except queue.Empty: event = None
+    write_metrics_file(force=True)
+    flush_journal()
+    stop_program_availability(); flush_stats()
+    for section in list(crash_looping_sections): set_program_crash_looping(section, False)
     debug_log("Watchdog-Thread: Schleife beendet.");
+    if not root: return
     try:
         if root and root.winfo_exists():
             root.after(0, update_watchdog_buttons)
@@ -547,10 +2353,10 @@ def watchdog_loop(stop_event_thread):
 def create_gui_widgets():
     global root, check_cycle_var_sec, start_delay_var_sec, btnSaveConfig, tree_programs
     global inpProgPathAdd, inpProgNameAdd, chkEnabledVar, chkEnabledAdd, btnBrowseAdd, btnAddProg, btnRemoveProg
-    global btnEditProg, btnStartWatchdog, btnStopWatchdog, btnExitApp, status_bar_text, style
+    global btnEditProg, btnStartWatchdog, btnStopWatchdog, btnExitApp, btnHistory, btnStatistics, status_bar_text, style
     global lblCheckCycle, lblStartDelay, lblLanguage, lblPathAdd, lblNameAdd, lblTheme, theme_frame, language_combo
     global r_system, r_light, r_dark, theme_preference_var, settings_frame, programs_frame, add_frame, language_var
-    global BASE_FONT_SIZE 
+    global BASE_FONT_SIZE, program_search_var, program_search_entry, lblSearch, program_scrollbar 
 
     root.title(translate("Watchdog"));
     root.geometry("550x580")
@@ -608,25 +2414,34 @@ def create_gui_widgets():
     programs_frame = ttk.LabelFrame(root, text=translate("Programs"), padding="10");
     programs_frame.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
     programs_frame.columnconfigure(0, weight=1);
-    programs_frame.rowconfigure(0, weight=1)
-    
-    columns = ("nr", "name", "path", "enabled");
-    tree_programs = ttk.Treeview(programs_frame, columns=columns, show='headings', selectmode='browse')
-    tree_programs.heading("nr", text=translate("Nr."));
-    tree_programs.heading("name", text=translate("Name"));
-    tree_programs.heading("path", text=translate("Path"));
-    tree_programs.heading("enabled", text=translate("Activated"))
+    programs_frame.rowconfigure(1, weight=1)
+
+    search_frame = ttk.Frame(programs_frame);
+    search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0,5))
+    search_frame.columnconfigure(1, weight=1)
+    lblSearch = ttk.Label(search_frame, text=translate("Search:"));
+    lblSearch.grid(row=0, column=0, padx=(0,5), sticky="w")
+    program_search_var = tk.StringVar(root);
+    program_search_var.trace_add("write", on_program_search_changed)
+    program_search_entry = ttk.Entry(search_frame, textvariable=program_search_var);
+    program_search_entry.grid(row=0, column=1, sticky="ew")
+
+    tree_programs = ttk.Treeview(programs_frame, columns=PROGRAM_LIST_COLUMNS, show='headings', selectmode='browse', height=PROGRAM_LIST_DEFAULT_ROWS)
+    _update_program_headings()
     tree_programs.column("nr", width=30, stretch=tk.NO, anchor='e');
     tree_programs.column("name", width=120);
     tree_programs.column("path", width=250);
     tree_programs.column("enabled", width=60, anchor='center')
     
-    scrollbar = ttk.Scrollbar(programs_frame, orient=tk.VERTICAL, command=tree_programs.yview);
-    tree_programs.configure(yscroll=scrollbar.set)
-    tree_programs.grid(row=0, column=0, sticky='nsew');
-    scrollbar.grid(row=0, column=1, sticky='ns')
+    # Die Scrollbar steuert den Ausschnitt der virtuellen Liste, nicht den Treeview selbst
+    program_scrollbar = ttk.Scrollbar(programs_frame, orient=tk.VERTICAL, command=_on_program_scrollbar);
+    tree_programs.grid(row=1, column=0, sticky='nsew');
+    program_scrollbar.grid(row=1, column=1, sticky='ns')
     tree_programs.bind('<<TreeviewSelect>>', on_list_selection_change);
     tree_programs.bind('<Double-1>', on_edit_button_click)
+    tree_programs.bind('<Configure>', _on_program_list_resize)
+    for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'): tree_programs.bind(sequence, _on_program_mousewheel)
+    for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'): tree_programs.bind(sequence, _on_program_list_key)
     if style: style.map("Treeview", foreground=_fixed_map("foreground"), background=_fixed_map("background"))
 
     add_frame = ttk.LabelFrame(root, text=translate("Add program"), padding="10");
@@ -664,6 +2479,10 @@ def create_gui_widgets():
     btnEditProg = ttk.Button(edit_remove_frame, text=translate("Edit selected"), command=on_edit_button_click, state=tk.DISABLED); btnEditProg.pack(side=tk.TOP, anchor="w", pady=(0, 2))
     btnRemoveProg = ttk.Button(edit_remove_frame, text=translate("Remove selected"), command=on_remove_button_click, state=tk.DISABLED); btnRemoveProg.pack(side=tk.TOP, anchor="w")
     
+    history_frame = ttk.Frame(bottom_frame); history_frame.grid(row=0, column=1, padx=10, sticky="nw")
+    btnHistory = ttk.Button(history_frame, text=translate("History"), command=on_history_button_click); btnHistory.pack(side=tk.TOP, anchor="w", pady=(0, 2))
+    btnStatistics = ttk.Button(history_frame, text=translate("Statistics"), command=on_statistics_button_click); btnStatistics.pack(side=tk.TOP, anchor="w")
+
     start_stop_frame = ttk.Frame(bottom_frame); start_stop_frame.grid(row=0, column=2, sticky="ns")
     btnStartWatchdog = ttk.Button(start_stop_frame, text=translate("Start"), command=on_start_watchdog_click); btnStartWatchdog.pack(side=tk.TOP, anchor="center", pady=(0, 2))
     btnStopWatchdog = ttk.Button(start_stop_frame, text=translate("Stop"), command=on_stop_watchdog_click, state=tk.DISABLED); btnStopWatchdog.pack(side=tk.TOP, anchor="center")
@@ -676,15 +2495,22 @@ def create_gui_widgets():
 
 # --- Hilfe-Funktionen ---
 def show_help_cycle(): messagebox.showinfo(translate("Help: Check cycle"), translate("Time in seconds (s) the watchdog waits after checking all programs before checking again."), parent=root)
-def show_help_delay(): messagebox.showinfo(translate("Help: Start delay"), translate("Time in seconds (s) the watchdog waits after starting a missing program before checking/starting the *next* program in the list."), parent=root)
+def show_help_delay(): messagebox.showinfo(translate("Help: Start delay"), translate("Time in seconds (s) after starting a missing program during which this program is not checked again. All other programs keep being checked in the meantime."), parent=root)
 def show_help_path_add(): messagebox.showinfo(translate("Help: Path"), translate("Full path to the executable (.exe) file.\nThe process name (e.g., 'program.exe') to monitor is extracted automatically."), parent=root)
 def show_help_name_add(): messagebox.showinfo(translate("Help: Name"), translate("Free text to identify this entry in the list. Defaults to the filename, but you can change it - useful when two entries use the same filename from different locations."), parent=root)
 
 # --- Event Handler ---
 def on_list_selection_change(event=None):
+    # Die Auswahl wird über die Sektion gemerkt, da die Slots beim Scrollen andere Programme anzeigen
+    global selected_program_section
+    selected_items = tree_programs.selection() if tree_programs else ()
+    if selected_items:
+        section = _section_for_slot(selected_items[0])
+        if section: selected_program_section = section
     if root and root.winfo_exists(): root.after(50, _update_action_buttons_state)
 
 def on_browse_button_click():
+    from tkinter import filedialog
     debug_log(">>> Event: Browse Add Path Click"); sFilePath = filedialog.askopenfilename( title=translate("Select program"), initialdir=os.path.dirname(inpProgPathAdd.get()) if inpProgPathAdd.get() else application_path, filetypes=[(translate("Executable files"), "*.exe"), (translate("All files"), "*.*")], parent=root ); root.focus_force()
     if sFilePath:
         normalized_path = os.path.normpath(sFilePath); debug_log(f"Ausgewählt: {normalized_path}"); inpProgPathAdd.delete(0, tk.END); inpProgPathAdd.insert(0, normalized_path)
@@ -700,33 +2526,27 @@ def on_add_button_click():
     if not new_name: new_name = process_name  # Kein eigener Name eingegeben -> Dateiname als Anzeigename übernehmen
     if not process_name.lower().endswith(".exe"):
         if not messagebox.askyesno(translate("Warning"), translate("Extracted name '{}' does not seem to be an .exe.\nSave anyway?").format(process_name), parent=root): return
-    new_path_normalized = os.path.normcase(os.path.normpath(new_path))
-    for prog in program_list:
-        if os.path.normcase(os.path.normpath(prog['path'])) == new_path_normalized: messagebox.showwarning(translate("Duplicate name"), translate("A program with this path already exists:\n{}").format(new_path), parent=root); return
-    i = 1;
-    while True:
-        section_name = f"Program{i}"
-        if not config.has_section(section_name): break
-        i += 1
-        if i > 999: messagebox.showerror(translate("Error"), translate("Could not find free program section (limit 999)."), parent=root); return
+    if program_registry.find_by_path(new_path): messagebox.showwarning(translate("Duplicate name"), translate("A program with this path already exists:\n{}").format(new_path), parent=root); return
+    section_name = program_registry.allocate_section()
+    while config.has_section(section_name): section_name = program_registry.allocate_section()  # nur bei Sektionen, die seit dem Laden per Hand ergänzt wurden
     debug_log(f"Füge als Sektion hinzu: {section_name}")
     try:
         if not config.has_section(section_name): config.add_section(section_name)
         config.set(section_name, 'Name', new_name); config.set(section_name, 'Path', new_path); config.set(section_name, 'ProcessName', process_name); config.set(section_name, 'Enabled', str(new_enabled))
-        if save_config_to_file(): debug_log("INI geschrieben (Add)."); load_settings_and_programs(); inpProgPathAdd.delete(0, tk.END); inpProgNameAdd.delete(0, tk.END); chkEnabledVar.set(True); messagebox.showinfo(translate("Success"), translate("Program '{}' added.").format(new_name), parent=root)
+        if save_config_to_file(): debug_log("INI geschrieben (Add)."); load_settings_and_programs(changed_sections=(section_name,)); inpProgPathAdd.delete(0, tk.END); inpProgNameAdd.delete(0, tk.END); chkEnabledVar.set(True); messagebox.showinfo(translate("Success"), translate("Program '{}' added.").format(new_name), parent=root)
     except Exception as e: debug_log(f"FEHLER Add/Save: {e}"); messagebox.showerror(translate("Error"), translate("Error adding program:").format(f"\n{e}"), parent=root)
 
 def on_remove_button_click():
-    debug_log(">>> Event: OnRemoveButtonClick"); selected_items = tree_programs.selection();
-    if not selected_items: messagebox.showwarning(translate("No selection"), translate("Please select a program from the list first."), parent=root); return
-    selected_iid = selected_items[0]; debug_log(f"Entferne Sektion: {selected_iid}")
+    debug_log(">>> Event: OnRemoveButtonClick")
+    if not selected_program_section: messagebox.showwarning(translate("No selection"), translate("Please select a program from the list first."), parent=root); return
+    selected_iid = selected_program_section; debug_log(f"Entferne Sektion: {selected_iid}")
     prog_name_to_remove = f"[{selected_iid}]"
     try:
         prog_name_to_remove = config.get(selected_iid, 'Name', fallback=selected_iid)
         if not messagebox.askyesno(translate("Confirm deletion"), translate("Shall program '{}' really be removed?").format(prog_name_to_remove), parent=root): debug_log("Entfernen abgebrochen."); return
         removed = config.remove_section(selected_iid)
         if not removed: debug_log(f"Sektion {selected_iid} nicht entfernt."); messagebox.showerror(translate("Error"), translate("Could not remove section '{}'.").format(selected_iid), parent=root); return
-        if save_config_to_file(): debug_log("INI geschrieben (Remove)."); load_settings_and_programs(); messagebox.showinfo(translate("Success"), translate("Program '{}' removed.").format(prog_name_to_remove), parent=root)
+        if save_config_to_file(): debug_log("INI geschrieben (Remove)."); load_settings_and_programs(changed_sections=()); messagebox.showinfo(translate("Success"), translate("Program '{}' removed.").format(prog_name_to_remove), parent=root)
     except KeyError:
         debug_log(f"KeyError beim Entfernen/Zugriff auf {selected_iid}. Möglicherweise schon entfernt oder Konfig-Problem.")
         messagebox.showerror(translate("Error"), translate("Could not find program '{}' in configuration to remove.").format(selected_iid), parent=root)
@@ -735,22 +2555,20 @@ def on_remove_button_click():
         import traceback; debug_log(f"!!! FEHLER im Remove-Try-Block für Sektion {selected_iid} !!!"); debug_log(f"Exception Typ: {type(e)}"); debug_log(f"Exception Wert: {e}"); print(f"\n--- TRACEBACK Remove von {selected_iid} ---"); traceback.print_exc(); print("--- TRACEBACK ENDE ---\n"); messagebox.showerror(translate("Error"), translate("Error removing program:").format(f"\n{type(e).__name__}: {e}"), parent=root)
 
 def on_edit_button_click(event=None):
-    debug_log(">>> Event: OnEditButtonClick"); selected_items = tree_programs.selection()
-    if not selected_items or len(selected_items) > 1:
-        if event:
-            focused_item = tree_programs.focus()
-            if focused_item:
-                selected_items = (focused_item,); tree_programs.selection_set(focused_item)
-            else: 
-                messagebox.showwarning(translate("Selection Error"), translate("Please select exactly one program to edit."), parent=root)
-                return
-        else: 
-            messagebox.showwarning(translate("Selection Error"), translate("Please select exactly one program to edit."), parent=root)
-            return 
-    selected_iid = selected_items[0]; debug_log(f"Bearbeite: {selected_iid}")
+    global selected_program_section
+    debug_log(">>> Event: OnEditButtonClick")
+    if event:
+        # Doppelklick: die Zeile unter dem Mauszeiger bearbeiten, auch wenn die Auswahl noch nicht aktualisiert wurde
+        clicked_section = _section_for_slot(tree_programs.identify_row(event.y))
+        if clicked_section: selected_program_section = clicked_section; _render_program_view()
+    if not selected_program_section:
+        messagebox.showwarning(translate("Selection Error"), translate("Please select exactly one program to edit."), parent=root)
+        return
+    selected_iid = selected_program_section; debug_log(f"Bearbeite: {selected_iid}")
     
     try:
         current_name = config.get(selected_iid, 'Name', fallback=""); current_path = config.get(selected_iid, 'Path', fallback=""); current_enabled = config.getboolean(selected_iid, 'Enabled', fallback=False)
+        current_cycle = config.get(selected_iid, 'CheckCycleSec', fallback="").strip(); current_delay = config.get(selected_iid, 'StartDelaySec', fallback="").strip()
         
         edit_window = tk.Toplevel(root)
         edit_window.title(translate("Edit: {}").format(current_name))
@@ -773,6 +2591,8 @@ def on_edit_button_click(event=None):
         path_var_edit = tk.StringVar(edit_window, value=current_path)
         name_var_edit = tk.StringVar(edit_window, value=current_name)
         enabled_var_edit = tk.BooleanVar(edit_window, value=current_enabled)
+        cycle_var_edit = tk.StringVar(edit_window, value=current_cycle)
+        delay_var_edit = tk.StringVar(edit_window, value=current_delay)
 
         dialog_frame = ttk.Frame(edit_window, padding="10")
         dialog_frame.pack(expand=True, fill=tk.BOTH)
@@ -788,6 +2608,7 @@ def on_edit_button_click(event=None):
         path_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         
         def _browse_edit_path():
+            from tkinter import filedialog
             edit_window.grab_release()
             sFilePath = filedialog.askopenfilename( 
                 title=translate("Select Program"),
@@ -802,16 +2623,36 @@ def on_edit_button_click(event=None):
         browse_button_edit = ttk.Button(dialog_frame, text=translate("..."), width=3, command=_browse_edit_path)
         browse_button_edit.grid(row=1, column=2, padx=5, pady=5)
         
+        ttk.Label(dialog_frame, text=translate("Check cycle (s):")).grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        cycle_frame_edit = ttk.Frame(dialog_frame)
+        cycle_frame_edit.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+        ttk.Entry(cycle_frame_edit, textvariable=cycle_var_edit, width=8).pack(side=tk.LEFT)
+        ttk.Label(cycle_frame_edit, text=translate("(empty = global: {} s)").format(check_cycle_sec)).pack(side=tk.LEFT, padx=(5, 0))
+
+        ttk.Label(dialog_frame, text=translate("Start delay (s):")).grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        delay_frame_edit = ttk.Frame(dialog_frame)
+        delay_frame_edit.grid(row=3, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+        ttk.Entry(delay_frame_edit, textvariable=delay_var_edit, width=8).pack(side=tk.LEFT)
+        ttk.Label(delay_frame_edit, text=translate("(empty = global: {} s)").format(start_delay_sec)).pack(side=tk.LEFT, padx=(5, 0))
+
         enabled_check_edit = ttk.Checkbutton(dialog_frame, text=translate("Activate"), variable=enabled_var_edit)
-        enabled_check_edit.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+        enabled_check_edit.grid(row=4, column=1, columnspan=2, padx=5, pady=5, sticky="w")
         
         button_frame = ttk.Frame(dialog_frame)
-        button_frame.grid(row=3, column=0, columnspan=3, pady=10)
+        button_frame.grid(row=5, column=0, columnspan=3, pady=10)
         
         def _save_edit_and_close():
             new_path = path_var_edit.get().strip()
             new_name = name_var_edit.get().strip()
             new_enabled = enabled_var_edit.get()
+            new_cycle = cycle_var_edit.get().strip(); new_delay = delay_var_edit.get().strip()
+            try:
+                # Leeres Feld = globaler Wert aus [Settings]; sonst gelten dieselben Untergrenzen wie global
+                if new_cycle: new_cycle = str(max(1, int(new_cycle)))
+                if new_delay: new_delay = str(max(0, int(new_delay)))
+            except ValueError:
+                messagebox.showerror(translate("Error"), translate("Invalid number in settings."), parent=edit_window)
+                return
             if not new_path:
                 messagebox.showerror(translate("Error"), translate("Path cannot be empty."), parent=edit_window)
                 return
@@ -823,20 +2664,21 @@ def on_edit_button_click(event=None):
             if not process_name.lower().endswith(".exe"):
                 if not messagebox.askyesno(translate("Warning"), translate("Extracted name '{}' does not seem to be an .exe.\nSave anyway?").format(process_name), parent=edit_window):
                     return
-            new_path_normalized = os.path.normcase(os.path.normpath(new_path))
-            if new_path_normalized != os.path.normcase(os.path.normpath(current_path)):
-                for prog in program_list:
-                    if prog['section'] != selected_iid and os.path.normcase(os.path.normpath(prog['path'])) == new_path_normalized:
-                        messagebox.showerror(translate("Error"), translate("Another program with this path already exists:\n{}").format(new_path), parent=edit_window)
-                        return
+            if normalize_process_path(new_path) != normalize_process_path(current_path):
+                if any(prog.section != selected_iid for prog in program_registry.find_by_path(new_path)):
+                    messagebox.showerror(translate("Error"), translate("Another program with this path already exists:\n{}").format(new_path), parent=edit_window)
+                    return
             try:
                 config.set(selected_iid, 'Name', new_name)
                 config.set(selected_iid, 'Path', new_path)
                 config.set(selected_iid, 'ProcessName', process_name)
                 config.set(selected_iid, 'Enabled', str(new_enabled))
+                for option_name, option_value in (('CheckCycleSec', new_cycle), ('StartDelaySec', new_delay)):
+                    if option_value: config.set(selected_iid, option_name, option_value)
+                    else: config.remove_option(selected_iid, option_name)
                 if save_config_to_file():
                     debug_log(f"INI nach Edit von {selected_iid} gespeichert.")
-                    load_settings_and_programs()
+                    load_settings_and_programs(changed_sections=(selected_iid,))
                     edit_window.destroy()
             except Exception as e_save:
                 debug_log(f"FEHLER Speichern nach Edit: {e_save}")
@@ -859,14 +2701,104 @@ def on_edit_button_click(event=None):
         messagebox.showerror(translate("Error"), translate("Error opening edit dialog:").format(f"\n{type(e_dialog).__name__}: {e_dialog}"), parent=root)
     debug_log("<<< Event: OnEditButtonClick Ende.")
 
+# --- Verlauf (Ereignisjournal) ---
+HISTORY_RANGES = (("Last hour", 3600), ("Last 24 hours", 86400), ("Last 7 days", 7 * 86400), ("All", None))
+HISTORY_MAX_ROWS = 1000  # neueste Einträge, die das Verlaufsfenster höchstens anzeigt
+
+def on_history_button_click():
+    # Journal des ausgewählten Programms (ohne Auswahl: aller Programme), neueste Einträge oben
+    debug_log(">>> Event: OnHistoryButtonClick")
+    if not journal_file: messagebox.showinfo(translate("History"), translate("The event journal is disabled (JournalFile in [Settings])."), parent=root); return
+    program = program_registry.get(selected_program_section) if selected_program_section else None
+    history_window = tk.Toplevel(root); history_window.title(translate("History") + (f" - {program.name}" if program else ""))
+    history_window.transient(root); history_window.geometry("680x400")
+    history_window.columnconfigure(0, weight=1); history_window.rowconfigure(1, weight=1)
+
+    top_frame = ttk.Frame(history_window, padding="10 10 10 5"); top_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+    ttk.Label(top_frame, text=translate("Period:")).pack(side=tk.LEFT, padx=(0, 5))
+    range_titles = [translate(title) for title, seconds in HISTORY_RANGES]
+    range_var = tk.StringVar(history_window, value=range_titles[1])
+    range_combo = ttk.Combobox(top_frame, textvariable=range_var, values=range_titles, state="readonly", width=18); range_combo.pack(side=tk.LEFT)
+
+    history_columns = (("time", "Time", 130), ("name", "Name", 110), ("event", "Event", 120), ("pid", "PID", 60), ("exit_code", "Exit code", 70), ("detail", "Details", 150))
+    tree_history = ttk.Treeview(history_window, columns=[column for column, title, width in history_columns], show='headings')
+    for column, title, width in history_columns:
+        tree_history.heading(column, text=translate(title)); tree_history.column(column, width=width, stretch=(column == "detail"))
+    history_scrollbar = ttk.Scrollbar(history_window, orient=tk.VERTICAL, command=tree_history.yview); tree_history.configure(yscroll=history_scrollbar.set)
+    tree_history.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(0, 10)); history_scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=(0, 10))
+
+    def _refresh_history(event=None):
+        range_seconds = dict(zip(range_titles, (seconds for title, seconds in HISTORY_RANGES))).get(range_var.get())
+        records = query_journal(program.section if program else None, since=time.time() - range_seconds if range_seconds else None, limit=HISTORY_MAX_ROWS)
+        tree_history.delete(*tree_history.get_children())
+        for record in reversed(records):
+            values = (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.get('ts', 0))), record.get('name') or record.get('section', ''),
+                      translate(f"Event.{record.get('event')}"), record.get('pid') or '', '' if record.get('exit_code') is None else record['exit_code'], record.get('detail') or '')
+            tree_history.insert("", tk.END, values=values)
+    range_combo.bind("<<ComboboxSelected>>", _refresh_history)
+    ttk.Button(top_frame, text=translate("Refresh"), command=_refresh_history).pack(side=tk.LEFT, padx=5)
+    ttk.Button(top_frame, text=translate("Close"), command=history_window.destroy).pack(side=tk.RIGHT)
+    _refresh_history()
+
+# --- Verfügbarkeitsstatistik (Anzeige) ---
+STATISTICS_RANGES = (("Last 24 hours", 1), ("Last 7 days", 7), ("Last 30 days", 30), ("Last 365 days", 365))
+
+def format_duration(seconds):
+    if seconds is None: return "-"
+    if seconds >= 86400: return f"{seconds / 86400:.1f} d"
+    if seconds >= 3600: return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 60:.0f} min"
+
+def on_statistics_button_click():
+    # Verfügbarkeit je Programm aus den Rollups von StatsDatabase
+    debug_log(">>> Event: OnStatisticsButtonClick")
+    if not stats_database: messagebox.showinfo(translate("Statistics"), translate("Statistics are disabled (StatsDatabase in [Settings])."), parent=root); return
+    statistics_window = tk.Toplevel(root); statistics_window.title(translate("Statistics"))
+    statistics_window.transient(root); statistics_window.geometry("640x360")
+    statistics_window.columnconfigure(0, weight=1); statistics_window.rowconfigure(1, weight=1)
+
+    top_frame = ttk.Frame(statistics_window, padding="10 10 10 5"); top_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+    ttk.Label(top_frame, text=translate("Period:")).pack(side=tk.LEFT, padx=(0, 5))
+    range_titles = [translate(title) for title, days in STATISTICS_RANGES]
+    range_var = tk.StringVar(statistics_window, value=range_titles[2])
+    range_combo = ttk.Combobox(top_frame, textvariable=range_var, values=range_titles, state="readonly", width=18); range_combo.pack(side=tk.LEFT)
+
+    statistics_columns = (("name", "Name", 150, 'w'), ("uptime", "Uptime", 80, 'e'), ("mtbf", "MTBF", 80, 'e'), ("failures", "Failures", 70, 'e'), ("restarts", "Restarts", 70, 'e'), ("observed", "Monitored", 90, 'e'))
+    tree_statistics = ttk.Treeview(statistics_window, columns=[column for column, title, width, anchor in statistics_columns], show='headings')
+    for column, title, width, anchor in statistics_columns:
+        tree_statistics.heading(column, text=translate(title)); tree_statistics.column(column, width=width, anchor=anchor, stretch=(column == "name"))
+    statistics_scrollbar = ttk.Scrollbar(statistics_window, orient=tk.VERTICAL, command=tree_statistics.yview); tree_statistics.configure(yscroll=statistics_scrollbar.set)
+    tree_statistics.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(0, 10)); statistics_scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=(0, 10))
+
+    def _refresh_statistics(event=None):
+        range_days = dict(zip(range_titles, (days for title, days in STATISTICS_RANGES))).get(range_var.get(), 30)
+        try: statistics = query_program_stats(time.time() - range_days * 86400)
+        except Exception as e: debug_log(f"FEHLER beim Lesen der Statistik: {e}"); messagebox.showerror(translate("Error"), f"{stats_database}:\n{e}", parent=statistics_window); return
+        tree_statistics.delete(*tree_statistics.get_children())
+        for section, totals in sorted(statistics.items()):
+            program = program_registry.get(section)
+            uptime = "-" if totals['uptime_percent'] is None else f"{totals['uptime_percent']:.2f} %"
+            tree_statistics.insert("", tk.END, values=(program.name if program else section, uptime, format_duration(totals['mtbf_sec']), totals['failures'], totals['restarts'], format_duration(totals['observed_seconds'])))
+    range_combo.bind("<<ComboboxSelected>>", _refresh_statistics)
+    ttk.Button(top_frame, text=translate("Refresh"), command=_refresh_statistics).pack(side=tk.LEFT, padx=5)
+    ttk.Button(top_frame, text=translate("Close"), command=statistics_window.destroy).pack(side=tk.RIGHT)
+    _refresh_statistics()
+
+def start_watchdog_thread(exit_after_first_cycle=False):
+    global is_running, watchdog_thread, stop_event
+    is_running = True; stop_event = threading.Event(); debug_log("Erstelle/starte Watchdog-Thread...")
+    start_metrics_server(metrics_port)
+    start_control_server(control_socket)
+    start_config_watcher()
+    watchdog_thread = threading.Thread(target=watchdog_loop, args=(stop_event, exit_after_first_cycle), daemon=True)
+    watchdog_thread.start()
+
 def on_start_watchdog_click():
-    global is_running, watchdog_thread, stop_event; debug_log(">>> Event: OnStartWatchdogClick")
+    debug_log(">>> Event: OnStartWatchdogClick")
     if not is_running:
         load_settings_and_programs();
-        if not program_list: messagebox.showwarning(translate("No programs"), translate("No programs configured."), parent=root); return
-        is_running = True; stop_event = threading.Event(); debug_log("Erstelle/starte Watchdog-Thread...")
-        watchdog_thread = threading.Thread(target=watchdog_loop, args=(stop_event,), daemon=True)
-        watchdog_thread.start()
+        if not program_registry: messagebox.showwarning(translate("No programs"), translate("No programs configured."), parent=root); return
+        start_watchdog_thread()
         update_watchdog_buttons(); status_bar_text.set(translate("Watchdog running...")) ; debug_log("Watchdog Gestartet.")
     else: debug_log("Watchdog lief bereits.")
 
@@ -877,6 +2809,7 @@ def on_stop_watchdog_click():
         debug_log("Sende Stop-Signal...")
         if stop_event:
             stop_event.set()
+            wake_watchdog_loop()
         is_running = False
         update_watchdog_buttons()
         status_bar_text.set(translate("Watchdog stopping..."))
@@ -900,6 +2833,11 @@ def _check_thread_stopped():
         elif is_running:
             debug_log("WARNUNG: _check_thread_stopped fand Thread beendet, aber is_running ist noch True.")
 
+def _quit_after_first_cycle():
+    # --exit-after-first-cycle im GUI-Modus: Fenster schließen, sobald der erste Prüfdurchlauf beendet ist
+    if watchdog_thread and watchdog_thread.is_alive(): root.after(50, _quit_after_first_cycle); return
+    debug_log("GUI: Erster Prüfdurchlauf beendet (--exit-after-first-cycle), beende mainloop."); root.quit()
+
 def update_watchdog_buttons_on_stop():
     global is_running, watchdog_thread; debug_log("Watchdog-Thread hat sich selbst beendet.");
     if is_running:
@@ -923,6 +2861,11 @@ def on_exit_button_click():
     if is_running and stop_event:
         debug_log("Sende Stop-Signal an Watchdog-Thread...")
         stop_event.set()
+        wake_watchdog_loop()
+
+    flush_config_writes()  # ausstehende INI-Änderungen nicht verlieren (Writer-Thread ist ein Daemon)
+    flush_journal(); flush_stats()
+    stop_control_server()
 
     if root:
         try:
@@ -963,7 +2906,7 @@ def on_language_changed(event=None):
             
             update_gui_language()
             debug_log("Lade Programmliste neu, um Inhalte (z.B. True/False) zu übersetzen...")
-            load_settings_and_programs()
+            load_settings_and_programs(changed_sections=())
             display_name_loaded = next((name for name, code in supported_languages.items() if code == current_language), None)
             if display_name_loaded and language_var.get() != display_name_loaded:
                 debug_log(f"Korrigiere Combobox-Anzeige auf: {display_name_loaded}")
@@ -1062,6 +3005,8 @@ def update_gui_language():
         if btnAddProg: btnAddProg.config(text=translate("Add"))
         if btnRemoveProg: btnRemoveProg.config(text=translate("Remove selected"))
         if btnEditProg: btnEditProg.config(text=translate("Edit selected"))
+        if btnHistory: btnHistory.config(text=translate("History"))
+        if btnStatistics: btnStatistics.config(text=translate("Statistics"))
         if btnStartWatchdog: btnStartWatchdog.config(text=translate("Start Watchdog"))
         if btnStopWatchdog: btnStopWatchdog.config(text=translate("Stop Watchdog"))
         if btnExitApp: btnExitApp.config(text=translate("Exit"))
@@ -1070,11 +3015,8 @@ def update_gui_language():
         if r_system: r_system.config(text=translate("System"))
         if r_light: r_light.config(text=translate("Light"))
         if r_dark: r_dark.config(text=translate("Dark"))
-        if tree_programs:
-            tree_programs.heading("nr", text=translate("Nr."))
-            tree_programs.heading("name", text=translate("Name"))
-            tree_programs.heading("path", text=translate("Path"))
-            tree_programs.heading("enabled", text=translate("Activated"))
+        if lblSearch: lblSearch.config(text=translate("Search:"))
+        if tree_programs: _update_program_headings()
         
         current_status = status_bar_text.get()
         if is_status_resettable(current_status):
@@ -1093,27 +3035,12 @@ def is_status_resettable(status_text):
             return True
     return False
 
-# --- Hauptteil ---
-if __name__ == "__main__":
-    print(f"INFO ({time.strftime('%H:%M:%S')}): Watchdog Skript Start (GUI Modus)")
-
-    root = None
-    style = None
-
-    try:
-        root = tk.Tk()
-        root.withdraw()
-        debug_log(f"Tk Hauptfenster (root) EINMALIG erstellt und initial versteckt.")
-    except Exception as e_root_init:
-        critical_error_msg = f"Konnte Tkinter-Hauptfenster nicht erstellen: {e_root_init}"
-        print(f"KRITISCHER FEHLER: {critical_error_msg}")
-        try:
-            temp_err_root = tk.Tk(); temp_err_root.withdraw()
-            messagebox.showerror("Schwerwiegender Fehler", critical_error_msg, parent=None)
-            temp_err_root.destroy()
-        except: pass
-        sys.exit(1)
-
+# --- Start: Konfiguration, Headless-Modus, Kommandozeile ---
+def load_config_and_preferences(report_error):
+    # Liest watchdog.ini (bzw. legt sie an) und setzt Sprache/Theme-Präferenz.
+    # report_error(titel, text) zeigt Fehler an: in der GUI per messagebox, headless im Log.
+    # Rückgabe False = kritischer Fehler, die Anwendung kann nicht starten.
+    global config, current_language, current_theme_setting
     if not os.path.exists(CONFIG_FILE):
         debug_log(f"Konfigurationsdatei '{CONFIG_FILE}' nicht gefunden. Erstelle Standard-INI...")
         current_language = 'de'
@@ -1121,9 +3048,8 @@ if __name__ == "__main__":
         if not create_default_ini():
             error_msg_cfg = f"Konnte Standard-Konfigurationsdatei nicht erstellen:\n{CONFIG_FILE}\nAnwendung kann nicht starten."
             debug_log(f"KRITISCHER FEHLER: {error_msg_cfg}")
-            if root: messagebox.showerror("Kritischer Konfigurationsfehler", error_msg_cfg, parent=root)
-            else: print(f"KRITISCHER FEHLER (messagebox nicht möglich): {error_msg_cfg}")
-            sys.exit(1)
+            report_error("Kritischer Konfigurationsfehler", error_msg_cfg)
+            return False
         else:
             debug_log(f"Standard-INI '{CONFIG_FILE}' erfolgreich erstellt. Globale 'config' ist mit Defaults gefüllt.")
     else:
@@ -1141,8 +3067,7 @@ if __name__ == "__main__":
         except configparser.Error as e_cfg_read:
             error_msg_read = f"Fehler beim Lesen von '{CONFIG_FILE}':\n{e_cfg_read}\n\nStandardwerte werden verwendet."
             debug_log(f"KONFIGURATIONSFEHLER: {error_msg_read}")
-            if root: messagebox.showerror("Konfigurationsfehler", error_msg_read, parent=root)
-            else: print(f"KONFIGURATIONSFEHLER (messagebox nicht möglich): {error_msg_read}")
+            report_error("Konfigurationsfehler", error_msg_read)
             config.clear(); config.add_section('Settings')
             config['Settings']['Language'] = 'de'; config['Settings']['ThemePreference'] = 'system'
             config['Settings']['CheckCycleSec'] = str(DEFAULT_CHECK_CYCLE_SEC); config['Settings']['StartDelaySec'] = str(DEFAULT_START_DELAY_SEC)
@@ -1162,6 +3087,127 @@ if __name__ == "__main__":
         debug_log(f"FEHLER beim Setzen der Start-Präferenzen aus Config: {e_prefs}. Verwende harte Defaults.")
         current_language = 'de'; current_theme_setting = 'system'
         load_language(current_language, is_initial_load=True)
+    return True
+
+def run_headless(args):
+    # Überwachung ohne GUI: kein tkinter/sv_ttk-Import, kein root.after, Ausgabe auf stdout oder in eine Logdatei.
+    global HEADLESS_MODE, log_stream
+    HEADLESS_MODE = True
+    if args.log_file:
+        try: log_stream = open(args.log_file, 'a', encoding='utf-8', buffering=1)
+        except OSError as e: print(f"FEHLER: Logdatei '{args.log_file}' kann nicht geöffnet werden: {e}"); return 1
+    write_log_line(f"INFO ({time.strftime('%Y-%m-%d %H:%M:%S')}): Watchdog Skript Start (Headless Modus), Konfiguration: {CONFIG_FILE}")
+
+    def _report_config_error(title, message):
+        write_log_line(f"{title.upper()} ({time.strftime('%Y-%m-%d %H:%M:%S')}): {message}")
+
+    if not load_config_and_preferences(_report_config_error): return 1
+    load_settings_and_programs()
+    if not program_registry:
+        write_log_line(f"FEHLER ({time.strftime('%Y-%m-%d %H:%M:%S')}): {translate('No programs configured.')}")
+        return 1
+
+    start_watchdog_thread(exit_after_first_cycle=args.exit_after_first_cycle)
+    def _request_stop(signum=None, frame=None):
+        write_log_line(f"INFO ({time.strftime('%Y-%m-%d %H:%M:%S')}): {translate('Watchdog stopping...')}")
+        stop_event.set(); wake_watchdog_loop()
+    signal.signal(signal.SIGTERM, _request_stop)
+    try:
+        while watchdog_thread.is_alive(): watchdog_thread.join(timeout=SHORT_ADLIB_INTERVAL_SEC)
+    except KeyboardInterrupt:
+        _request_stop()
+        watchdog_thread.join(timeout=(SHORT_ADLIB_INTERVAL_SEC * 2) + 0.5)
+    finally:
+        flush_config_writes()  # entprellte INI-Änderungen nicht verlieren (der ConfigWriter ist ein Daemon)
+    stop_control_server()
+    write_log_line(f"INFO ({time.strftime('%Y-%m-%d %H:%M:%S')}): {translate('Watchdog stopped.')}")
+    if log_stream: log_stream.close(); log_stream = None
+    return 0
+
+def print_stats_report(days):
+    # --stats-report: Verfügbarkeit der letzten days Tage als CSV auf stdout (z. B. für Monatsberichte)
+    import csv
+    if not load_config_and_preferences(lambda title, message: print(f"{title.upper()}: {message}", file=sys.stderr)): return 1
+    load_stats_settings()
+    if not stats_database: print("StatsDatabase ist in [Settings] ausgeschaltet.", file=sys.stderr); return 1
+    names = {section: config.get(section, 'Name', fallback=section) for section in config.sections() if section != 'Settings'}
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['section', 'name', 'uptime_percent', 'mtbf_hours', 'failures', 'restarts', 'monitored_hours'])
+    for section, totals in sorted(query_program_stats(time.time() - days * 86400).items()):
+        writer.writerow([section, names.get(section, section), '' if totals['uptime_percent'] is None else f"{totals['uptime_percent']:.3f}",
+                         '' if totals['mtbf_sec'] is None else f"{totals['mtbf_sec'] / 3600:.2f}", totals['failures'], totals['restarts'], f"{totals['observed_seconds'] / 3600:.2f}"])
+    return 0
+
+def run_control_command(words):
+    # --control BEFEHL [SEKTION ...]: Anfrage(n) an den laufenden Watchdog, Ergebnis als JSON auf stdout
+    method, sections = words[0], words[1:]
+    if method not in CONTROL_METHODS: print(f"Unbekannter Befehl '{method}' (erlaubt: {', '.join(CONTROL_METHODS)}).", file=sys.stderr); return 2
+    if not load_config_and_preferences(lambda title, message: print(f"{title.upper()}: {message}", file=sys.stderr)): return 1
+    load_control_settings()
+    if not control_socket: print("ControlSocket ist in [Settings] nicht gesetzt.", file=sys.stderr); return 1
+    exit_code = 0
+    try:
+        client = ControlClient(control_socket)
+        for params in [{'section': section} for section in sections] or [{}]:
+            response = client.call(method, params)
+            if 'error' in response: print(f"FEHLER: {response['error']['message']}", file=sys.stderr); exit_code = 1
+            else: print(json.dumps(response['result'], ensure_ascii=False, indent=2))
+        client.close()
+    except (OSError, ValueError) as e: print(f"FEHLER: Steuer-Schnittstelle '{control_socket}' nicht erreichbar: {e}", file=sys.stderr); return 1
+    return exit_code
+
+def parse_command_line():
+    parser = argparse.ArgumentParser(description="Watchdog: überwacht Programme und startet sie bei Bedarf neu.")
+    parser.add_argument('--headless', action='store_true', help="Ohne GUI laufen (kein tkinter), z. B. auf Servern ohne Desktop-Sitzung.")
+    parser.add_argument('--config', help="Pfad zur watchdog.ini (Standard: neben dem Programm).")
+    parser.add_argument('--log-file', help="Headless: Ausgaben an diese Datei anhängen statt auf stdout.")
+    parser.add_argument('--debug', action='store_true', help="DEBUG-Ausgaben aktivieren.")
+    parser.add_argument('--exit-after-first-cycle', action='store_true', help="Nach dem ersten Prüfdurchlauf beenden, im GUI-Modus nach dem Aufbau des Fensters (für benchmark.py).")
+    parser.add_argument('--stats-report', type=int, metavar='TAGE', help="Verfügbarkeit der letzten TAGE Tage als CSV ausgeben und beenden.")
+    parser.add_argument('--control', nargs='+', metavar='BEFEHL', help=f"Befehl an den laufenden Watchdog senden ({', '.join(CONTROL_METHODS)}), optional gefolgt von Sektionen oder Namen.")
+    return parser.parse_args()
+
+# --- Hauptteil ---
+if __name__ == "__main__":
+    command_line_args = parse_command_line()
+    if command_line_args.config: CONFIG_FILE = os.path.abspath(command_line_args.config)
+    if command_line_args.debug: DEBUG_MODE = True
+    if command_line_args.stats_report: sys.exit(print_stats_report(command_line_args.stats_report))
+    if command_line_args.control: sys.exit(run_control_command(command_line_args.control))
+    if command_line_args.headless: sys.exit(run_headless(command_line_args))
+
+    import_gui_modules()
+    print(f"INFO ({time.strftime('%H:%M:%S')}): Watchdog Skript Start (GUI Modus)")
+
+    root = None
+    style = None
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        debug_log(f"Tk Hauptfenster (root) EINMALIG erstellt und initial versteckt.")
+    except Exception as e_root_init:
+        critical_error_msg = f"Konnte Tkinter-Hauptfenster nicht erstellen: {e_root_init}"
+        print(f"KRITISCHER FEHLER: {critical_error_msg}")
+        try:
+            temp_err_root = tk.Tk(); temp_err_root.withdraw()
+            messagebox.showerror("Schwerwiegender Fehler", critical_error_msg, parent=None)
+            temp_err_root.destroy()
+        except: pass
+        sys.exit(1)
+
+    def _report_config_error(title, message):
+        if root: messagebox.showerror(title, message, parent=root)
+        else: print(f"{title.upper()} (messagebox nicht möglich): {message}")
+
+    if not load_config_and_preferences(_report_config_error):
+        sys.exit(1)
+
+    # Überwachung starten, bevor Theme, Styles und Widgets aufgebaut werden
+    load_settings_and_programs()
+    if program_registry:
+        start_watchdog_thread(exit_after_first_cycle=command_line_args.exit_after_first_cycle)
+        debug_log("Watchdog vor dem Aufbau der GUI gestartet.")
 
     font_family_for_override = "Calibri" 
     if sys.platform == "darwin": font_family_for_override = "Helvetica Neue"
@@ -1243,11 +3289,15 @@ if __name__ == "__main__":
         create_gui_widgets() 
         load_settings_and_programs()
         update_watchdog_buttons()
+        if is_running: status_bar_text.set(translate("Watchdog running..."))
         
         root.deiconify()
+        root.after(UI_REFRESH_INTERVAL_MS, _drain_ui_updates)
 
-        debug_log("Plane automatischen Watchdog-Start...")
-        root.after(100, on_start_watchdog_click)
+        if command_line_args.exit_after_first_cycle: root.after(0, _quit_after_first_cycle)
+        elif not is_running:
+            debug_log("Plane automatischen Watchdog-Start...")
+            root.after(100, on_start_watchdog_click)
 
         root.mainloop()  
         debug_log("...mainloop() ist beendet (nach root.quit()).")